@@ -1,28 +1,53 @@
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 from typing import List, Optional
+import time
+from collections import defaultdict
+from concurrent.futures import Future
 from datetime import datetime
-import torch
-import numpy as np
 from sqlalchemy.orm import Session
 
-from oracle_ai_model.utils.helpers import add_technical_indicators, normalize
-from oracle_ai_model.data.loader import download_stock_data
-from oracle_ai_model.models.model import LSTMModel
-from oracle_ai_model.models.gru_model import GRUTimeSeriesModel
-from oracle_ai_model.models.tcn_model import TCN
-from oracle_ai_model.models.transformer_model import TransformerTimeSeriesModel
+from oracle_ai_model.models.model import ModelRegistry, load_model, checkpoint_path
+from oracle_ai_model.inference.features import (
+    plan_feature_windows, shared_feature_window, DEFAULT_PERIOD, DEFAULT_INTERVAL, FEATURE_STAGES
+)
+from oracle_ai_model.inference.scheduler import get_scheduler
+from oracle_ai_model.inference.config import INFERENCE_CONFIG
+from oracle_ai_model.inference.uncertainty import confidence_bands as mc_confidence_bands, supports_mc_dropout
+from oracle_ai_model.inference.cascade import CascadePredictor
+from oracle_ai_model.inference.ensemble import EnsemblePredictor
+from deploy.monitoring.metrics import (
+    record_inference_flush, record_cascade_stats, record_predict_stage, record_predict_stage_shared,
+    record_predict_error, record_predictions_dropped
+)
 
 from db.engine import SessionLocal
-from db.models import Prediction
 
 from broker_execution.strategies.trade_selector import select_top_trades_with_allocation
 from services.train_service import enqueue_training
+from services.prediction_writer import get_prediction_writer
+from config import settings
 
 from app.schemas.prediction import PredictionOutput
 
 router = APIRouter()
 
+CASCADE = "cascade"
+ENSEMBLE = "ensemble"
+SUPPORTED_MODELS = set(ModelRegistry().models) | {CASCADE, ENSEMBLE}
+
+# Shared micro-batching scheduler: concurrent requests for the same model share a forward pass
+scheduler = get_scheduler(on_flush=record_inference_flush)
+
+# Cheap-first cascade over INFERENCE_CONFIG["cascade_stages"]
+cascade = CascadePredictor(on_predict=record_cascade_stats)
+
+# Average over INFERENCE_CONFIG["ensemble_members"] (ENSEMBLE_WEIGHTS follow the same order)
+ensemble = EnsemblePredictor(weights=dict(zip(INFERENCE_CONFIG["ensemble_members"], INFERENCE_CONFIG["ensemble_weights"])))
+
+# Bulk Prediction INSERTs; background batches that fail are counted as dropped
+prediction_writer = get_prediction_writer(on_drop=record_predictions_dropped)
+
 # ✅ Dependency to get DB session
 def get_db():
     db = SessionLocal()
@@ -34,83 +59,216 @@ def get_db():
 # ✅ Request schema
 class PredictionRequest(BaseModel):
     symbol: str
-    model_type: str = "lstm"  # lstm, gru, transformer, tcn
+    model_type: str = "lstm"  # lstm, gru, transformer, tcn, cascade, ensemble
     asset_type: str = "stock"  # stock, currency, crypto
+    period: str = DEFAULT_PERIOD
+    interval: str = DEFAULT_INTERVAL
+
+def _load(model_type: str, input_size: int, **kwargs):
+    # Cached per checkpoint, loaded once per process
+    return load_model(model_type, checkpoint_path(model_type), input_size=input_size, **kwargs)
+
+def _bands(model_type: str, model, windows):
+    # One MC dropout pass for the whole batch
+    if not INFERENCE_CONFIG["mc_samples"]:
+        return [None] * len(windows)
+    try:
+        mc_model = model if supports_mc_dropout(model) else \
+            _load(model_type, windows[0].shape[1], backend="eager")
+        return mc_confidence_bands(mc_model, windows)
+    except Exception as e:
+        print(f"Error estimating {model_type} confidence bands: {e}")
+        return [None] * len(windows)
+
+def _resolved(values):
+    futures = []
+    for value in values:
+        future = Future()
+        future.set_result(value)
+        futures.append(future)
+    return futures
+
+# Each predictor returns (futures of probabilities, extra output fields per window,
+# the (model_type, model) confidence bands are sampled from, or None)
+def _predict_model(model_type: str, windows, asset_types):
+    model = _load(model_type, windows[0].shape[1])
+    # Micro-batched with other in-flight requests; the scheduler times each flush per (model_type, asset_type)
+    futures = [scheduler.submit(model_type, model, window, group=(model_type, asset_type))
+               for window, asset_type in zip(windows, asset_types)]
+    return futures, [{} for _ in windows], (model_type, model)
+
+def _predict_cascade(windows):
+    input_size = windows[0].shape[1]
+    stages = [(name, _load(name, input_size)) for name in INFERENCE_CONFIG["cascade_stages"]]
+    probs, _ = cascade.predict(stages, windows)
+    # Bands come from the cheapest stage, which scored every window
+    return _resolved(probs), [{} for _ in windows], stages[0]
+
+def _predict_ensemble(windows):
+    input_size = windows[0].shape[1]
+    # Members without a checkpoint are skipped; the others' weights are renormalised
+    members = ensemble.load_members(INFERENCE_CONFIG["ensemble_members"], lambda name: _load(name, input_size))
+    probs, contributions = ensemble.predict(members, windows)
+    return _resolved(probs), [{"contributions": c} for c in contributions], None
+
+def _timed_prepare(asset_types):
+    # shared_feature_window with per-stage latency (and failing stage) exported
+    def prepare(symbol, period, interval):
+        asset_type = asset_types[(symbol, period, interval)]
+        completed = []
+
+        def on_stage(stage, seconds):
+            completed.append(stage)
+            record_predict_stage(stage, seconds, asset_type=asset_type)
+
+        try:
+            return shared_feature_window(symbol, period, interval, on_stage=on_stage)
+        except Exception:
+            record_predict_error(FEATURE_STAGES[min(len(completed), len(FEATURE_STAGES) - 1)], asset_type=asset_type)
+            raise
+    return prepare
+
+def _retrain_targets(model_type: str):
+    # Composite types retrain the checkpoints they are built from
+    if model_type == CASCADE:
+        return INFERENCE_CONFIG["cascade_stages"]
+    if model_type == ENSEMBLE:
+        return INFERENCE_CONFIG["ensemble_members"]
+    return [model_type]
 
 @router.post("/predict", response_model=List[PredictionOutput])
 def predict_endpoint(
     requests: List[PredictionRequest],
     db: Session = Depends(get_db),
-    filter_top: bool = Query(False, description="Return only top filtered predictions")
+    filter_top: bool = Query(False, description="Return only top filtered predictions"),
+    confidence_bands: bool = Query(True, description="Add MC dropout confidence bands; false skips the sampling")
 ):
-    predictions = []
-
-    for req in requests:
+    # Step 1: Plan the request, then load + prepare each (symbol, period, interval) once
+    planned = []
+    for index, req in enumerate(requests):
         symbol = req.symbol.upper()
         model_type = req.model_type.lower()
-        asset_type = req.asset_type
 
+        if model_type not in SUPPORTED_MODELS:
+            continue  # Skip unsupported
+
+        planned.append((index, symbol, model_type, req.asset_type, (symbol, req.period, req.interval)))
+
+    asset_types = {key: asset_type for _, _, _, asset_type, key in planned}
+    windows = plan_feature_windows(asset_types, prepare=_timed_prepare(asset_types))
+
+    # Fan the shared windows out to every requested model
+    batches = defaultdict(list)  # model_type -> [(index, symbol, asset_type, interval, window)]
+    for index, symbol, model_type, asset_type, key in planned:
+        window = windows[key]
+        if isinstance(window, Exception):
+            print(f"Error processing {symbol}: {window}")
+            continue
+        batches[model_type].append((index, symbol, asset_type, key[2], window))
+
+    results = []
+    rows = []  # Prediction rows, written in bulk after scoring
+    row_groups = []  # (model_type, asset_type) of each row, for the db_write stage
+    generated_at = datetime.utcnow()
+
+    for model_type, items in batches.items():
+        item_windows = [window for *_, window in items]
+        groups = [(model_type, asset_type) for _, _, asset_type, _, _ in items]
+
+        # Steps 2-3: Load the model(s) and predict
+        forward_start = time.perf_counter()
         try:
-            # Step 1: Load + prepare data
-            df = download_stock_data(symbol, period="1mo")
-            df = add_technical_indicators(df)
-            df = normalize(df, ["Close", "rsi", "macd", "ema", "volatility"])
-            data = df[["Close", "rsi", "macd", "ema", "volatility"]].values
-            X_input = np.expand_dims(data[-24:], axis=0)
-            X_tensor = torch.tensor(X_input).float()
-
-            # Step 2: Select model
-            input_size = X_tensor.shape[2]
-            model_path = f"{model_type}_model.pth"
-            if model_type == "lstm":
-                model = LSTMModel(input_size)
-            elif model_type == "gru":
-                model = GRUTimeSeriesModel(input_size)
-            elif model_type == "tcn":
-                model = TCN(input_size=input_size, num_channels=[32, 64])
-            elif model_type == "transformer":
-                model = TransformerTimeSeriesModel(input_size)
+            if model_type == CASCADE:
+                futures, extras, band_source = _predict_cascade(item_windows)
+            elif model_type == ENSEMBLE:
+                futures, extras, band_source = _predict_ensemble(item_windows)
             else:
-                continue  # Skip unsupported
+                futures, extras, band_source = _predict_model(model_type, item_windows, [g[1] for g in groups])
+        except Exception as e:
+            print(f"Error loading {model_type} model: {e}")
+            for _, _, asset_type, _, _ in items:
+                record_predict_error("model_forward", model_type, asset_type)
+            continue
+        if model_type in (CASCADE, ENSEMBLE):
+            # Scored synchronously above; single models are timed per flush by the scheduler hook
+            record_predict_stage_shared("model_forward", time.perf_counter() - forward_start, groups)
 
-            model.load_state_dict(torch.load(model_path))
-            model.eval()
+        # MC dropout bands (on unless the caller opts out; one head-only pass per batch for LSTM/GRU)
+        if confidence_bands and band_source is not None:
+            stage_start = time.perf_counter()
+            for extra, band in zip(extras, _bands(*band_source, item_windows)):
+                extra["confidence_band"] = band
+            record_predict_stage_shared("confidence_bands", time.perf_counter() - stage_start, groups)
 
-            # Step 3: Predict
-            with torch.no_grad():
-                output = model(X_tensor)
-                prob = torch.sigmoid(output).item()
+        scored = []
+        for (index, symbol, asset_type, interval, _), future, extra in zip(items, futures, extras):
+            stage = "model_forward"
+            try:
+                prob = float(future.result())
                 pred_class = int(prob > 0.5)
 
-            # Step 4: Save prediction
-            pred_record = Prediction(
-                symbol=symbol,
-                model_type=model_type,
-                prediction=pred_class,
-                probability=prob
-            )
-            db.add(pred_record)
-            db.commit()
-            db.refresh(pred_record)
-
-            # Step 5: Format output
-            predictions.append({
-                "ticker": symbol,
-                "asset_type": asset_type,
-                "prediction": pred_class,
-                "confidence": prob,
-                "entry_point": None,
-                "exit_point": None,
-                "model_type": model_type,
-                "generated_at": pred_record.created_at or datetime.utcnow(),
-            })
-
-            # ✅ Step 6: Trigger auto-retrain
-            enqueue_training([symbol], model_type=model_type)
+                # Step 4: Queue the prediction row (written in bulk below)
+                rows.append({
+                    "user_id": settings.PREDICTION_USER_ID,
+                    "ticker": symbol,
+                    "interval": interval,
+                    "prediction": pred_class,
+                    "confidence": prob,
+                    "confidence_band": extra.get("confidence_band"),
+                    "model_name": model_type,
+                    "created_at": generated_at,
+                })
+                row_groups.append((model_type, asset_type))
 
-        except Exception as e:
-            print(f"Error processing {symbol}: {e}")
+                # Step 5: Format output
+                results.append((index, {
+                    "ticker": symbol,
+                    "asset_type": asset_type,
+                    "prediction": pred_class,
+                    "confidence": prob,
+                    "entry_point": None,
+                    "exit_point": None,
+                    "model_type": model_type,
+                    "generated_at": generated_at,
+                    **extra,
+                }))
+                scored.append((symbol, asset_type))
+
+            except Exception as e:
+                print(f"Error processing {symbol}: {e}")
+                record_predict_error(stage, model_type, asset_type)
+                continue
+
+        # ✅ Step 6: Trigger auto-retrain — coalesced per model type by the retrain coordinator
+        if not scored:
             continue
+        scored_groups = [(model_type, asset_type) for _, asset_type in scored]
+        stage_start = time.perf_counter()
+        try:
+            for target in _retrain_targets(model_type):
+                enqueue_training([symbol for symbol, _ in scored], model_type=target)
+            record_predict_stage_shared("retrain_enqueue", time.perf_counter() - stage_start, scored_groups)
+        except Exception as e:
+            print(f"Error enqueuing {model_type} retrain: {e}")
+            for group in set(scored_groups):
+                record_predict_error("retrain_enqueue", *group)
+
+    # Step 4b: Save predictions — one multi-row INSERT, off the response path by default
+    stage_start = time.perf_counter()
+    try:
+        if settings.PREDICTION_WRITE_MODE == "background":
+            prediction_writer.submit(rows)
+        else:
+            prediction_writer.write(rows, db=db)
+        if rows:
+            record_predict_stage_shared("db_write", time.perf_counter() - stage_start, row_groups)
+    except Exception as e:
+        print(f"Error saving {len(rows)} predictions: {e}")
+        for group in set(row_groups):
+            record_predict_error("db_write", *group)
+
+    # Keep the original request order
+    predictions = [item for _, item in sorted(results, key=lambda r: r[0])]
 
     # Step 7: Apply filtering logic if requested
     if filter_top:
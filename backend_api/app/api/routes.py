@@ -10,7 +10,7 @@ from app.schemas.auth import User
 
 from app.dependencies.auth import get_current_user
 from app.services.predict_service import run_prediction, get_feature_importance
-from app.services.train_service import enqueue_training
+from app.services.train_service import start_training
 from app.services.history_service import fetch_prediction_history
 
 from app.api.execute import router as execute_router  # Broker execution subrouter
@@ -41,7 +41,7 @@ async def predict(
 @router.post("/train", response_model=TrainResponse, tags=["Training"])
 async def train_model(request: TrainRequest, user: User = Depends(get_current_user)):
     try:
-        task_id = enqueue_training(request.model_type)
+        task_id = start_training(request.model_type).id
         return {"message": "Training started", "task_id": task_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Training failed: {str(e)}")
@@ -10,12 +10,11 @@ from sqlalchemy import (
     Boolean,
     Text
 )
-from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from enum import Enum
 
-# Define Base here if not imported from elsewhere
-Base = declarative_base()
+from db.connection import Base
 
 
 class PredictionFeedback(Enum):
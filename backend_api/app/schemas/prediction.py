@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional, Literal
+from typing import Optional, Literal, Dict
 from datetime import datetime
 
 class PredictionInput(BaseModel):
@@ -20,10 +20,12 @@ class PredictionOutput(BaseModel):
     asset_type: str = Field(..., description="Asset class: stock, currency, or crypto")
     prediction: Literal[0, 1] = Field(..., description="Prediction class: 1 = Call/Buy, 0 = Put/Sell")
     confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence score for the prediction")
+    confidence_band: Optional[Dict[str, float]] = Field(None, description="MC dropout interval: lower/upper probability")
     entry_point: Optional[float] = Field(None, description="Suggested entry price")
     exit_point: Optional[float] = Field(None, description="Suggested exit price")
     model_type: str = Field(..., description="Model used to generate prediction")
     generated_at: datetime = Field(default_factory=datetime.utcnow, description="Timestamp of prediction generation")
+    contributions: Optional[Dict[str, Dict[str, float]]] = Field(None, description="Ensemble only: each member's probability and weight")
 
 
 
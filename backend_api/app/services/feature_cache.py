@@ -0,0 +1,115 @@
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Optional
+
+import numpy as np
+
+from oracle_ai_model.data.timeframes import bar_expiry, to_utc
+
+
+# ----------------------
+# Feature Cache
+# ----------------------
+class FeatureCache:
+    """
+    Feature vectors cached per (symbol, interval, last bar, feature set), in an
+    in-process LRU in front of an optional shared Redis tier.
+
+    The last bar is the open time of the newest bar the features are computed
+    from, so a new bar always gets a new key. Entries expire when that bar
+    closes (timeframes.bar_expiry): the LRU checks an expiry time and Redis gets
+    a matching TTL. Without a last bar nothing is cached. Values are stored as float32
+    blobs. Misses and hits come back rounded to float32 alike, so a cached
+    vector is identical to a fresh one.
+
+    `on_lookup(tier, result)` is called for each lookup ("memory"/"redis",
+    "hit"/"miss") so the API layer can export counters. Redis errors count as
+    misses and never fail the request.
+    """
+
+    def __init__(self, redis_client=None, max_entries: int = 4096, prefix: str = "fitinty:features",
+                 on_lookup: Optional[Callable[[str, str], None]] = None):
+        self.redis = redis_client
+        self.max_entries = max_entries
+        self.prefix = prefix
+        self.on_lookup = on_lookup
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (blob, expires_at epoch seconds)
+
+    def key(self, ticker: str, interval: str, window_size: int, selected_features: Iterable[str],
+            last_bar, now=None) -> tuple:
+        """(cache key, expiry as epoch seconds) for features ending with the bar opened at `last_bar`."""
+        last_bar = to_utc(last_bar)
+        spec = json.dumps({"features": sorted(set(selected_features)), "window_size": window_size})
+        digest = hashlib.sha1(spec.encode()).hexdigest()[:16]
+        key = f"{self.prefix}:{ticker.upper()}:{interval}:{last_bar.strftime('%Y%m%dT%H%M%S')}:{digest}"
+        return key, bar_expiry(interval, last_bar, now).timestamp()
+
+    def get_or_compute(self, ticker: str, interval: str, window_size: int, selected_features: Iterable[str],
+                       last_bar, compute: Callable[[], List[float]]) -> List[float]:
+        """Cached vector, or `compute()` stored in both tiers. Exceptions from `compute` are not cached."""
+        if last_bar is None:
+            return np.asarray(compute(), dtype=np.float32).tolist()
+        key, expires_at = self.key(ticker, interval, window_size, selected_features, last_bar)
+        blob = self._get_memory(key)
+        if blob is None:
+            blob = self._get_redis(key, expires_at)
+        if blob is None:
+            blob = np.asarray(compute(), dtype=np.float32).tobytes()
+            self._put_memory(key, blob, expires_at)
+            self._put_redis(key, blob, expires_at)
+        return np.frombuffer(blob, dtype=np.float32).tolist()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    # ----------------------
+    # Tiers
+    # ----------------------
+    def _get_memory(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        self._lookup("memory", entry is not None)
+        return entry[0] if entry is not None else None
+
+    def _put_memory(self, key: str, blob: bytes, expires_at: float):
+        with self._lock:
+            self._entries[key] = (blob, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_redis(self, key: str, expires_at: float) -> Optional[bytes]:
+        if self.redis is None:
+            return None
+        try:
+            blob = self.redis.get(key)
+        except Exception as e:
+            logging.warning(f"Feature cache Redis read failed: {e}")
+            blob = None
+        self._lookup("redis", blob is not None)
+        if blob is not None:
+            self._put_memory(key, blob, expires_at)
+        return blob
+
+    def _put_redis(self, key: str, blob: bytes, expires_at: float):
+        if self.redis is None:
+            return
+        try:
+            self.redis.set(key, blob, px=max(1, int((expires_at - time.time()) * 1000)))
+        except Exception as e:
+            logging.warning(f"Feature cache Redis write failed: {e}")
+
+    def _lookup(self, tier: str, hit: bool):
+        if self.on_lookup:
+            self.on_lookup(tier, "hit" if hit else "miss")
@@ -1,13 +1,70 @@
 import pandas as pd
-import pandas_ta as ta
-import yfinance as yf
+from oracle_ai_model.data.bar_store import get_bar_store
+from oracle_ai_model.data.loader import load_bars_shared, sync_many
+from oracle_ai_model.data.providers import get_provider
+from oracle_ai_model.data.timeframes import period_start
+from oracle_ai_model.utils.indicator_state import get_indicator_state_store
 import logging
 from typing import List
 
+from config import settings
 from db.connection import SessionLocal
 from models.feature_snapshot import FeatureSnapshot
+from deploy.monitoring.metrics import record_feature_cache
+from services.feature_cache import FeatureCache
 
 DEFAULT_FEATURES = ["rsi", "macd", "ema", "bbands", "adx", "stochrsi"]
+INTERVAL_MAP = {
+    "1m": "1m", "5m": "5m", "15m": "15m",
+    "1h": "60m", "1d": "1d"
+}
+FEATURE_PERIOD = "7d"
+
+# Selectable feature -> indicator engine columns, in output order. Values come from
+# the per-symbol IndicatorState (utils/indicator_state.py), which matches the engine
+# add_technical_indicators uses, so these match the training features.
+FEATURE_COLUMN_MAP = {
+    "rsi": ["rsi"],
+    "macd": ["macd"],
+    "ema": ["ema"],
+    "sma": ["bb_middle"],
+    "volume": ["Volume"],
+    "bbands": ["bb_upper", "bb_middle", "bb_lower"],
+    "adx": ["adx"],
+    "stochrsi": ["stochrsi_k", "stochrsi_d"],
+}
+
+def _feature_cache_redis():
+    if not settings.FEATURE_CACHE_REDIS:
+        return None
+    import redis
+    return redis.Redis.from_url(settings.REDIS_URL)  # binary values: no decode_responses
+
+# Keyed by (ticker, interval, newest bar, feature set); see FeatureCache
+feature_cache = FeatureCache(
+    redis_client=_feature_cache_redis(),
+    max_entries=settings.FEATURE_CACHE_MAX_ENTRIES,
+    on_lookup=record_feature_cache,
+)
+
+def prefetch_bars(tickers: List[str], interval: str):
+    """
+    Bulk-refresh the bars `get_features_for_ticker` reads, for a whole universe,
+    and fold the newly closed ones into each symbol's indicator state.
+    """
+    yf_interval = INTERVAL_MAP.get(interval, "1h")
+    _, errors = sync_many(tickers, interval=yf_interval, period=FEATURE_PERIOD)
+    for ticker, error in errors.items():
+        logging.warning(f"Prefetch failed for {ticker}: {error}")
+
+    now = get_provider().now()
+    bars = get_bar_store().read_many(tickers, yf_interval, start=period_start(FEATURE_PERIOD, now))
+    states = get_indicator_state_store()
+    for ticker, frame in bars.groupby("symbol", sort=False):
+        try:
+            states.advance(ticker, yf_interval, frame, now)
+        except Exception as e:
+            logging.warning(f"Indicator state update failed for {ticker}: {e}")
 
 def get_features_for_ticker(
     ticker: str,
@@ -22,59 +79,12 @@ def get_features_for_ticker(
     """
     try:
         selected_features = selected_features or DEFAULT_FEATURES
-        interval_map = {
-            "1m": "1m", "5m": "5m", "15m": "15m",
-            "1h": "60m", "1d": "1d"
-        }
-
-        yf_interval = interval_map.get(interval, "1h")
-        df = yf.download(ticker, period="7d", interval=yf_interval)
-
-        if df.empty or len(df) < window_size + 30:
-            raise ValueError(f"Not enough data for {ticker} ({len(df)} rows)")
-
-        df_ind = pd.DataFrame(index=df.index)
-
-        # -------------------- Core Indicators --------------------
-        if "rsi" in selected_features:
-            df_ind["rsi"] = ta.rsi(df["Close"], length=14)
-
-        if "macd" in selected_features:
-            macd = ta.macd(df["Close"], fast=12, slow=26, signal=9)
-            df_ind["macd"] = macd["MACD"]
-
-        if "ema" in selected_features:
-            df_ind["ema"] = ta.ema(df["Close"], length=10)
-
-        if "sma" in selected_features:
-            df_ind["sma"] = ta.sma(df["Close"], length=10)
-
-        if "volume" in selected_features:
-            df_ind["volume"] = df["Volume"]
-
-        # -------------------- Advanced Indicators --------------------
-        if "bbands" in selected_features:
-            bb = ta.bbands(df["Close"], length=20, std=2)
-            df_ind["bb_upper"] = bb["BBU_20_2.0"]
-            df_ind["bb_middle"] = bb["BBM_20_2.0"]
-            df_ind["bb_lower"] = bb["BBL_20_2.0"]
-
-        if "adx" in selected_features:
-            df_ind["adx"] = ta.adx(df["High"], df["Low"], df["Close"], length=14)["ADX_14"]
-
-        if "stochrsi" in selected_features:
-            stochrsi = ta.stochrsi(df["Close"], length=14)
-            df_ind["stochrsi_k"] = stochrsi["STOCHRSIk_14_14_3_3"]
-            df_ind["stochrsi_d"] = stochrsi["STOCHRSId_14_14_3_3"]
-
-        df_ind.dropna(inplace=True)
-        recent = df_ind.tail(window_size)
-
-        if len(recent) < window_size:
-            raise ValueError("Not enough clean rows for indicator window")
-
-        feature_values = recent.values.flatten().tolist()
-        normalized = _normalize_sequence(feature_values)
+        yf_interval = INTERVAL_MAP.get(interval, "1h")
+        bars = load_bars_shared(ticker, period=FEATURE_PERIOD, interval=yf_interval)
+        last_bar = bars["Date"].iloc[-1] if len(bars) else None
+        normalized = feature_cache.get_or_compute(
+            ticker, yf_interval, window_size, selected_features, last_bar,
+            lambda: _compute_features(ticker, yf_interval, bars, window_size, selected_features))
 
         # Save to DB if user_id provided
         if user_id:
@@ -87,6 +97,31 @@ def get_features_for_ticker(
         return [0.0] * window_size
 
 
+def _compute_features(ticker: str, yf_interval: str, bars: pd.DataFrame, window_size: int,
+                      selected_features: List[str]) -> List[float]:
+    df = bars.set_index("Date")
+
+    if df.empty or len(df) < window_size + 30:
+        raise ValueError(f"Not enough data for {ticker} ({len(df)} rows)")
+
+    # Last window_size rows from the stored state: only bars closed since the last call are computed
+    indicators = get_indicator_state_store().window(ticker, yf_interval, bars, window_size, get_provider().now())
+    indicators["Volume"] = df["Volume"].reindex(indicators.index).to_numpy(dtype=float)
+    df_ind = pd.DataFrame({
+        f"{feature}:{column}": indicators[column]
+        for feature, columns in FEATURE_COLUMN_MAP.items() if feature in selected_features
+        for column in columns
+    }, index=indicators.index)
+
+    df_ind.dropna(inplace=True)
+    recent = df_ind.tail(window_size)
+
+    if len(recent) < window_size:
+        raise ValueError("Not enough clean rows for indicator window")
+
+    return _normalize_sequence(recent.values.flatten().tolist())
+
+
 def _normalize_sequence(seq: List[float]) -> List[float]:
     series = pd.Series(seq)
     return ((series - series.mean()) / (series.std() + 1e-6)).tolist()
@@ -1,10 +1,14 @@
+import numpy as np
 import torch
 import time
 import logging
 from typing import List, Dict, Union
 from tenacity import retry, stop_after_attempt, wait_fixed
 
-from models.lstm_model import LSTMModel
+from oracle_ai_model.models.model import load_model as load_cached_model
+from oracle_ai_model.inference.scheduler import get_scheduler
+from oracle_ai_model.inference.config import INFERENCE_CONFIG
+from oracle_ai_model.inference.uncertainty import confidence_bands, supports_mc_dropout
 from schemas.response import PredictionOutput
 from datetime import datetime
 
@@ -12,26 +16,31 @@ from datetime import datetime
 # Globals
 # ----------------------
 _model = None
+_mc_model = None  # eager model for MC dropout bands (compiled artifacts have no dropout)
 _model_loaded = False
 MODEL_PATH = "models/lstm_model.pth"
+INPUT_SIZE = 1  # single feature sequence: (batch, seq_len, 1)
+SCHEDULER_KEY = "lstm-v1"
+SCHEDULER_GROUP = ("lstm", "unknown")  # (model_type, asset_type) labels of the flush metrics
 
 # ----------------------
 # Retry Decorator
 # ----------------------
 @retry(stop=stop_after_attempt(3), wait=wait_fixed(1))
-def safe_model_predict(input_tensor: torch.Tensor) -> torch.Tensor:
-    return _model(input_tensor)
+def safe_model_predict(window: np.ndarray) -> float:
+    # Micro-batched with concurrent callers; returns the sigmoid probability
+    return get_scheduler().predict(SCHEDULER_KEY, _model, window, group=SCHEDULER_GROUP)
 
 # ----------------------
-# Load the LSTM model once
+# Load the LSTM model once (via the shared model cache)
 # ----------------------
 def load_model() -> None:
-    global _model, _model_loaded
+    global _model, _mc_model, _model_loaded
     if not _model_loaded:
         try:
-            _model = LSTMModel()
-            _model.load_state_dict(torch.load(MODEL_PATH, map_location=torch.device('cpu')))
-            _model.eval()
+            _model = load_cached_model("lstm", MODEL_PATH, input_size=INPUT_SIZE)
+            _mc_model = _model if supports_mc_dropout(_model) else \
+                load_cached_model("lstm", MODEL_PATH, input_size=INPUT_SIZE, backend="eager")
             _model_loaded = True
             logging.info(f"Model loaded successfully from {MODEL_PATH}")
         except Exception as e:
@@ -45,6 +54,14 @@ def normalize_input(data: List[float]) -> torch.Tensor:
     tensor = torch.tensor(data, dtype=torch.float32)
     return (tensor - tensor.mean()) / (tensor.std() + 1e-6)
 
+# ----------------------
+# MC dropout confidence band
+# ----------------------
+def estimate_confidence_band(window: np.ndarray, prob: float) -> Dict[str, float]:
+    if not INFERENCE_CONFIG["mc_samples"]:
+        return {"lower": prob, "upper": prob}
+    return confidence_bands(_mc_model, [window])[0]
+
 # ----------------------
 # Main Predict Function
 # ----------------------
@@ -55,15 +72,13 @@ def run_lstm_prediction(ticker: str, features: List[float]) -> Union[PredictionO
         return _fallback_response(ticker, "model_load_failed")
 
     try:
-        input_tensor = normalize_input(features).unsqueeze(0).unsqueeze(-1)  # (batch, seq_len, 1)
+        window = normalize_input(features).unsqueeze(-1).numpy()  # (seq_len, 1)
         start = time.time()
-        with torch.no_grad():
-            output = safe_model_predict(input_tensor)
+        prob = safe_model_predict(window)
         elapsed = time.time() - start
 
-        prob = torch.sigmoid(output).item()
         prediction = 1 if prob > 0.5 else 0
-        confidence_band = {"lower": max(0, prob - 0.1), "upper": min(1, prob + 0.1)}
+        confidence_band = estimate_confidence_band(window, prob)
 
         return PredictionOutput(
             ticker=ticker,
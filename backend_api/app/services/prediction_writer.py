@@ -0,0 +1,165 @@
+import time
+import queue
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from config import settings
+from db.engine import SessionLocal
+from db.models.prediction import Prediction
+from db.models.user import User
+
+
+# ----------------------
+# Bulk Prediction Writer
+# ----------------------
+class PredictionWriter:
+    """
+    Persists Prediction rows with one multi-row INSERT per batch.
+
+    - `write(rows)` inserts synchronously: one statement and one transaction.
+    - `submit(rows)` hands the rows to a background thread. It flushes when
+      `max_batch` rows are pending or the oldest has waited `max_wait_ms`.
+      The queue is bounded at `max_queue` rows. When it is full, the caller
+      writes its own rows synchronously, so rows are never dropped.
+
+    Rows are plain dicts of `Prediction` column values (user_id, ticker,
+    interval, prediction, confidence, ...). Callers set `created_at` themselves
+    so the response does not need to read it back.
+
+    A failed synchronous write raises. A failed background batch cannot reach
+    its caller: it is logged, counted in `rows_dropped`/`batches_dropped` and
+    reported to `on_drop(row_count)` so the API layer can export it.
+    """
+
+    def __init__(self, model=Prediction, session_factory: Callable = SessionLocal,
+                 max_batch: int = None, max_wait_ms: float = None, max_queue: int = None,
+                 on_drop: Optional[Callable[[int], None]] = None):
+        self.model = model
+        self.session_factory = session_factory
+        self.max_batch = max_batch or settings.PREDICTION_WRITER_MAX_BATCH
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else settings.PREDICTION_WRITER_MAX_WAIT_MS) / 1000.0
+        self._queue = queue.Queue(maxsize=max_queue or settings.PREDICTION_WRITER_MAX_QUEUE)
+        self._worker = None
+        self._lock = threading.Lock()
+        self.on_drop = on_drop
+        self.rows_written = 0
+        self.batches_written = 0
+        self.rows_dropped = 0
+        self.batches_dropped = 0
+
+    def write(self, rows: List[Dict], db: Session = None):
+        """Insert `rows` now, in `db` if given (left open) or in a new session."""
+        if not rows:
+            return
+        session = db or self.session_factory()
+        try:
+            session.execute(insert(self.model), rows)  # executemany -> batched multi-row INSERT
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            if db is None:
+                session.close()
+        with self._lock:
+            self.rows_written += len(rows)
+            self.batches_written += 1
+
+    def submit(self, rows: List[Dict]):
+        self._ensure_worker()
+        for i, row in enumerate(rows):
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                logging.warning("Prediction write queue full; writing on the request path")
+                self.write(rows[i:])
+                return
+
+    def flush(self, timeout: float = None):
+        """Block until every submitted row has been written (or failed)."""
+        if self._worker is None:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="prediction-writer", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self.write(batch)
+            except Exception as e:
+                logging.error(f"Dropped {len(batch)} predictions, bulk insert failed: {e}")
+                self._dropped(len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+    def _dropped(self, rows: int):
+        with self._lock:
+            self.rows_dropped += rows
+            self.batches_dropped += 1
+        if self.on_drop:
+            try:
+                self.on_drop(rows)
+            except Exception as e:
+                logging.warning(f"Prediction writer on_drop hook failed: {e}")
+
+
+def ensure_prediction_user(session_factory: Callable = SessionLocal, user_id: str = None, email: str = None) -> str:
+    """
+    Create the service account /predict rows are saved under, if it is missing.
+
+    Prediction.user_id is a foreign key to users.id, so without this row every
+    background INSERT fails. Raises if the row can't be read or created; call it
+    at startup so a broken setup stops the API instead of dropping predictions.
+    """
+    user_id = user_id or settings.PREDICTION_USER_ID
+    session = session_factory()
+    try:
+        if session.get(User, user_id) is None:
+            session.add(User(id=user_id, email=email or settings.PREDICTION_USER_EMAIL, role="service"))
+            session.commit()
+            logging.info(f"Created prediction service user {user_id!r}")
+        return user_id
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def get_prediction_writer(on_drop: Optional[Callable[[int], None]] = None) -> PredictionWriter:
+    """Process-wide writer. Passing `on_drop` installs the metrics hook."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = PredictionWriter()
+        if on_drop is not None:
+            _writer.on_drop = on_drop
+        return _writer
@@ -0,0 +1,172 @@
+import time
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+# ----------------------
+# Retrain Coordinator
+# ----------------------
+class RetrainCoordinator:
+    """
+    Merges auto-retrain triggers into at most one job per model_type at a time.
+
+    `request(symbols, model_type)` only records the symbols. Once per model_type
+    a timer flushes everything pending as a single `dispatch(model_type, symbols)`
+    job covering the union of symbols. The timer fires `debounce_s` after the
+    first pending request, but never less than `min_interval_s` after that model
+    type's previous job. If that job is still running (`dispatch` returned a
+    handle whose `ready()` is False), the flush waits again rather than stacking
+    a second job. After `max_in_flight_s` the job is no longer waited on.
+
+    Those checks are per process. `claim(model_type)`, if given, is asked right
+    before dispatching and must return True for at most one caller across all
+    workers per `min_interval_s` (e.g. a Redis SET NX with that TTL). When
+    another worker holds the slot, the symbols stay pending for the next try.
+
+    `on_change(stats)` is called whenever the pending queue or job counts change,
+    so the API layer can export them.
+    """
+
+    def __init__(self, dispatch: Callable[[str, List[str]], object], debounce_s: float = 30.0,
+                 min_interval_s: float = 900.0, max_in_flight_s: float = 1800.0,
+                 claim: Optional[Callable[[str], bool]] = None, on_change: Optional[Callable] = None):
+        self.dispatch = dispatch
+        self.claim = claim
+        self.debounce_s = debounce_s
+        self.min_interval_s = min_interval_s
+        self.max_in_flight_s = max_in_flight_s
+        self.on_change = on_change
+        self._lock = threading.Lock()
+        self._pending: Dict[str, dict] = {}   # model_type -> {"symbols", "requests", "since"}
+        self._timers: Dict[str, threading.Timer] = {}
+        self._last_run: Dict[str, float] = {}
+        self._in_flight: Dict[str, tuple] = {}  # model_type -> (handle, dispatched_at)
+        self._totals: Dict[str, dict] = {}    # model_type -> {"requests", "jobs", "symbols"}
+
+    def request(self, symbols: Iterable[str], model_type: str = "lstm"):
+        symbols = {s.upper() for s in symbols}
+        if not symbols:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            pending = self._pending.setdefault(model_type, {"symbols": set(), "requests": 0, "since": now})
+            pending["symbols"].update(symbols)
+            pending["requests"] += 1
+            self._totals_for(model_type)["requests"] += 1
+            if model_type not in self._timers:
+                self._schedule(model_type, self._due(model_type, pending["since"]) - now)
+        self._changed()
+        return "Training Job Coalesced"
+
+    def flush_now(self, model_type: str):
+        """Dispatch pending symbols immediately (still deduped against an in-flight job)."""
+        with self._lock:
+            timer = self._timers.pop(model_type, None)
+        if timer:
+            timer.cancel()
+        self._flush(model_type)
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = {}
+            for model_type in set(self._pending) | set(self._totals):
+                pending = self._pending.get(model_type, {"symbols": (), "requests": 0})
+                totals = self._totals_for(model_type)
+                out[model_type] = {
+                    "pending_requests": pending["requests"],
+                    "pending_symbols": len(pending["symbols"]),
+                    "in_flight": self._is_in_flight(model_type),
+                    "requests": totals["requests"],
+                    "jobs": totals["jobs"],
+                    "symbols_dispatched": totals["symbols"],
+                    "coalescing_ratio": totals["requests"] / totals["jobs"] if totals["jobs"] else None,
+                }
+            return out
+
+    # ----------------------
+    # Internals
+    # ----------------------
+    def _totals_for(self, model_type: str) -> dict:
+        return self._totals.setdefault(model_type, {"requests": 0, "jobs": 0, "symbols": 0})
+
+    def _due(self, model_type: str, since: float) -> float:
+        last = self._last_run.get(model_type)
+        due = since + self.debounce_s
+        return due if last is None else max(due, last + self.min_interval_s)
+
+    def _schedule(self, model_type: str, delay: float):
+        timer = threading.Timer(max(0.0, delay), self._flush, args=(model_type,))
+        timer.daemon = True
+        self._timers[model_type] = timer
+        timer.start()
+
+    def _is_in_flight(self, model_type: str) -> bool:
+        handle, dispatched_at = self._in_flight.get(model_type, (None, 0.0))
+        if handle is None or time.monotonic() - dispatched_at > self.max_in_flight_s:
+            return False
+        try:
+            return not handle.ready()
+        except Exception:
+            return False  # result backend unavailable: don't block retrains on it
+
+    def _flush(self, model_type: str):
+        with self._lock:
+            self._timers.pop(model_type, None)
+            pending = self._pending.get(model_type)
+            if not pending:
+                return
+            if self._is_in_flight(model_type):
+                # Keep collecting; try again once the minimum interval has passed
+                self._schedule(model_type, self.min_interval_s)
+                return
+
+        if not self._claimed(model_type):
+            # Another worker dispatched this model_type's retrain; ours waits for the next slot
+            with self._lock:
+                if model_type not in self._timers:
+                    self._schedule(model_type, self.min_interval_s)
+            return
+
+        with self._lock:
+            pending = self._pending.pop(model_type, None)
+            if not pending:
+                return
+            symbols = sorted(pending["symbols"])
+            self._last_run[model_type] = time.monotonic()
+
+        try:
+            handle = self.dispatch(model_type, symbols)
+        except Exception as e:
+            logging.error(f"Failed to dispatch {model_type} retrain for {len(symbols)} symbols: {e}")
+            with self._lock:
+                # Put the symbols back and retry after the minimum interval
+                retry = self._pending.setdefault(model_type, {"symbols": set(), "requests": 0, "since": time.monotonic()})
+                retry["symbols"].update(symbols)
+                retry["requests"] += pending["requests"]
+                if model_type not in self._timers:
+                    self._schedule(model_type, self.min_interval_s)
+            self._changed()
+            return
+
+        with self._lock:
+            self._in_flight[model_type] = (handle, time.monotonic())
+            totals = self._totals_for(model_type)
+            totals["jobs"] += 1
+            totals["symbols"] += len(symbols)
+        logging.info(f"Dispatched {model_type} retrain for {len(symbols)} symbols "
+                     f"({pending['requests']} requests coalesced)")
+        self._changed()
+
+    def _claimed(self, model_type: str) -> bool:
+        if self.claim is None:
+            return True
+        try:
+            return self.claim(model_type)
+        except Exception as e:
+            logging.warning(f"Retrain claim for {model_type} failed, dispatching without it: {e}")
+            return True
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change(self.stats())
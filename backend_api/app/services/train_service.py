@@ -1,4 +1,50 @@
-def enqueue_training(*args, **kwargs):
-    # Placeholder logic for training
-    return "Training Job Queued"
+import os
+from typing import Iterable, List
 
+from config import settings
+from deploy.monitoring.metrics import record_retrain_stats
+from services.retrain_coordinator import RetrainCoordinator
+
+TRAIN_TASK = "tasks.train.train_model_task"
+
+
+def start_training(model_type: str = "lstm", symbols: List[str] = None):
+    """Send one training job to Celery right away. Returns its AsyncResult."""
+    from tasks.celery_app import celery_app
+    return celery_app.send_task(TRAIN_TASK, kwargs={"model_type": model_type, "symbols": symbols})
+
+
+def _retrain_lock_redis():
+    if not settings.RETRAIN_DEDUPE_REDIS:
+        return None
+    import redis
+    return redis.Redis.from_url(settings.REDIS_URL)
+
+_redis = _retrain_lock_redis()
+
+
+def claim_retrain(model_type: str) -> bool:
+    """
+    True for one API worker per model_type per RETRAIN_MIN_INTERVAL_S (SET NX with
+    that TTL). Without Redis every worker may claim; the per-process dedupe still applies.
+    """
+    if _redis is None:
+        return True
+    key = f"fitinty:retrain:{model_type}"
+    ttl_ms = int(settings.RETRAIN_MIN_INTERVAL_S * 1000)
+    return bool(_redis.set(key, os.getpid(), nx=True, px=max(1, ttl_ms)))
+
+
+# Auto-retrain triggers are merged per model_type (see RetrainCoordinator)
+coordinator = RetrainCoordinator(
+    dispatch=start_training,
+    debounce_s=settings.RETRAIN_DEBOUNCE_S,
+    min_interval_s=settings.RETRAIN_MIN_INTERVAL_S,
+    max_in_flight_s=settings.RETRAIN_MAX_IN_FLIGHT_S,
+    claim=claim_retrain,
+    on_change=record_retrain_stats,
+)
+
+
+def enqueue_training(symbols: Iterable[str], model_type: str = "lstm"):
+    return coordinator.request(symbols, model_type=model_type)
@@ -1,7 +1,8 @@
 from celery import Celery
 from celery.schedules import crontab
-from celery.signals import task_failure, task_postrun, task_prerun
+from celery.signals import task_failure, task_postrun, task_prerun, worker_init, worker_process_init
 from config.env_settings import settings
+from oracle_ai_model.models.preload import MODEL_PRELOAD, preload_models, init_forked_worker
 import logging
 import smtplib
 from email.message import EmailMessage
@@ -46,6 +47,20 @@ celery_app.conf.update(
 # --------------------------
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
+# --------------------------
+# Model Preload (shared copy-on-write by the prefork pool)
+# --------------------------
+@worker_init.connect
+def preload_worker_models(**kwargs):
+    # Runs in the parent before the pool forks, so recycled children
+    # (worker_max_tasks_per_child) inherit the models instead of reloading them
+    if MODEL_PRELOAD:
+        preload_models()
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    init_forked_worker()
+
 @task_prerun.connect
 def task_start_handler(sender=None, task_id=None, task=None, args=None, kwargs=None, **extra):
     logging.info(f"🚀 Task started: {sender.name} (id={task_id})")
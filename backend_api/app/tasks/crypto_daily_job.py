@@ -1,7 +1,7 @@
 # tasks/crypto_daily_job.py
 
 from celery_app import celery_app
-from services.feature_extraction import get_features_for_ticker
+from services.feature_extraction import get_features_for_ticker, prefetch_bars
 from oracle_ai_model.predict_from_model import run_lstm_prediction
 from strategies.trade_selector import select_top_trades
 from strategies.risk_management import apply_risk_management
@@ -13,6 +13,9 @@ def run_auto_crypto_trading():
     top_symbols = get_top_crypto_symbols(limit=30)
     predictions = []
 
+    # One bulk refresh up front; the per-symbol feature reads below then hit the bar store
+    prefetch_bars(top_symbols, interval="1h")
+
     for symbol in top_symbols:
         try:
             features = get_features_for_ticker(symbol, interval="1h", market_type="crypto")
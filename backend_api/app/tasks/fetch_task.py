@@ -1,12 +1,23 @@
 # backend_api/tasks/fetch_task.py
 
 from celery import shared_task
-from oracle_ai_model.data.fetch_enrich_save import fetch_enrich_and_save
+from oracle_ai_model.data.fetch_enrich_save import sync_market_data, sync_market_data_many
 
 @shared_task
-def fetch_and_store_market_data(symbol: str):
+def fetch_and_store_market_data(symbol: str, interval: str = "1d", period: str = "6mo"):
+    # Delta sync: cost follows the number of new bars, not the history length
     try:
-        df = fetch_enrich_and_save(symbol)
-        return {"status": "success", "rows": len(df)}
+        result = sync_market_data(symbol, interval=interval, period=period)
+        return {"status": "success", "rows": result["added"], **result}
+    except Exception as e:
+        return {"status": "error", "detail": str(e)}
+
+@shared_task
+def fetch_and_store_universe(symbols: list, interval: str = "1d", period: str = "6mo"):
+    # Grouped, rate-limited provider calls for the whole list
+    try:
+        results, errors = sync_market_data_many(symbols, interval=interval, period=period)
+        return {"status": "success", "rows": sum(r["added"] for r in results.values()),
+                "symbols": len(results), "errors": errors}
     except Exception as e:
         return {"status": "error", "detail": str(e)}
@@ -13,15 +13,16 @@ from services.system_monitor import (
 )
 
 @celery_app.task(name="tasks.train.train_model_task", bind=True, max_retries=3)
-def train_model_task(self, model_type="lstm"):
+def train_model_task(self, model_type="lstm", symbols=None):
     start_time = time.time()
     db = SessionLocal()
 
     try:
-        logging.info(f"🧠 Starting model training for: {model_type}")
+        logging.info(f"🧠 Starting model training for: {model_type}"
+                     + (f" on {len(symbols)} symbols" if symbols else ""))
 
-        # Train the model (returns model_version, etc.)
-        metrics = train_model(model_type)
+        # Train the model on the symbols that triggered the retrain (returns model_version, etc.)
+        metrics = train_model(model_type, symbols=symbols)
 
         # Evaluate the trained model
         evaluation = evaluate_model(model_type)
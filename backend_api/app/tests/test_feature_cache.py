@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from services.feature_cache import FeatureCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, px=None):
+        self.values[key] = value
+        self.ttls[key] = px
+
+
+class Lookups:
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, tier, result):
+        self.events.append((tier, result))
+
+
+def test_memory_then_redis_tiers():
+    redis, lookups, calls = FakeRedis(), Lookups(), []
+
+    def compute():
+        calls.append(1)
+        return [0.1, 0.2, 0.3]
+
+    last_bar = pd.Timestamp.now(tz="UTC").floor("15min")
+    cache = FeatureCache(redis_client=redis, on_lookup=lookups)
+    first = cache.get_or_compute("aapl", "15m", 30, ["rsi", "macd"], last_bar, compute)
+    second = cache.get_or_compute("AAPL", "15m", 30, ["macd", "rsi"], last_bar, compute)  # same feature set
+
+    assert first == second == np.float32([0.1, 0.2, 0.3]).tolist()
+    assert len(calls) == 1
+    assert lookups.events == [("memory", "miss"), ("redis", "miss"), ("memory", "hit")]
+    assert 0 < next(iter(redis.ttls.values())) <= 15 * 60 * 1000
+
+    # Another worker: empty LRU, shared Redis
+    other = FeatureCache(redis_client=redis, on_lookup=lookups)
+    assert other.get_or_compute("AAPL", "15m", 30, ["rsi", "macd"], last_bar, compute) == first
+    assert len(calls) == 1 and lookups.events[-1] == ("redis", "hit")
+
+
+def test_key_follows_the_newest_bar():
+    cache = FeatureCache()
+    now = pd.Timestamp("2024-03-05 10:45", tz="UTC")
+    # Off-grid bars (e.g. hourly bars opening at :30) key and expire on their own timestamps
+    before, expires = cache.key("AAPL", "60m", 30, ["rsi"], pd.Timestamp("2024-03-05 10:30", tz="UTC"), now=now)
+    after, _ = cache.key("AAPL", "60m", 30, ["rsi"], pd.Timestamp("2024-03-05 11:30", tz="UTC"), now=now)
+    other_set, _ = cache.key("AAPL", "60m", 60, ["rsi"], pd.Timestamp("2024-03-05 10:30", tz="UTC"), now=now)
+
+    assert before != after and before.split(":")[-1] == after.split(":")[-1]
+    assert "20240305T103000" in before
+    assert expires == pd.Timestamp("2024-03-05 11:30", tz="UTC").timestamp()
+    assert other_set.split(":")[-1] != before.split(":")[-1]
+
+
+def test_no_last_bar_is_not_cached():
+    cache, calls = FeatureCache(), []
+
+    for _ in range(2):
+        cache.get_or_compute("AAPL", "1d", 30, ["rsi"], None, lambda: calls.append(1) or [1.0])
+    assert len(calls) == 2
+
+
+def test_failures_are_not_cached():
+    cache = FeatureCache(max_entries=1)
+    last_bar = pd.Timestamp.now(tz="UTC").normalize()
+
+    def fail():
+        raise ValueError("not enough data")
+
+    for _ in range(2):
+        try:
+            cache.get_or_compute("AAPL", "1d", 30, ["rsi"], last_bar, fail)
+        except ValueError:
+            pass
+    assert cache.get_or_compute("AAPL", "1d", 30, ["rsi"], last_bar, lambda: [1.0]) == [1.0]
@@ -0,0 +1,105 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from db.connection import Base
+from db.models.prediction import Prediction
+from db.models.user import User
+from services.prediction_writer import PredictionWriter, ensure_prediction_user
+
+
+def _enforce_foreign_keys(dbapi_connection, _):
+    # Like Postgres: sqlite only checks Prediction.user_id -> users.id with this on
+    dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+
+def _writer(service_user=True, **kwargs):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    event.listen(engine, "connect", _enforce_foreign_keys)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    if service_user:
+        ensure_prediction_user(session_factory, user_id="system", email="system@example.com")
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a, **k: statements.append(a[2]))
+    return PredictionWriter(session_factory=session_factory, **kwargs), engine, statements
+
+
+def _rows(n):
+    # Same columns as the rows built by predict_endpoint
+    now = datetime.utcnow()
+    return [{
+        "user_id": "system", "ticker": f"S{i}", "interval": "1d", "prediction": int(i % 2),
+        "confidence": i / n, "confidence_band": None, "model_name": "lstm", "created_at": now,
+    } for i in range(n)]
+
+
+def _count(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(Prediction)).scalar()
+
+
+def test_write_uses_a_single_insert_statement():
+    writer, engine, statements = _writer()
+
+    writer.write(_rows(50))
+
+    assert _count(engine) == 50
+    assert sum(s.lstrip().upper().startswith("INSERT") for s in statements) == 1
+    assert writer.batches_written == 1
+
+
+def test_background_submit_batches_and_flushes():
+    writer, engine, _ = _writer(max_batch=40, max_wait_ms=50, max_queue=1000)
+
+    writer.submit(_rows(30))
+    writer.submit(_rows(30))
+    writer.flush(timeout=5)
+
+    assert _count(engine) == 60
+    assert writer.batches_written <= 3
+    assert writer.rows_dropped == 0
+
+
+def test_full_queue_falls_back_to_synchronous_write():
+    writer, engine, _ = _writer(max_batch=1000, max_wait_ms=500, max_queue=5)
+
+    writer.submit(_rows(20))  # 5 queued, 15 written on the caller's thread
+
+    assert _count(engine) == 15
+    writer.flush(timeout=5)
+    assert _count(engine) == 20
+
+
+def test_failed_background_batch_is_counted_as_dropped():
+    dropped = []
+    writer, engine, _ = _writer(max_batch=100, max_wait_ms=20, on_drop=dropped.append)
+    rows = _rows(10)
+    rows[3]["confidence"] = None  # NOT NULL column -> the whole INSERT fails
+
+    writer.submit(rows)
+    writer.flush(timeout=5)
+
+    assert _count(engine) == 0
+    assert (writer.rows_dropped, writer.batches_dropped) == (10, 1)
+    assert dropped == [10]
+
+
+def test_rows_need_the_service_user():
+    dropped = []
+    writer, engine, _ = _writer(service_user=False, max_wait_ms=20, on_drop=dropped.append)
+
+    writer.submit(_rows(5))  # FOREIGN KEY users.id fails
+    writer.flush(timeout=5)
+    assert _count(engine) == 0 and dropped == [5]
+
+    session_factory = writer.session_factory
+    assert ensure_prediction_user(session_factory, user_id="system", email="system@example.com") == "system"
+    ensure_prediction_user(session_factory, user_id="system", email="system@example.com")  # idempotent
+    writer.submit(_rows(5))
+    writer.flush(timeout=5)
+    assert _count(engine) == 5
+    with session_factory() as session:
+        assert session.query(User).count() == 1
@@ -0,0 +1,121 @@
+import threading
+import time
+
+from services.retrain_coordinator import RetrainCoordinator
+
+
+class FakeJob:
+    def __init__(self):
+        self.done = threading.Event()
+
+    def ready(self):
+        return self.done.is_set()
+
+
+class Dispatcher:
+    def __init__(self):
+        self.calls = []
+        self.jobs = []
+
+    def __call__(self, model_type, symbols):
+        self.calls.append((model_type, symbols))
+        self.jobs.append(FakeJob())
+        return self.jobs[-1]
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_burst_is_coalesced_into_one_job_per_model_type():
+    dispatch = Dispatcher()
+    coordinator = RetrainCoordinator(dispatch, debounce_s=0.05, min_interval_s=0.05)
+
+    for symbol in ["aapl", "msft", "AAPL", "tsla"] * 50:
+        coordinator.request([symbol], model_type="lstm")
+    coordinator.request(["AAPL"], model_type="gru")
+
+    assert _wait_for(lambda: len(dispatch.calls) == 2)
+    assert sorted(dispatch.calls) == [("gru", ["AAPL"]), ("lstm", ["AAPL", "MSFT", "TSLA"])]
+    stats = coordinator.stats()["lstm"]
+    assert stats["requests"] == 200 and stats["jobs"] == 1
+    assert stats["coalescing_ratio"] == 200
+    assert stats["pending_requests"] == 0
+
+
+def test_in_flight_job_is_not_duplicated():
+    dispatch = Dispatcher()
+    coordinator = RetrainCoordinator(dispatch, debounce_s=0.01, min_interval_s=0.05)
+
+    coordinator.request(["AAPL"], model_type="lstm")
+    assert _wait_for(lambda: len(dispatch.calls) == 1)
+
+    coordinator.request(["MSFT"], model_type="lstm")
+    time.sleep(0.2)  # several min intervals while the first job is still running
+    assert len(dispatch.calls) == 1
+    assert coordinator.stats()["lstm"]["pending_symbols"] == 1
+
+    dispatch.jobs[0].done.set()
+    assert _wait_for(lambda: len(dispatch.calls) == 2)
+    assert dispatch.calls[1] == ("lstm", ["MSFT"])
+
+
+def test_failed_dispatch_keeps_symbols_for_retry():
+    attempts = []
+
+    def flaky(model_type, symbols):
+        attempts.append(symbols)
+        if len(attempts) == 1:
+            raise ConnectionError("broker down")
+        return None
+
+    coordinator = RetrainCoordinator(flaky, debounce_s=0.01, min_interval_s=0.05)
+    coordinator.request(["AAPL", "MSFT"], model_type="lstm")
+
+    assert _wait_for(lambda: len(attempts) == 2)
+    assert attempts[1] == ["AAPL", "MSFT"]
+    assert coordinator.stats()["lstm"]["jobs"] == 1
+
+
+def test_empty_request_is_ignored():
+    dispatch = Dispatcher()
+    coordinator = RetrainCoordinator(dispatch, debounce_s=0.01, min_interval_s=0.05)
+
+    assert coordinator.request([], model_type="lstm") is None
+    time.sleep(0.1)
+    assert dispatch.calls == []
+    assert "lstm" not in coordinator.stats()
+
+
+class SharedSlot:
+    """Stand-in for the Redis SET NX PX claim shared by every worker."""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.expires = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, model_type):
+        with self.lock:
+            now = time.monotonic()
+            if self.expires.get(model_type, 0.0) > now:
+                return False
+            self.expires[model_type] = now + self.ttl
+            return True
+
+
+def test_one_retrain_per_burst_across_workers():
+    dispatch = Dispatcher()
+    slot = SharedSlot(ttl=0.3)
+    workers = [RetrainCoordinator(dispatch, debounce_s=0.02, min_interval_s=0.3, claim=slot) for _ in range(4)]
+
+    for i, worker in enumerate(workers):
+        worker.request([f"S{i}"], model_type="lstm")
+
+    assert _wait_for(lambda: len(dispatch.calls) == 1)
+    time.sleep(0.1)
+    assert len(dispatch.calls) == 1
+    assert sum(w.stats()["lstm"]["pending_symbols"] for w in workers) == 3
@@ -27,6 +27,26 @@ class Settings(BaseSettings):
     # AI Model
     LSTM_MODEL_PATH: str = "models/lstm_model.pth"
 
+    # Prediction persistence: "background" (bounded queue, bulk flush) or "request"
+    PREDICTION_WRITE_MODE: str = "background"
+    PREDICTION_WRITER_MAX_BATCH: int = 500
+    PREDICTION_WRITER_MAX_WAIT_MS: float = 200
+    PREDICTION_WRITER_MAX_QUEUE: int = 10000
+    # users.id that /predict rows are saved under; the service account row is created at startup
+    PREDICTION_USER_ID: str = "system"
+    PREDICTION_USER_EMAIL: str = "system@fitinty.com"
+
+    # Auto-retrain coalescing: wait for more triggers, then one job per model_type
+    RETRAIN_DEBOUNCE_S: float = 30
+    RETRAIN_MIN_INTERVAL_S: float = 900
+    RETRAIN_MAX_IN_FLIGHT_S: float = 1800
+    # Claim each retrain in Redis so API workers don't each dispatch their own
+    RETRAIN_DEDUPE_REDIS: bool = True
+
+    # Feature cache for get_features_for_ticker: in-process LRU, then Redis; entries live until bar close
+    FEATURE_CACHE_MAX_ENTRIES: int = 4096
+    FEATURE_CACHE_REDIS: bool = True
+
     # Email / SMTP
     SMTP_SERVER: Optional[str] = None
     SMTP_PORT: Optional[int] = None
@@ -13,8 +13,12 @@ from app.routes import user
 from app.api.execute import router as execute_router
 from backend.routes import email_report
 from deploy.monitoring.logging_config import setup_logging
-from deploy.monitoring.health import router as health_router
+from deploy.monitoring.health import router as health_router, mark_ready, mark_not_ready
 from deploy.monitoring.metrics import router as metrics_router
+from oracle_ai_model.models.preload import MODEL_PRELOAD, preload_models
+from oracle_ai_model.inference.warmup import warm_up, is_servable
+from oracle_ai_model.inference.ensemble import set_intra_op_threads
+from services.prediction_writer import ensure_prediction_user, get_prediction_writer
 
 from app.schemas.auth import User
 from dependencies.auth import get_current_user
@@ -22,6 +26,7 @@ from db.connection import engine, Base
 from config import settings
 
 import logging
+import threading
 import time
 import redis
 import psycopg2
@@ -35,6 +40,11 @@ logging.info(f"🚀 Starting FitintyTrade in {settings.MODE} mode")
 if not settings.JWT_SECRET_KEY:
     raise RuntimeError("Missing JWT_SECRET_KEY in environment")
 
+# Load checkpoints at import: `gunicorn --preload -k uvicorn.workers.UvicornWorker`
+# forks workers that share them; spawned `uvicorn --workers` share the mmap'd pages
+if MODEL_PRELOAD:
+    preload_models()
+
 # --------------------------------
 # ✅ Initialize FastAPI App
 # --------------------------------
@@ -125,9 +135,40 @@ async def on_startup():
 
     Base.metadata.create_all(bind=engine)
 
+    try:
+        # /predict rows reference this users.id; without it every background INSERT fails
+        ensure_prediction_user()
+        logging.info(f"✅ Prediction user {settings.PREDICTION_USER_ID!r} OK")
+    except Exception as user_error:
+        logging.error(f"❌ Prediction user {settings.PREDICTION_USER_ID!r} unavailable: {user_error}")
+        raise
+
+    # Process-wide torch intra-op cap (ENSEMBLE_INTRA_OP_THREADS), set once before any model runs
+    set_intra_op_threads()
+
+    # Models: warm up in the background; /ready answers 503 until it finishes
+    threading.Thread(target=_warm_up_models, name="model-warmup", daemon=True).start()
+
+def _warm_up_models():
+    # /ready stays 503 unless warm-up ran and left something to serve
+    try:
+        report = warm_up()
+    except Exception as warmup_error:
+        logging.error(f"❌ Model warm-up failed: {warmup_error}")
+        mark_not_ready({"error": str(warmup_error)})
+        return
+    if not is_servable(report):
+        logging.error(f"❌ Warm-up left nothing to serve; staying out of rotation: {report}")
+        mark_not_ready(report)
+        return
+    mark_ready(report)
+    logging.info("✅ Worker ready")
+
 @app.on_event("shutdown")
 async def on_shutdown():
     logging.info("🛑 Shutting down FitintyTrade API...")
+    # Drain queued Prediction rows before the process exits
+    get_prediction_writer().flush(timeout=10)
 
 # --------------------------------
 # Health Check
@@ -1,8 +1,39 @@
+import threading
+
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 
 router = APIRouter()
 
+# --------------------------------
+# Readiness (set once startup warm-up finishes)
+# --------------------------------
+_ready = threading.Event()
+_warmup_report = {}
+
+def mark_ready(report: dict = None):
+    _warmup_report.update(report or {})
+    _ready.set()
+
+def mark_not_ready(report: dict = None):
+    # A report (e.g. a failed warm-up) is shown on the 503 so operators see why
+    _ready.clear()
+    if report is not None:
+        _warmup_report.clear()
+        _warmup_report.update(report)
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
 @router.get("/health", tags=["System"])
 def health_check():
     return JSONResponse(content={"status": "ok"}, status_code=200)
+
+@router.get("/ready", tags=["System"])
+def readiness_check():
+    # Load balancers should only route to workers that answer 200 here
+    if not _ready.is_set():
+        if _warmup_report:
+            return JSONResponse(content={"status": "unavailable", "warmup": _warmup_report}, status_code=503)
+        return JSONResponse(content={"status": "warming_up"}, status_code=503)
+    return JSONResponse(content={"status": "ready", "warmup": _warmup_report}, status_code=200)
@@ -1,8 +1,159 @@
 from fastapi import APIRouter, Response
-from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST, Counter, Gauge, Histogram
 
 router = APIRouter()
 
+# --------------------------------
+# Inference scheduler
+# --------------------------------
+INFERENCE_QUEUE_DEPTH = Gauge(
+    "inference_queue_depth",
+    "Windows waiting in the micro-batching queue after the last flush",
+    ["model"],
+)
+INFERENCE_BATCH_SIZE = Histogram(
+    "inference_batch_size",
+    "Number of windows per batched forward pass",
+    ["model"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+INFERENCE_BATCH_WAIT = Histogram(
+    "inference_batch_wait_seconds",
+    "Time the oldest window in a batch waited before the flush",
+    ["model"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+
+def record_inference_flush(key, batch_size: int, queue_depth: int, wait_seconds: float, forward_seconds: float,
+                           groups: dict = None):
+    model = str(key)
+    INFERENCE_QUEUE_DEPTH.labels(model=model).set(queue_depth)
+    INFERENCE_BATCH_SIZE.labels(model=model).observe(batch_size)
+    INFERENCE_BATCH_WAIT.labels(model=model).observe(wait_seconds)
+    # Also exported as /predict stages per (model_type, asset_type) group the callers
+    # submitted under (not the scheduler key): the group's own wait, and its share
+    # of the batched forward. Untagged windows are labelled "unknown".
+    for group, (count, group_wait) in (groups or {None: (batch_size, wait_seconds)}).items():
+        model_type, asset_type = group or ("unknown", "unknown")
+        record_predict_stage("queue_wait", group_wait, model_type, asset_type)
+        record_predict_stage("model_forward", forward_seconds * count / batch_size, model_type, asset_type)
+
+# --------------------------------
+# Model cascade
+# --------------------------------
+CASCADE_STAGE_HIT_RATE = Gauge(
+    "cascade_stage_hit_rate",
+    "Fraction of windows reaching a cascade stage that it resolved",
+    ["stage"],
+)
+CASCADE_STAGE_WINDOWS = Gauge(
+    "cascade_stage_windows",
+    "Windows scored by a cascade stage since startup",
+    ["stage"],
+)
+CASCADE_COMPUTE_SAVED = Gauge(
+    "cascade_compute_saved_ratio",
+    "Estimated compute saved versus running the last cascade stage on every window",
+)
+
+def record_cascade_stats(stats: dict):
+    for stage, totals in stats["stages"].items():
+        CASCADE_STAGE_HIT_RATE.labels(stage=stage).set(totals["hit_rate"])
+        CASCADE_STAGE_WINDOWS.labels(stage=stage).set(totals["rows"])
+    if stats["compute_saved"] is not None:
+        CASCADE_COMPUTE_SAVED.set(stats["compute_saved"])
+
+# --------------------------------
+# Prediction pipeline stages
+# --------------------------------
+# Stages: download, indicators, normalize, tensor_build, queue_wait, model_forward,
+# confidence_bands, db_write, retrain_enqueue. Feature stages run once per symbol and
+# are shared by every model, so their model_type is "all"; batch-level stages are
+# split across the batch's (model_type, asset_type) groups by their share of the rows.
+PREDICT_STAGE_SECONDS = Histogram(
+    "predict_stage_seconds",
+    "Time spent in one stage of the /predict pipeline",
+    ["stage", "model_type", "asset_type"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+PREDICT_STAGE_ERRORS = Counter(
+    "predict_stage_errors_total",
+    "Failures in one stage of the /predict pipeline",
+    ["stage", "model_type", "asset_type"],
+)
+
+def record_predict_stage(stage: str, seconds: float, model_type: str = "all", asset_type: str = "unknown"):
+    PREDICT_STAGE_SECONDS.labels(stage=stage, model_type=model_type, asset_type=asset_type).observe(seconds)
+
+def record_predict_error(stage: str, model_type: str = "all", asset_type: str = "unknown"):
+    PREDICT_STAGE_ERRORS.labels(stage=stage, model_type=model_type, asset_type=asset_type).inc()
+
+def record_predict_stage_shared(stage: str, seconds: float, groups):
+    """
+    A stage timed once for a batch of rows: observed once per (model_type, asset_type)
+    in `groups` (one entry per row), with that group's share of the time.
+    """
+    counts = {}
+    for group in groups:
+        counts[group] = counts.get(group, 0) + 1
+    for (model_type, asset_type), count in counts.items():
+        record_predict_stage(stage, seconds * count / len(groups), model_type, asset_type)
+
+# --------------------------------
+# Auto-retrain coordinator
+# --------------------------------
+RETRAIN_PENDING_REQUESTS = Gauge(
+    "retrain_pending_requests",
+    "Retrain triggers waiting to be coalesced into the next job",
+    ["model_type"],
+)
+RETRAIN_PENDING_SYMBOLS = Gauge(
+    "retrain_pending_symbols",
+    "Distinct symbols the next retrain job will cover",
+    ["model_type"],
+)
+RETRAIN_JOBS = Gauge(
+    "retrain_jobs_dispatched",
+    "Retrain jobs sent to Celery since startup",
+    ["model_type"],
+)
+RETRAIN_COALESCING_RATIO = Gauge(
+    "retrain_coalescing_ratio",
+    "Retrain triggers per dispatched job",
+    ["model_type"],
+)
+
+def record_retrain_stats(stats: dict):
+    for model_type, s in stats.items():
+        RETRAIN_PENDING_REQUESTS.labels(model_type=model_type).set(s["pending_requests"])
+        RETRAIN_PENDING_SYMBOLS.labels(model_type=model_type).set(s["pending_symbols"])
+        RETRAIN_JOBS.labels(model_type=model_type).set(s["jobs"])
+        if s["coalescing_ratio"] is not None:
+            RETRAIN_COALESCING_RATIO.labels(model_type=model_type).set(s["coalescing_ratio"])
+
+# --------------------------------
+# Prediction writer
+# --------------------------------
+PREDICTION_ROWS_DROPPED = Counter(
+    "prediction_rows_dropped_total",
+    "Prediction rows lost because a background bulk INSERT failed",
+)
+
+def record_predictions_dropped(rows: int):
+    PREDICTION_ROWS_DROPPED.inc(rows)
+
+# --------------------------------
+# Feature cache
+# --------------------------------
+FEATURE_CACHE_LOOKUPS = Counter(
+    "feature_cache_lookups_total",
+    "Feature cache lookups by tier (memory, redis) and result (hit, miss)",
+    ["tier", "result"],
+)
+
+def record_feature_cache(tier: str, result: str):
+    FEATURE_CACHE_LOOKUPS.labels(tier=tier, result=result).inc()
+
 @router.get("/metrics")
 def metrics():
     return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,76 @@
+# oracle_ai_model/benchmarks/batched_indicators.py
+"""
+Universe-scan indicator cost: add_all_indicators once per symbol DataFrame vs
+one batched pass over a (n_symbols, n_bars) panel.
+
+Histories are ragged (random start per symbol) to exercise the NaN padding.
+The per-DataFrame path is timed on `--sample` symbols and scaled up.
+
+Usage:
+    python -m oracle_ai_model.benchmarks.batched_indicators --symbols 5000 --bars 500
+"""
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from oracle_ai_model.utils import indicator_engine as engine
+from oracle_ai_model.utils.indicators import add_all_indicators, add_all_indicators_batched
+
+
+def synthetic_universe(symbols: int, bars: int, seed: int = 0) -> pd.DataFrame:
+    """Long frame (symbol, Date, OHLCV) with histories of 60..bars bars."""
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(60, bars + 1, symbols)
+    lengths[0] = bars
+    codes = np.repeat(np.arange(symbols), lengths)
+    first = np.repeat(np.cumsum(lengths) - lengths, lengths)   # row of each symbol's first bar
+    position = np.arange(len(codes)) - first                    # bar number within the symbol
+
+    walk = (rng.standard_normal(len(codes)) * 0.1).cumsum()
+    close = 100 + walk - walk[first]
+    # Every history ends on the same bar
+    dates = pd.Timestamp("2024-01-01") + pd.to_timedelta(position + np.repeat(bars - lengths, lengths), unit="h")
+    return pd.DataFrame({
+        "symbol": np.array([f"S{i:05d}" for i in range(symbols)])[codes],
+        "Date": dates,
+        "High": close + rng.random(len(codes)), "Low": close - rng.random(len(codes)),
+        "Close": close, "Volume": rng.integers(1_000, 10_000, len(codes)).astype(float),
+    })
+
+
+def run(symbols: int, bars: int, sample: int, chunk_rows: int):
+    universe = synthetic_universe(symbols, bars)
+    frames = [frame.reset_index(drop=True) for _, frame in universe.groupby("symbol", sort=False)]
+    print(f"{symbols} symbols x up to {bars} bars ({len(universe):,} rows)")
+
+    sample = min(sample, symbols)
+    start = time.perf_counter()
+    for frame in frames[:sample]:
+        add_all_indicators(frame.copy())
+    per_frame = (time.perf_counter() - start) * symbols / sample
+    print(f"{'per-DataFrame add_all_indicators':<36}{per_frame:>9.2f}s  (timed on {sample} symbols)")
+
+    panels = {f: engine.stack_right_aligned([frame[f].to_numpy() for frame in frames], bars)
+              for f in ("High", "Low", "Close", "Volume")}
+    start = time.perf_counter()
+    engine.compute_indicators_batched(panels["High"], panels["Low"], panels["Close"], panels["Volume"],
+                                      chunk_rows=chunk_rows)
+    arrays = time.perf_counter() - start
+    print(f"{'batched, arrays in/out':<36}{arrays:>9.2f}s  {per_frame / arrays:>6.1f}x")
+
+    start = time.perf_counter()
+    add_all_indicators_batched(universe, chunk_rows=chunk_rows)
+    long_frame = time.perf_counter() - start
+    print(f"{'batched, long frame in/out':<36}{long_frame:>9.2f}s  {per_frame / long_frame:>6.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-symbol vs batched indicator computation.")
+    parser.add_argument("--symbols", type=int, default=5000)
+    parser.add_argument("--bars", type=int, default=500)
+    parser.add_argument("--sample", type=int, default=500, help="Symbols timed on the per-DataFrame path")
+    parser.add_argument("--chunk-rows", type=int, default=engine.BATCH_CHUNK_ROWS)
+    args = parser.parse_args()
+    run(args.symbols, args.bars, args.sample, args.chunk_rows)
@@ -0,0 +1,76 @@
+# oracle_ai_model/benchmarks/compiled_inference.py
+"""
+CPU latency of eager vs compiled (TorchScript, optionally ONNX) inference.
+
+Usage:
+    python -m oracle_ai_model.benchmarks.compiled_inference --threads 4 --repeats 50
+"""
+import os
+import time
+import argparse
+import tempfile
+
+import torch
+
+from oracle_ai_model.models.model import ModelRegistry
+from oracle_ai_model.models.export import export_torchscript, export_onnx, OnnxModule, compiled_path, TORCHSCRIPT_SUFFIX
+
+MODEL_TYPES = ["lstm", "gru", "tcn", "transformer"]
+BATCH_SIZES = [1, 32, 512]
+INPUT_SIZE = 5
+SEQ_LENGTH = 24
+
+
+def time_forward(model, batch: torch.Tensor, repeats: int, warmup: int = 5) -> float:
+    """Median wall time of one forward pass, in milliseconds."""
+    with torch.no_grad():
+        for _ in range(warmup):
+            model(batch)
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            model(batch)
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def build_backends(model_type: str, workdir: str, onnx: bool) -> dict:
+    eager = ModelRegistry().get_model(model_type, input_size=INPUT_SIZE).eval()
+    model_path = os.path.join(workdir, f"{model_type}_model.pth")
+    torch.save(eager.state_dict(), model_path)
+
+    backends = {"eager": eager}
+    export_torchscript(eager, model_path, INPUT_SIZE, SEQ_LENGTH)
+    backends["torchscript"] = torch.jit.load(compiled_path(model_path, TORCHSCRIPT_SUFFIX)).eval()
+    if onnx:
+        backends["onnx"] = OnnxModule(export_onnx(eager, model_path, INPUT_SIZE, SEQ_LENGTH))
+    return backends
+
+
+def run(repeats: int, onnx: bool):
+    print(f"{'model':<24}{'batch':>6}  " + "  ".join(f"{b:>12}" for b in ["eager_ms", "compiled_ms", "speedup"]))
+    with tempfile.TemporaryDirectory() as workdir:
+        for model_type in MODEL_TYPES:
+            backends = build_backends(model_type, workdir, onnx)
+            for batch_size in BATCH_SIZES:
+                batch = torch.randn(batch_size, SEQ_LENGTH, INPUT_SIZE)
+                eager_ms = time_forward(backends["eager"], batch, repeats)
+                for name, model in backends.items():
+                    if name == "eager":
+                        continue
+                    compiled_ms = time_forward(model, batch, repeats)
+                    print(f"{model_type + '/' + name:<24}{batch_size:>6}  "
+                          f"{eager_ms:>12.3f}  {compiled_ms:>12.3f}  {eager_ms / compiled_ms:>11.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark eager vs compiled CPU inference.")
+    parser.add_argument("--repeats", type=int, default=30)
+    parser.add_argument("--threads", type=int, default=None, help="torch intra-op threads")
+    parser.add_argument("--onnx", action="store_true", help="Include ONNX Runtime (requires onnx + onnxruntime)")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    run(args.repeats, args.onnx)
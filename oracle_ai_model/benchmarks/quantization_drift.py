@@ -0,0 +1,48 @@
+# oracle_ai_model/benchmarks/quantization_drift.py
+"""
+Accuracy-drift report of int8 dynamic quantization against fp32 on a held-out set.
+
+The held-out set is the most recent `--holdout` fraction of sequences built
+from the symbol's history, i.e. data the validation split also never trains on.
+
+Usage:
+    python -m oracle_ai_model.benchmarks.quantization_drift lstm lstm_model.pth --symbol AAPL --period 2y
+"""
+import json
+import argparse
+
+import torch
+
+from oracle_ai_model.models.model import ModelRegistry
+from oracle_ai_model.models.quantization import drift_report
+from oracle_ai_model.data.loader import download_stock_data
+from oracle_ai_model.utils.helpers import add_technical_indicators, normalize
+from oracle_ai_model.train.utils import prepare_sequences
+from oracle_ai_model.inference.batch import FEATURE_COLUMNS, SEQ_LENGTH
+
+
+def build_holdout(symbol: str, period: str, holdout: float):
+    df = download_stock_data(symbol, period=period)
+    df = add_technical_indicators(df)
+    df = normalize(df, FEATURE_COLUMNS)
+    X, y = prepare_sequences(df, FEATURE_COLUMNS, SEQ_LENGTH)
+    start = int(len(X) * (1 - holdout))
+    return torch.tensor(X[start:]).float(), y[start:]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report int8 vs fp32 drift on a held-out set.")
+    parser.add_argument("model_type", type=str, help="lstm, gru, tcn, transformer")
+    parser.add_argument("model_path", type=str, help="Path to the .pth checkpoint")
+    parser.add_argument("--symbol", type=str, default="AAPL")
+    parser.add_argument("--period", type=str, default="2y")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Most recent fraction of sequences to score")
+    args = parser.parse_args()
+
+    X, y = build_holdout(args.symbol, args.period, args.holdout)
+    registry = ModelRegistry()
+    kwargs = {"input_size": X.shape[2], "backend": "eager"}
+    fp32 = registry.load_checkpoint(args.model_type, args.model_path, quantize=False, **kwargs)
+    int8 = registry.load_checkpoint(args.model_type, args.model_path, quantize=True, **kwargs)
+
+    print(json.dumps(drift_report(fp32, int8, X, y), indent=2))
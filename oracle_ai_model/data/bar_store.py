@@ -0,0 +1,348 @@
+# data/bar_store.py
+"""
+Local Parquet store of OHLCV bars, partitioned by symbol and interval:
+
+    <root>/symbol=AAPL/interval=1d/part-<first bar>-<uuid>.parquet
+
+Prices are float32 and Volume is int64. Every file is sorted by Date, so
+time-range filters skip row groups using the Parquet statistics, and reads
+only load the requested columns. `append`/`upsert` write a new part holding
+just the new (or revised) bars; once a partition has more than
+BAR_STORE_MAX_PARTS parts they are compacted into one.
+
+Each part's first/last bar is read from its footer once and cached until the
+file changes, so freshness checks do not reopen every part on every sync.
+
+Reads and writes of a partition share a lock, so a read never sees a part
+that a concurrent rewrite or compaction is removing. The lock is a thread lock
+plus an flock on <partition>/.lock, because the API and the Celery workers
+share one store directory: writes hold it exclusively, reads shared. Should
+two parts still hold the same bar (e.g. a store written before the file lock),
+reads and compaction keep the bar from the newest part.
+"""
+import os
+import uuid
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+try:
+    import fcntl
+except ImportError:  # Windows: thread locks only
+    fcntl = None
+
+from .timeframes import to_utc, interval_length, period_start
+from .providers import get_provider
+
+BAR_STORE_DIR = os.getenv("BAR_STORE_DIR", "data/bars")
+
+# Parts per (symbol, interval) partition before an upsert compacts them
+BAR_STORE_MAX_PARTS = int(os.getenv("BAR_STORE_MAX_PARTS", "16"))
+
+# read_many re-lists the store this many times if a part vanishes mid-scan
+READ_MANY_ATTEMPTS = 3
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Adj Close"]
+BAR_SCHEMA = pa.schema(
+    [("Date", pa.timestamp("ns", tz="UTC"))]
+    + [(c, pa.float32()) for c in PRICE_COLUMNS]
+    + [("Volume", pa.int64())]
+)
+PARTITIONING = ds.partitioning(pa.schema([("symbol", pa.string()), ("interval", pa.string())]), flavor="hive")
+
+def to_bar_table(df: pd.DataFrame) -> pa.Table:
+    """Normalise a yfinance-style frame (Date/Datetime index or column) to BAR_SCHEMA."""
+    df = df.copy()
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)  # single-ticker download: ("Close", "AAPL")
+    if "Date" not in df.columns:
+        df = df.reset_index()
+        df = df.rename(columns={df.columns[0]: "Date"}) if "Date" not in df.columns else df
+    df = df.rename(columns={"Datetime": "Date"})
+
+    dates = pd.to_datetime(df["Date"])
+    dates = dates.dt.tz_localize("UTC") if dates.dt.tz is None else dates.dt.tz_convert("UTC")
+    out = pd.DataFrame({"Date": dates})
+    for column in PRICE_COLUMNS:
+        out[column] = (df[column] if column in df.columns else df["Close"]).astype("float32")
+    out["Volume"] = df["Volume"].fillna(0).astype("int64") if "Volume" in df.columns else 0
+    out = out.drop_duplicates("Date", keep="last").sort_values("Date")
+    return pa.Table.from_pandas(out, schema=BAR_SCHEMA, preserve_index=False)
+
+
+class BarStore:
+    def __init__(self, root: str = None, max_parts: int = None):
+        self.root = root or BAR_STORE_DIR
+        self.max_parts = max_parts or BAR_STORE_MAX_PARTS
+        self._lock = threading.Lock()  # guards _locks and _ranges
+        self._locks = {}               # partition path -> RLock
+        self._held = {}                # partition path -> [depth, lock file] while this process holds it
+        self._ranges = {}              # part path -> ((mtime_ns, size), (first, last) or None)
+
+    def _partition(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, f"symbol={symbol.upper()}", f"interval={interval}")
+
+    @contextmanager
+    def _partition_lock(self, symbol: str, interval: str, exclusive: bool = True):
+        """
+        Hold a partition against other threads and other processes. Re-entrant
+        within a thread; the outermost holder decides shared vs exclusive.
+        """
+        path = self._partition(symbol, interval)
+        with self._lock:
+            lock = self._locks.setdefault(path, threading.RLock())
+        with lock:
+            held = self._held.get(path)
+            if held is None:
+                held = self._held[path] = [0, self._open_file_lock(path, exclusive)]
+            held[0] += 1
+            try:
+                yield
+            finally:
+                held[0] -= 1
+                if held[0] == 0:
+                    del self._held[path]
+                    if held[1] is not None:
+                        held[1].close()  # releases the flock
+
+    @staticmethod
+    def _open_file_lock(path: str, exclusive: bool):
+        if fcntl is None:
+            return None
+        if not exclusive and not os.path.isdir(path):
+            return None  # nothing stored to read yet
+        os.makedirs(path, exist_ok=True)
+        handle = open(os.path.join(path, ".lock"), "a")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        except BaseException:
+            handle.close()
+            raise
+        return handle
+
+    def _parts(self, symbol: str, interval: str) -> List[str]:
+        """Parts of a partition, oldest write first (ties broken by name)."""
+        path = self._partition(symbol, interval)
+        if not os.path.isdir(path):
+            return []
+        parts = [os.path.join(path, f) for f in os.listdir(path) if f.endswith(".parquet")]
+        return sorted(parts, key=lambda part: (os.stat(part).st_mtime_ns, part))
+
+    # ----------------------
+    # Reads
+    # ----------------------
+    def read(self, symbol: str, interval: str, start=None, end=None, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Bars with start <= Date < end, oldest first. `columns` projects the read
+        (Date is always included).
+        """
+        with self._partition_lock(symbol, interval, exclusive=False):
+            parts = self._parts(symbol, interval)
+            if not parts:
+                return pd.DataFrame(columns=["Date"] + (columns or BAR_SCHEMA.names[1:]))
+            table = ds.dataset(parts, schema=BAR_SCHEMA, format="parquet").to_table(
+                columns=self._columns(columns), filter=self._time_filter(start, end))
+            if pc.count_distinct(table["Date"]).as_py() < table.num_rows:
+                table = self._newest(parts, columns=self._columns(columns), filter=self._time_filter(start, end))
+        return self._to_frame(table)
+
+    def read_many(self, symbols: Iterable[str], interval: str, start=None, end=None,
+                  columns: List[str] = None) -> pd.DataFrame:
+        """
+        One scan over several symbols; adds a `symbol` column. The scan spans
+        partitions without holding their locks, so it is retried if a part is
+        compacted away underneath it.
+        """
+        if not os.path.isdir(self.root):
+            return pd.DataFrame(columns=["symbol", "Date"] + (columns or BAR_SCHEMA.names[1:]))
+        wanted = pa.array([s.upper() for s in symbols])
+        predicate = (ds.field("interval") == interval) & ds.field("symbol").isin(wanted)
+        time_filter = self._time_filter(start, end)
+        if time_filter is not None:
+            predicate = predicate & time_filter
+        for attempt in range(READ_MANY_ATTEMPTS):
+            dataset = ds.dataset(self.root, format="parquet", partitioning=PARTITIONING,
+                                 schema=BAR_SCHEMA.append(pa.field("symbol", pa.string())).append(pa.field("interval", pa.string())))
+            try:
+                table = dataset.to_table(columns=["symbol"] + self._columns(columns), filter=predicate)
+                break
+            except FileNotFoundError:
+                if attempt == READ_MANY_ATTEMPTS - 1:
+                    raise
+        table = table.sort_by([("symbol", "ascending"), ("Date", "ascending")])
+        df = table.to_pandas()
+        duplicated = df.duplicated(["symbol", "Date"], keep="last")
+        return df[~duplicated].reset_index(drop=True) if duplicated.any() else df
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        """Newest stored bar, from the Parquet footers (no data pages are read)."""
+        return self._bound(symbol, interval, "max")
+
+    def first_timestamp(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        return self._bound(symbol, interval, "min")
+
+    def _bound(self, symbol: str, interval: str, which: str) -> Optional[pd.Timestamp]:
+        with self._partition_lock(symbol, interval, exclusive=False):
+            ranges = [r for r in map(self._part_range, self._parts(symbol, interval)) if r is not None]
+        if not ranges:
+            return None
+        return max(last for _, last in ranges) if which == "max" else min(first for first, _ in ranges)
+
+    def _part_range(self, part: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        # (first, last) bar of a part from its footer, cached until the file changes
+        stat = os.stat(part)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._ranges.get(part)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        metadata = pq.ParquetFile(part).metadata
+        stats = [metadata.row_group(i).column(0).statistics for i in range(metadata.num_row_groups)]
+        stats = [s for s in stats if s is not None and s.has_min_max]
+        bounds = (to_utc(min(s.min for s in stats)), to_utc(max(s.max for s in stats))) if stats else None
+        with self._lock:
+            self._ranges[part] = (signature, bounds)
+        return bounds
+
+    def _remove(self, part: str):
+        os.remove(part)
+        with self._lock:
+            self._ranges.pop(part, None)
+
+    # ----------------------
+    # Writes
+    # ----------------------
+    def append(self, symbol: str, interval: str, df: pd.DataFrame) -> int:
+        """Store the bars of `df` that are not stored yet. Returns the number written."""
+        return self.upsert(symbol, interval, df, revise=False)[0]
+
+    def upsert(self, symbol: str, interval: str, df: pd.DataFrame, revise: bool = True) -> Tuple[int, int]:
+        """
+        Store new bars and, with `revise`, replace stored bars whose values changed
+        (e.g. a partial last bar, or a provider correction). Returns (added, revised).
+        """
+        incoming = to_bar_table(df).to_pandas()
+        if incoming.empty:
+            return 0, 0
+        with self._partition_lock(symbol, interval):
+            existing = self.read(symbol, interval, start=incoming["Date"].iloc[0],
+                                 end=incoming["Date"].iloc[-1] + timedelta(microseconds=1))
+            if existing.empty:
+                # Nothing stored in this range (first load, or a pure append): no merge needed
+                added, revised = np.ones(len(incoming), dtype=bool), np.zeros(len(incoming), dtype=bool)
+            else:
+                merged = incoming.merge(existing, on="Date", how="left", suffixes=("", "_old"), indicator=True)
+                added = (merged["_merge"] == "left_only").to_numpy()
+                revised = np.zeros(len(merged), dtype=bool)
+            if revise and not existing.empty:
+                for column in BAR_SCHEMA.names[1:]:
+                    new, old = merged[column], merged[f"{column}_old"]
+                    revised |= (~added & (new != old) & ~(new.isna() & old.isna())).to_numpy()
+
+            rows = incoming[added | revised]
+            if rows.empty:
+                return 0, 0
+            if revised.any():
+                self._drop_dates(symbol, interval, incoming["Date"][revised])
+
+            path = self._partition(symbol, interval)
+            os.makedirs(path, exist_ok=True)
+            stamp = rows["Date"].iloc[0].strftime("%Y%m%dT%H%M%S")
+            pq.write_table(pa.Table.from_pandas(rows, schema=BAR_SCHEMA, preserve_index=False),
+                           os.path.join(path, f"part-{stamp}-{uuid.uuid4().hex[:8]}.parquet"))
+            if len(self._parts(symbol, interval)) > self.max_parts:
+                self._compact(symbol, interval)
+
+        logging.info(f"Bar store: {int(added.sum())} new / {int(revised.sum())} revised "
+                     f"{interval} bars for {symbol.upper()}")
+        return int(added.sum()), int(revised.sum())
+
+    def _drop_dates(self, symbol: str, interval: str, dates: pd.Series):
+        # Rewrite only the parts that can hold these bars (the newest ones, for a delta sync)
+        earliest = dates.min()
+        drop = pa.array(dates, BAR_SCHEMA.field("Date").type)
+        for part in self._parts(symbol, interval):
+            bounds = self._part_range(part)
+            if bounds is not None and bounds[1] < earliest:
+                continue
+            table = pq.read_table(part, schema=BAR_SCHEMA)
+            kept = table.filter(pc.invert(pc.is_in(table["Date"], drop)))
+            if kept.num_rows == table.num_rows:
+                continue
+            if kept.num_rows:
+                pq.write_table(kept, part + ".tmp")
+                os.replace(part + ".tmp", part)
+                with self._lock:
+                    self._ranges.pop(part, None)
+            else:
+                self._remove(part)
+
+    def compact(self, symbol: str, interval: str):
+        """Merge a partition's parts into one sorted file."""
+        with self._partition_lock(symbol, interval):
+            self._compact(symbol, interval)
+
+    def _compact(self, symbol: str, interval: str):
+        parts = self._parts(symbol, interval)
+        if len(parts) < 2:
+            return
+        table = self._newest(parts)
+        path = self._partition(symbol, interval)
+        pq.write_table(table, os.path.join(path, f"part-compact-{uuid.uuid4().hex[:8]}.parquet"))
+        for part in parts:
+            self._remove(part)
+
+    # ----------------------
+    # Helpers
+    # ----------------------
+    @staticmethod
+    def _newest(parts: List[str], columns: List[str] = None, filter=None) -> pa.Table:
+        # Parts in write order; a bar held by several parts keeps the newest part's values
+        tables = [ds.dataset(part, schema=BAR_SCHEMA, format="parquet").to_table(columns=columns, filter=filter)
+                  for part in parts]
+        df = pd.concat([t.to_pandas() for t in tables], ignore_index=True)
+        df = df.drop_duplicates("Date", keep="last").sort_values("Date")
+        schema = pa.schema([BAR_SCHEMA.field(c) for c in df.columns])
+        return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+    @staticmethod
+    def _columns(columns: Optional[List[str]]) -> List[str]:
+        if columns is None:
+            return BAR_SCHEMA.names
+        return ["Date"] + [c for c in columns if c != "Date"]
+
+    @staticmethod
+    def _time_filter(start, end):
+        date_type = BAR_SCHEMA.field("Date").type
+        predicate = None
+        if start is not None:
+            predicate = ds.field("Date") >= pa.scalar(to_utc(start), date_type)
+        if end is not None:
+            bound = ds.field("Date") < pa.scalar(to_utc(end), date_type)
+            predicate = bound if predicate is None else predicate & bound
+        return predicate
+
+    @staticmethod
+    def _to_frame(table: pa.Table) -> pd.DataFrame:
+        return table.sort_by("Date").to_pandas()
+
+
+_bar_store = None
+_bar_store_lock = threading.Lock()
+
+def get_bar_store() -> BarStore:
+    global _bar_store
+    with _bar_store_lock:
+        if _bar_store is None:
+            # One tree per provider, so synthetic or replayed bars never mix with real ones
+            _bar_store = BarStore(os.path.join(BAR_STORE_DIR, get_provider().name))
+        return _bar_store
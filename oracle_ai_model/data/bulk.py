@@ -0,0 +1,105 @@
+# data/bulk.py
+"""
+Bulk multi-symbol fetches. Symbols are split into groups of the provider's
+`batch_size` (one multi-ticker request each), and the groups run on a thread
+pool bounded by the provider's `max_concurrency`, paced by its
+`requests_per_second`. A failed group is retried symbol by symbol, so one bad
+ticker does not fail its neighbours.
+"""
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+from .providers import MarketDataProvider, get_provider
+
+
+class RateLimiter:
+    """Token bucket: at most `rate` acquisitions per second, bursting up to `burst`."""
+
+    def __init__(self, rate: float = None, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# One limiter per provider name, shared by every bulk fetch in the process
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def _limiter(provider: MarketDataProvider) -> RateLimiter:
+    with _limiters_lock:
+        if provider.name not in _limiters:
+            _limiters[provider.name] = RateLimiter(provider.requests_per_second)
+        return _limiters[provider.name]
+
+
+def fetch_bulk(symbols: Iterable[str], interval: str = "1d", period: str = None, start: datetime = None,
+               provider: MarketDataProvider = None, max_workers: int = None
+               ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    """
+    Fetch many symbols at once. Returns ({symbol: frame}, {symbol: error}); every
+    requested symbol ends up in exactly one of the two.
+    """
+    provider = provider or get_provider()
+    limiter = _limiter(provider)
+    symbols = list(dict.fromkeys(s.upper() for s in symbols))
+    size = max(1, provider.batch_size)
+    groups = [symbols[i:i + size] for i in range(0, len(symbols), size)]
+    frames: Dict[str, pd.DataFrame] = {}
+    errors: Dict[str, str] = {}
+    lock = threading.Lock()
+
+    def fetch_group(group: List[str]):
+        try:
+            limiter.acquire()
+            got = provider.fetch_many(group, interval=interval, period=period, start=start)
+            failed = {}
+        except Exception as e:
+            if len(group) == 1:
+                got, failed = {}, {group[0]: str(e)}
+            else:
+                logging.warning(f"Bulk fetch of {len(group)} symbols failed ({e}); retrying one by one")
+                got, failed = {}, {}
+                for symbol in group:
+                    try:
+                        limiter.acquire()
+                        got.update(provider.fetch_many([symbol], interval=interval, period=period, start=start))
+                    except Exception as e:
+                        failed[symbol] = str(e)
+        with lock:
+            for symbol in group:
+                frame = got.get(symbol)
+                if frame is not None and not frame.empty:
+                    frames[symbol] = frame
+                else:
+                    errors[symbol] = failed.get(symbol, "no data returned")
+
+    workers = min(max_workers or provider.max_concurrency, len(groups)) or 1
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"fetch-{provider.name}") as pool:
+        list(pool.map(fetch_group, groups))
+
+    logging.info(f"Bulk fetch ({provider.name}, {interval}): {len(frames)} ok / {len(errors)} failed "
+                 f"in {len(groups)} requests, {time.perf_counter() - start_time:.2f}s")
+    return frames, errors
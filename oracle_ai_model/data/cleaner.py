@@ -0,0 +1,9 @@
+# data/cleaner.py
+import pandas as pd
+
+def clean_data(df):
+    df = df.dropna()
+    df = df[df.select_dtypes(include=['number']).apply(lambda x: ~x.isin([float('inf'), float('-inf')])).all(axis=1)]
+    df = df.sort_values(by=df.columns[0])  # Sort by time/index
+    df = df.reset_index(drop=True)
+    return df
@@ -0,0 +1,110 @@
+# data/coalesce.py
+"""
+Request coalescing for the data path.
+
+- SingleFlight: concurrent calls with the same key share one execution; the
+  callers that arrive while it runs wait for its result (or its exception).
+- BarCloseCache: a SingleFlight-backed result cache whose entries expire at the
+  close of the newest bar they contain, so repeated calls within a bar are
+  served from memory.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import pandas as pd
+
+from .timeframes import bar_expiry
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class BarCloseCache:
+    """
+    `get(key, interval, load)` returns the cached value for `key` if its bar has
+    not closed yet; otherwise it runs `load` (once, across concurrent callers) and
+    caches the result. Failures are not cached.
+
+    `last_bar(value)` gives the open time of the newest bar in a loaded value; the
+    entry then expires when that bar closes (see timeframes.bar_expiry). Without
+    it, or when it returns None, entries expire at the next close on the UTC grid.
+    """
+
+    def __init__(self, max_entries: int = 4096, last_bar: Optional[Callable[[Any], Any]] = None):
+        self.max_entries = max_entries
+        self.last_bar = last_bar
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, expires_at)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, interval: str, load: Callable[[], Any]) -> Any:
+        now = pd.Timestamp.now(tz="UTC")
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        return self._flight.do(key, lambda: self._load(key, interval, load))
+
+    def _load(self, key, interval, load):
+        value = load()
+        expires = bar_expiry(interval, self.last_bar(value) if self.last_bar else None)
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "loads": self._flight.executions, "coalesced": self._flight.shared}
@@ -1,8 +1,12 @@
 # oracle_ai_model/data/fetch_enrich_save.py
 
-import yfinance as yf
 import pandas as pd
 from datetime import datetime
+from typing import Dict, List, Tuple
+from oracle_ai_model.data.bar_store import get_bar_store
+from oracle_ai_model.data.timeframes import period_start
+from oracle_ai_model.data.loader import sync_bars, sync_many
+from oracle_ai_model.data.providers import get_provider
 from oracle_ai_model.data.market_data import enrich_market_data
 
 # DB imports
@@ -10,26 +14,23 @@ from backend_api.app.db.connection import SessionLocal
 from backend_api.app.db.models import MarketSnapshotLog
 
 
-def fetch_enrich_and_save(symbol: str, interval: str = "1d", period: str = "6mo") -> pd.DataFrame:
+def sync_market_data(symbol: str, interval: str = "1d", period: str = "6mo") -> dict:
+    """
+    Delta-sync one symbol into the bar store and record a MarketSnapshotLog
+    with the number of bars added.
+    """
     db = SessionLocal()
     try:
-        df = yf.download(symbol, period=period, interval=interval)
-        if df.empty:
-            raise ValueError(f"No data retrieved for symbol: {symbol}")
-        
-        enriched_df = enrich_market_data(df, symbol)
-
-        # Log to DB
-        log = MarketSnapshotLog(
+        result = sync_bars(symbol, interval=interval, period=period)
+        db.add(MarketSnapshotLog(
             symbol=symbol,
             status="success",
-            message="Data fetched and enriched",
-            row_count=len(enriched_df)
-        )
-        db.add(log)
+            message=f"{result['mode']} sync ({interval}): fetched {result['fetched']}, "
+                    f"added {result['added']}, revised {result['revised']}",
+            row_count=result["added"]
+        ))
         db.commit()
-
-        return enriched_df
+        return result
 
     except Exception as e:
         # Log failure
@@ -43,3 +44,37 @@ def fetch_enrich_and_save(symbol: str, interval: str = "1d", period: str = "6mo"
         raise e
     finally:
         db.close()
+
+
+def sync_market_data_many(symbols: List[str], interval: str = "1d", period: str = "6mo"
+                          ) -> Tuple[Dict[str, dict], Dict[str, str]]:
+    """Bulk `sync_market_data`: one grouped fetch, one MarketSnapshotLog per symbol in a single commit."""
+    results, errors = sync_many(symbols, interval=interval, period=period)
+    db = SessionLocal()
+    try:
+        db.add_all([MarketSnapshotLog(
+            symbol=symbol,
+            status="success",
+            message=f"{r['mode']} sync ({interval}): fetched {r['fetched']}, "
+                    f"added {r['added']}, revised {r['revised']}",
+            row_count=r["added"]
+        ) for symbol, r in results.items()] + [MarketSnapshotLog(
+            symbol=symbol,
+            status="error",
+            message=error,
+            row_count=0
+        ) for symbol, error in errors.items()])
+        db.commit()
+    finally:
+        db.close()
+    return results, errors
+
+
+def fetch_enrich_and_save(symbol: str, interval: str = "1d", period: str = "6mo") -> pd.DataFrame:
+    sync_market_data(symbol, interval=interval, period=period)
+
+    df = get_bar_store().read(symbol, interval, start=period_start(period, get_provider().now()))
+    if df.empty:
+        raise ValueError(f"No data retrieved for symbol: {symbol}")
+
+    return enrich_market_data(df, symbol)
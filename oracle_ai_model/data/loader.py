@@ -1,11 +1,18 @@
 # data/loader.py
 
-import yfinance as yf
 import pandas as pd
 import os
-from datetime import datetime
+import math
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Tuple
 from .cleaner import clean_data
 from .snapshot import save_snapshot
+from .bar_store import BarStore, get_bar_store
+from .timeframes import interval_length, period_start
+from .providers import MarketDataProvider, get_provider
+from .bulk import fetch_bulk
+from .coalesce import BarCloseCache
 
 # Placeholder for live forex or broker APIs (to be implemented)
 def get_live_forex_data(symbol, interval="1d", outputsize="compact"):
@@ -17,12 +24,139 @@ def get_live_stock_data(symbol, interval="1d"):
     raise NotImplementedError("Live Stock data fetch not yet implemented")
 
 def download_stock_data(symbol, period="1mo", interval="1d"):
-    print(f"Downloading stock data for {symbol}...")
-    df = yf.download(symbol, period=period, interval=interval)
-    df = df.reset_index()
+    df = load_bars_shared(symbol, period=period, interval=interval)
     df["symbol"] = symbol
     return df
 
+# Stored history may start a little after the period start (weekends, holidays)
+COVERAGE_SLACK = timedelta(days=5)
+
+# Re-fetch this many of the newest stored bars on every delta sync, so a partial
+# last bar or a provider correction is reconciled
+SYNC_OVERLAP_BARS = int(os.getenv("SYNC_OVERLAP_BARS", "2"))
+
+def _sync_plan(symbol, interval, period, store: BarStore, now: pd.Timestamp):
+    """("full", None), ("delta", fetch_from) or ("fresh", None) for one symbol, as of the provider's `now`."""
+    step = interval_length(interval)
+    start = period_start(period, now)
+    first = store.first_timestamp(symbol, interval)
+    last = store.last_timestamp(symbol, interval)
+
+    if first is None or (start is not None and first > start + max(step, COVERAGE_SLACK)):
+        return "full", None
+    if last < now - step:
+        return "delta", last - (SYNC_OVERLAP_BARS - 1) * step
+    return "fresh", None
+
+def sync_bars(symbol, interval="1d", period="1mo", store: BarStore = None,
+              provider: MarketDataProvider = None) -> dict:
+    """
+    Bring the bar store up to date for (symbol, interval), fetching only what is missing:
+
+    - "full": nothing stored, or stored history does not reach back to the period start
+    - "delta": bars from the last SYNC_OVERLAP_BARS stored ones onwards
+    - "fresh": the newest stored bar is less than one interval old; nothing is fetched
+
+    Returns {"mode", "fetched", "added", "revised"}.
+    """
+    store = store or get_bar_store()
+    provider = provider or get_provider()
+    mode, fetch_from = _sync_plan(symbol, interval, period, store, provider.now())
+
+    if mode == "full":
+        print(f"Downloading stock data for {symbol}...")
+        df = provider.fetch(symbol, interval=interval, period=period)
+    elif mode == "delta":
+        df = provider.fetch(symbol, interval=interval, start=fetch_from.to_pydatetime())
+    else:
+        return {"mode": "fresh", "fetched": 0, "added": 0, "revised": 0}
+
+    added, revised = store.upsert(symbol, interval, df)
+    return {"mode": mode, "fetched": len(df), "added": added, "revised": revised}
+
+def _delta_buckets(delta: Dict[str, pd.Timestamp], interval: str, now: pd.Timestamp):
+    """
+    Delta symbols grouped by bars missing, in powers of two (<= 2, 3-4, 5-8, ...),
+    newest first. A bucket fetches from its oldest start, so each symbol
+    downloads at most about twice the bars it needs.
+    """
+    step = interval_length(interval)
+    buckets = {}
+    for symbol, fetch_from in delta.items():
+        missing = max(1, math.ceil((now - fetch_from) / step))
+        buckets.setdefault(math.ceil(math.log2(missing)), []).append(symbol)
+    return [buckets[size] for size in sorted(buckets)]
+
+def sync_many(symbols, interval="1d", period="1mo", store: BarStore = None,
+              provider: MarketDataProvider = None) -> Tuple[Dict[str, dict], Dict[str, str]]:
+    """
+    `sync_bars` for a whole universe with bulk fetches: one grouped fetch for the
+    symbols that need full history, and one per bucket of delta syncs missing a
+    similar number of bars (see `_delta_buckets`), so one stale symbol does not
+    make the whole universe download its history. The upsert drops the bars
+    already stored.
+
+    Returns ({symbol: sync result}, {symbol: error}).
+    """
+    store = store or get_bar_store()
+    provider = provider or get_provider()
+    results, errors, full, delta = {}, {}, [], {}
+    now = provider.now()
+    for symbol in dict.fromkeys(s.upper() for s in symbols):
+        mode, fetch_from = _sync_plan(symbol, interval, period, store, now)
+        if mode == "full":
+            full.append(symbol)
+        elif mode == "delta":
+            delta[symbol] = fetch_from
+        else:
+            results[symbol] = {"mode": "fresh", "fetched": 0, "added": 0, "revised": 0}
+
+    batches = []
+    if full:
+        batches.append(("full", fetch_bulk(full, interval, period=period, provider=provider)))
+    for bucket in _delta_buckets(delta, interval, now):
+        start = min(delta[symbol] for symbol in bucket)
+        batches.append(("delta", fetch_bulk(bucket, interval, start=start.to_pydatetime(), provider=provider)))
+    for mode, (frames, failed) in batches:
+        errors.update(failed)
+        for symbol, df in frames.items():
+            try:
+                added, revised = store.upsert(symbol, interval, df)
+                results[symbol] = {"mode": mode, "fetched": len(df), "added": added, "revised": revised}
+            except Exception as e:
+                errors[symbol] = str(e)
+    return results, errors
+
+def load_bars(symbol, period="1mo", interval="1d", store: BarStore = None,
+              provider: MarketDataProvider = None):
+    """Delta-sync (symbol, interval), then read the period (on the provider's clock) from the local bar store."""
+    store = store or get_bar_store()
+    provider = provider or get_provider()
+    sync_bars(symbol, interval=interval, period=period, store=store, provider=provider)
+    return store.read(symbol, interval, start=period_start(period, provider.now()))
+
+# Shared by every caller in the process; entries expire at the close of their bar
+BAR_CACHE_MAX_ENTRIES = int(os.getenv("BAR_CACHE_MAX_ENTRIES", "4096"))
+_bar_cache = BarCloseCache(BAR_CACHE_MAX_ENTRIES, last_bar=lambda df: df["Date"].iloc[-1] if len(df) else None)
+
+def load_bars_shared(symbol, period="1mo", interval="1d"):
+    """
+    `load_bars` for the serving path: concurrent calls for the same (symbol, period,
+    interval) share one sync + read, and the result is reused until its newest bar closes.
+    Returns a copy the caller may modify.
+    """
+    key = (symbol.upper(), period, interval)
+    return _bar_cache.get(key, interval, lambda: load_bars(symbol, period=period, interval=interval)).copy()
+
+def load_training_bars(symbols, period="5y", interval="1d", store: BarStore = None):
+    """Multi-symbol training set: top up every symbol in bulk, then read them all in one scan."""
+    store = store or get_bar_store()
+    provider = get_provider()
+    _, errors = sync_many(symbols, interval=interval, period=period, store=store, provider=provider)
+    for symbol, error in errors.items():
+        logging.warning(f"Could not refresh {symbol} ({interval}): {error}")
+    return store.read_many(symbols, interval, start=period_start(period, provider.now()))
+
 def load_forex_csv(path):
     if not os.path.exists(path):
         raise FileNotFoundError(f"Forex data file not found: {path}")
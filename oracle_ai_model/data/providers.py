@@ -0,0 +1,202 @@
+# data/providers.py
+"""
+Market-data providers. Every provider returns yfinance-style frames: a "Date"
+index and Open/High/Low/Close/Adj Close/Volume columns.
+
+- "yfinance": live downloads (the default)
+- "replay": bars read back from CSV/Parquet files, for offline runs and load tests
+- "synthetic": a deterministic random walk per symbol, for benchmarks at any scale
+
+The provider is picked by MARKET_DATA_PROVIDER. Each provider also has a clock,
+`now()`: the loader measures periods and staleness against it, so a replayed
+recording looks current however old it is.
+"""
+import os
+import zlib
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .timeframes import interval_length, period_start, to_utc
+
+MARKET_DATA_PROVIDER = os.getenv("MARKET_DATA_PROVIDER", "yfinance")
+MARKET_DATA_REPLAY_DIR = os.getenv("MARKET_DATA_REPLAY_DIR", "data/replay")
+# Replay clock override (e.g. "2023-06-30 16:00"); default: the newest recorded bar
+MARKET_DATA_REPLAY_NOW = os.getenv("MARKET_DATA_REPLAY_NOW")
+SYNTHETIC_SEED = int(os.getenv("SYNTHETIC_SEED", "0"))
+
+
+class MarketDataProvider:
+    name = "base"
+    batch_size = 1                 # symbols per request; > 1 if the source takes multi-ticker requests
+    max_concurrency = 8            # requests in flight at once
+    requests_per_second = None     # None: no rate limit
+
+    def now(self) -> pd.Timestamp:
+        """The provider's current time (UTC); the wall clock for live sources."""
+        return pd.Timestamp(datetime.now(timezone.utc))
+
+    def fetch(self, symbol: str, interval: str = "1d", period: str = None, start: datetime = None) -> pd.DataFrame:
+        """Bars for `symbol` over `period` (e.g. "6mo") or since `start`."""
+        raise NotImplementedError
+
+    def fetch_many(self, symbols: List[str], interval: str = "1d", period: str = None,
+                   start: datetime = None) -> Dict[str, pd.DataFrame]:
+        """One request for up to `batch_size` symbols. Symbols without data are left out."""
+        return {symbol: self.fetch(symbol, interval, period, start) for symbol in symbols}
+
+    @staticmethod
+    def _window(df: pd.DataFrame, period: str = None, start: datetime = None, now: datetime = None) -> pd.DataFrame:
+        lower = to_utc(start) if start is not None else (period_start(period, now) if period else None)
+        return df if lower is None else df[df.index >= lower]
+
+
+class YFinanceProvider(MarketDataProvider):
+    name = "yfinance"
+    batch_size = int(os.getenv("YFINANCE_BATCH_SIZE", "50"))
+    max_concurrency = int(os.getenv("YFINANCE_MAX_CONCURRENCY", "2"))
+    requests_per_second = float(os.getenv("YFINANCE_REQUESTS_PER_SECOND", "1"))
+
+    def fetch(self, symbol, interval="1d", period=None, start=None):
+        import yfinance as yf
+        if start is not None:
+            return yf.download(symbol, start=start, interval=interval)
+        return yf.download(symbol, period=period or "1mo", interval=interval)
+
+    def fetch_many(self, symbols, interval="1d", period=None, start=None):
+        import yfinance as yf
+        window = {"start": start} if start is not None else {"period": period or "1mo"}
+        df = yf.download(list(symbols), interval=interval, group_by="ticker", threads=True,
+                         progress=False, **window)
+        frames = {}
+        for symbol in symbols:
+            if isinstance(df.columns, pd.MultiIndex) and symbol in df.columns.get_level_values(0):
+                frame = df[symbol].dropna(how="all")
+                if not frame.empty:
+                    frames[symbol] = frame
+        return frames
+
+
+class FileReplayProvider(MarketDataProvider):
+    """
+    Serves `<root>/<SYMBOL>_<interval>.parquet` (or `.csv`, or `<SYMBOL>.csv` for
+    any interval). Periods are measured back from the file's last bar, so a
+    recording replays the same way on any day.
+
+    The clock, `now()`, stands still at the newest bar across the recordings in
+    `root` (read once) or at `now` / MARKET_DATA_REPLAY_NOW if given, so the
+    store holds the recorded timestamps and a synced symbol stays "fresh".
+    """
+    name = "replay"
+
+    def __init__(self, root: str = None, now=None):
+        self.root = root or MARKET_DATA_REPLAY_DIR
+        now = now if now is not None else MARKET_DATA_REPLAY_NOW
+        self._now = to_utc(now) if now is not None else None
+        self._frames: Dict[tuple, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def now(self) -> pd.Timestamp:
+        if self._now is None:
+            ends = [self._read(os.path.join(self.root, name)).index.max()
+                    for name in sorted(os.listdir(self.root)) if name.endswith((".parquet", ".csv"))]
+            ends = [end for end in ends if not pd.isna(end)]
+            if not ends:
+                raise FileNotFoundError(f"No replay files in {self.root}")
+            self._now = max(ends)
+        return self._now
+
+    def _path(self, symbol: str, interval: str) -> Optional[str]:
+        for name in (f"{symbol}_{interval}.parquet", f"{symbol}_{interval}.csv", f"{symbol}.parquet", f"{symbol}.csv"):
+            path = os.path.join(self.root, name)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _load(self, symbol: str, interval: str) -> pd.DataFrame:
+        key = (symbol.upper(), interval)
+        with self._lock:
+            if key not in self._frames:
+                path = self._path(symbol.upper(), interval)
+                if path is None:
+                    raise FileNotFoundError(f"No replay file for {symbol} ({interval}) in {self.root}")
+                self._frames[key] = self._read(path)
+            return self._frames[key]
+
+    @staticmethod
+    def _read(path: str) -> pd.DataFrame:
+        df = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+        date_column = "Date" if "Date" in df.columns else df.columns[0]
+        df.index = pd.to_datetime(df.pop(date_column), utc=True).rename("Date")
+        return df.sort_index()
+
+    def fetch(self, symbol, interval="1d", period=None, start=None):
+        df = self._load(symbol, interval)
+        now = self.now()
+        return self._window(df[df.index <= now], period, start, now=now)
+
+
+class SyntheticProvider(MarketDataProvider):
+    """
+    Geometric random walk per symbol, seeded from the symbol name, on a 24/7 bar
+    grid up to now. Bars are generated from a fixed origin, so repeated or delta
+    fetches return the same values for the same timestamps.
+    """
+    name = "synthetic"
+    DAILY_ORIGIN = pd.Timestamp("2000-01-01", tz="UTC")
+    INTRADAY_HISTORY = timedelta(days=90)  # intraday origin moves in steps of this
+
+    def __init__(self, seed: int = None, volatility: float = 0.02, start_price: float = 100.0):
+        self.seed = SYNTHETIC_SEED if seed is None else seed
+        self.volatility = volatility
+        self.start_price = start_price
+
+    def _origin(self, step: timedelta, now: pd.Timestamp) -> pd.Timestamp:
+        if step >= timedelta(days=1):
+            return self.DAILY_ORIGIN
+        epoch = pd.Timestamp("1970-01-01", tz="UTC")
+        chunks = (now - self.INTRADAY_HISTORY - epoch) // self.INTRADAY_HISTORY
+        return epoch + chunks * self.INTRADAY_HISTORY
+
+    def fetch(self, symbol, interval="1d", period=None, start=None):
+        now = self.now()
+        step = interval_length(interval)
+        origin = self._origin(step, now)
+        index = pd.date_range(origin, now, freq=step, name="Date")
+
+        rng = np.random.default_rng([self.seed, zlib.crc32(symbol.upper().encode()), int(step.total_seconds())])
+        returns = rng.normal(0.0, self.volatility * np.sqrt(step / timedelta(days=1)), (len(index), 4))
+        close = self.start_price * np.exp(np.cumsum(returns[:, 0]))
+        open_ = np.concatenate([[self.start_price], close[:-1]])
+        high = np.maximum(open_, close) * np.exp(np.abs(returns[:, 1]) / 2)
+        low = np.minimum(open_, close) * np.exp(-np.abs(returns[:, 2]) / 2)
+        volume = (1_000_000 * np.exp(returns[:, 3] * 10)).astype(np.int64)
+
+        df = pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close,
+                           "Adj Close": close, "Volume": volume}, index=index)
+        return self._window(df, period or "1mo", start, now=now)
+
+
+PROVIDERS = {
+    "yfinance": YFinanceProvider,
+    "replay": FileReplayProvider,
+    "synthetic": SyntheticProvider,
+}
+
+_provider = None
+_provider_lock = threading.Lock()
+
+def get_provider(name: str = None) -> MarketDataProvider:
+    """The configured provider (a shared instance), or a new one by name."""
+    global _provider
+    if name is not None:
+        if name not in PROVIDERS:
+            raise ValueError(f"Unknown market data provider '{name}'. Available: {list(PROVIDERS)}")
+        return PROVIDERS[name]()
+    with _provider_lock:
+        if _provider is None:
+            _provider = get_provider(MARKET_DATA_PROVIDER)
+        return _provider
@@ -0,0 +1,10 @@
+# data/sources.py
+# Future extension to OANDA, Alpha Vantage, or Alpaca
+
+def fetch_from_oanda(symbol, interval):
+    # TODO: Use OANDA API
+    raise NotImplementedError("OANDA integration not implemented yet")
+
+def fetch_from_alpaca(symbol, interval):
+    # TODO: Use Alpaca API for live stock
+    raise NotImplementedError("Alpaca integration not implemented yet")
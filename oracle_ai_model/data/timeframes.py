@@ -0,0 +1,81 @@
+# data/timeframes.py
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import pandas as pd
+
+_PERIOD = re.compile(r"^(\d+)(d|wk|mo|y)$")
+_INTERVAL = re.compile(r"^(\d+)(m|h|d|wk|mo)$")
+_UNIT_DAYS = {"d": 1, "wk": 7, "mo": 31, "y": 366}
+
+
+def to_utc(value) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def period_start(period: str, now: datetime = None) -> Optional[pd.Timestamp]:
+    """Earliest bar a yfinance-style period ("7d", "6mo", "5y", "ytd", "max") covers."""
+    now = to_utc(now or datetime.now(timezone.utc))
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1, tz="UTC")
+    match = _PERIOD.match(period)
+    if not match:
+        raise ValueError(f"Unsupported period '{period}'")
+    count, unit = int(match.group(1)), match.group(2)
+    return now - timedelta(days=count * _UNIT_DAYS[unit])
+
+
+def _parse_interval(interval: str):
+    match = _INTERVAL.match(interval.replace("60m", "1h"))
+    if not match:
+        raise ValueError(f"Unsupported interval '{interval}'")
+    return int(match.group(1)), match.group(2)
+
+
+def interval_length(interval: str) -> timedelta:
+    """Nominal bar length (a month counts as 31 days); see bar_close for exact closes."""
+    count, unit = _parse_interval(interval)
+    return {"m": timedelta(minutes=count), "h": timedelta(hours=count), "d": timedelta(days=count),
+            "wk": timedelta(weeks=count), "mo": timedelta(days=31 * count)}[unit]
+
+
+def bar_close(bar_start, interval: str) -> pd.Timestamp:
+    """Close of the bar that opened at `bar_start` (calendar months for "mo")."""
+    count, unit = _parse_interval(interval)
+    start = to_utc(bar_start)
+    if unit == "mo":
+        return start + pd.DateOffset(months=count)
+    return start + pd.Timedelta(interval_length(interval))
+
+
+def next_bar_close(interval: str, now: datetime = None) -> pd.Timestamp:
+    """
+    End of the bar containing `now` on the UTC grid: intraday and daily bars are
+    epoch-aligned, weeks start on Monday and months on the 1st.
+    """
+    now = to_utc(now or datetime.now(timezone.utc))
+    count, unit = _parse_interval(interval)
+    if unit == "mo":
+        index = ((now.year * 12 + now.month - 1) // count + 1) * count
+        return pd.Timestamp(year=index // 12, month=index % 12 + 1, day=1, tz="UTC")
+    step = pd.Timedelta(interval_length(interval))
+    origin = pd.Timestamp("1970-01-05" if unit == "wk" else "1970-01-01", tz="UTC")  # 1970-01-05 is a Monday
+    return origin + ((now - origin) // step + 1) * step
+
+
+def bar_expiry(interval: str, last_bar=None, now: datetime = None) -> pd.Timestamp:
+    """
+    When data ending with the bar that opened at `last_bar` goes stale: that bar's
+    close, so venue-specific grids (e.g. US hourly bars at :30) are respected. If
+    the close has already passed with no newer bar (market closed, provider lag),
+    check again one interval from now. Without `last_bar`, the UTC grid close.
+    """
+    now = to_utc(now or datetime.now(timezone.utc))
+    if last_bar is None or pd.isna(last_bar):
+        return next_bar_close(interval, now)
+    close = bar_close(last_bar, interval)
+    return close if close > now else now + pd.Timedelta(interval_length(interval))
@@ -0,0 +1,52 @@
+# oracle_ai_model/inference/batch.py
+
+from collections import OrderedDict
+from typing import List
+
+import numpy as np
+import pandas as pd
+import torch
+
+FEATURE_COLUMNS = ["Close", "rsi", "macd", "ema", "volatility"]
+SEQ_LENGTH = 24
+
+
+def build_window(df: pd.DataFrame, features: List[str] = FEATURE_COLUMNS, seq_length: int = SEQ_LENGTH) -> np.ndarray:
+    """
+    Slice the last `seq_length` rows of the feature columns as a float32 (seq_len, features) array.
+    """
+    data = df[features].values[-seq_length:]
+    return np.ascontiguousarray(data, dtype=np.float32)
+
+
+def predict_proba(model: torch.nn.Module, batch: torch.Tensor) -> np.ndarray:
+    """
+    Single forward pass over a (N, seq_len, features) batch. Returns N probabilities.
+    """
+    with torch.no_grad():
+        output = model(batch)
+        return torch.sigmoid(output).reshape(-1).numpy()
+
+
+def group_by_shape(windows: List[np.ndarray]) -> List[List[int]]:
+    """
+    Indices of `windows` grouped by window shape, in first-seen order
+    (symbols with a short history end up in their own group).
+    """
+    groups = OrderedDict()
+    for i, window in enumerate(windows):
+        groups.setdefault(window.shape, []).append(i)
+    return list(groups.values())
+
+
+def batched_predict(model: torch.nn.Module, windows: List[np.ndarray]) -> List[float]:
+    """
+    Stack per-symbol windows and score them with one forward per distinct window shape.
+    Results keep input order.
+    """
+    probs = [None] * len(windows)
+    for indices in group_by_shape(windows):
+        batch = torch.from_numpy(np.stack([windows[i] for i in indices]))
+        for i, prob in zip(indices, predict_proba(model, batch)):
+            probs[i] = float(prob)
+    return probs
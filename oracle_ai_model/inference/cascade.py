@@ -0,0 +1,93 @@
+# oracle_ai_model/inference/cascade.py
+
+import time
+import threading
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+
+from oracle_ai_model.inference.batch import batched_predict
+from oracle_ai_model.inference.config import INFERENCE_CONFIG
+
+
+class CascadePredictor:
+    """
+    Confidence-gated cheap-first inference.
+
+    The first (cheapest) stage scores every window. Only windows whose
+    probability falls inside the uncertainty `band` (inclusive) are escalated
+    to the next, more expensive stage. The last stage decides whatever
+    reaches it.
+
+    Stages are passed per call as (name, model) pairs, so checkpoints picked up
+    by the model cache after a retrain are used straight away. Running totals
+    give each stage's hit rate and the compute saved compared with running the
+    last stage over every window. `on_predict(stats)` is called after every
+    call so the API layer can export them.
+    """
+
+    def __init__(self, band: Tuple[float, float] = None, on_predict: Optional[Callable] = None):
+        self.band = tuple(band or INFERENCE_CONFIG["cascade_band"])
+        self.on_predict = on_predict
+        self._lock = threading.Lock()
+        self._windows = 0
+        self._stages = {}  # name -> {"rows", "resolved", "seconds"}
+        self._last_stage = None
+
+    def predict(self, stages: Sequence[Tuple[str, torch.nn.Module]],
+                windows: List[np.ndarray]) -> Tuple[List[float], List[str]]:
+        """Returns (probability, deciding stage name) for each window, in input order."""
+        if not stages:
+            raise ValueError("A cascade needs at least one stage")
+        lower, upper = self.band
+
+        probs = [None] * len(windows)
+        decided_by = [None] * len(windows)
+        pending = list(range(len(windows)))
+        timings = []
+
+        for depth, (name, model) in enumerate(stages):
+            if not pending:
+                break
+            start = time.perf_counter()
+            stage_probs = batched_predict(model, [windows[i] for i in pending])
+            elapsed = time.perf_counter() - start
+
+            last = depth == len(stages) - 1
+            escalated = []
+            for i, prob in zip(pending, stage_probs):
+                probs[i] = prob
+                decided_by[i] = name
+                if not last and lower <= prob <= upper:
+                    escalated.append(i)
+            timings.append((name, len(pending), len(pending) - len(escalated), elapsed))
+            pending = escalated
+
+        with self._lock:
+            self._windows += len(windows)
+            for name, rows, resolved, seconds in timings:
+                totals = self._stages.setdefault(name, {"rows": 0, "resolved": 0, "seconds": 0.0})
+                totals["rows"] += rows
+                totals["resolved"] += resolved
+                totals["seconds"] += seconds
+            self._last_stage = stages[-1][0]
+
+        if self.on_predict:
+            self.on_predict(self.stats())
+        return probs, decided_by
+
+    def stats(self) -> dict:
+        with self._lock:
+            stages = {
+                name: dict(t, hit_rate=t["resolved"] / t["rows"] if t["rows"] else 0.0)
+                for name, t in self._stages.items()
+            }
+            # Baseline: the last stage's measured per-window cost over every window
+            last = self._stages.get(self._last_stage)
+            compute_saved = None
+            if last and last["rows"]:
+                baseline = self._windows * last["seconds"] / last["rows"]
+                spent = sum(t["seconds"] for t in self._stages.values())
+                compute_saved = 1.0 - spent / baseline if baseline else None
+            return {"windows": self._windows, "stages": stages, "compute_saved": compute_saved}
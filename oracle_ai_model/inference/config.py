@@ -0,0 +1,38 @@
+# oracle_ai_model/inference/config.py
+
+import os
+
+INFERENCE_CONFIG = {
+    # Micro-batching scheduler: flush when either limit is reached
+    "max_batch_size": int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "256")),
+    "max_wait_ms": float(os.getenv("INFERENCE_MAX_WAIT_MS", "5")),
+
+    # Streaming recurrent inference: re-run the window from stored bars every N updates
+    "stream_resync_every": int(os.getenv("STREAM_RESYNC_EVERY", "24")),
+
+    # MC dropout confidence bands: stochastic samples per window (0 disables),
+    # the (lower, upper) quantiles reported, and the row cap of one tiled forward.
+    # LSTM/GRU bands sample only the head dropout (cheap, narrow) unless
+    # MC_DROPOUT_RECURRENT also samples the inter-layer RNN dropout (K full forwards)
+    "mc_samples": int(os.getenv("MC_DROPOUT_SAMPLES", "32")),
+    "mc_quantiles": tuple(float(q) for q in os.getenv("MC_DROPOUT_QUANTILES", "0.05,0.95").split(",")),
+    "mc_max_rows": int(os.getenv("MC_DROPOUT_MAX_ROWS", "8192")),
+    "mc_recurrent_dropout": os.getenv("MC_DROPOUT_RECURRENT", "0") == "1",
+
+    # Cascade (model_type="cascade"): stages cheapest first; probabilities inside
+    # the band are escalated to the next stage
+    "cascade_stages": [m.strip() for m in os.getenv("CASCADE_STAGES", "gru,transformer").split(",") if m.strip()],
+    "cascade_band": tuple(float(b) for b in os.getenv("CASCADE_BAND", "0.4,0.6").split(",")),
+
+    # Ensemble (model_type="ensemble"): members averaged with optional weights;
+    # members run in `ensemble_workers` threads (0 = sequential) and torch's
+    # intra-op pool is capped at `ensemble_intra_op_threads` (0 = torch default;
+    # process-wide, applied once at startup by set_intra_op_threads)
+    "ensemble_members": [m.strip() for m in os.getenv("ENSEMBLE_MODELS", "lstm,gru,tcn,transformer").split(",") if m.strip()],
+    "ensemble_weights": [float(w) for w in os.getenv("ENSEMBLE_WEIGHTS", "").split(",") if w.strip()],
+    "ensemble_workers": int(os.getenv("ENSEMBLE_WORKERS", "0")),
+    "ensemble_intra_op_threads": int(os.getenv("ENSEMBLE_INTRA_OP_THREADS", "0")),
+
+    # Startup warm-up: dummy forwards per loaded model at these batch sizes
+    "warmup_batch_sizes": [int(b) for b in os.getenv("WARMUP_BATCH_SIZES", "1,32,256").split(",") if b.strip()],
+}
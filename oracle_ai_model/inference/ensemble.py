@@ -0,0 +1,80 @@
+# oracle_ai_model/inference/ensemble.py
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+
+from oracle_ai_model.inference.batch import batched_predict
+from oracle_ai_model.inference.config import INFERENCE_CONFIG
+
+
+def set_intra_op_threads(threads: int = None):
+    """
+    Cap torch's intra-op pool at `threads` (default: ENSEMBLE_INTRA_OP_THREADS;
+    0 keeps torch's default) so parallel ensemble members do not oversubscribe
+    the cores. The pool is process-wide and affects every model in the process,
+    so this is called once at startup rather than by the predictor.
+    """
+    threads = INFERENCE_CONFIG["ensemble_intra_op_threads"] if threads is None else threads
+    if threads:
+        torch.set_num_threads(threads)
+
+
+class EnsemblePredictor:
+    """
+    Scores the same windows with several models and averages the probabilities.
+
+    Windows are prepared once by the caller and shared by every member. With
+    `workers` > 0 the members run in parallel threads (PyTorch releases the
+    GIL inside ops); see `set_intra_op_threads` for the matching torch cap.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, workers: int = None):
+        self.weights = weights or {}
+        self.workers = INFERENCE_CONFIG["ensemble_workers"] if workers is None else workers
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ensemble") if self.workers else None
+
+    @staticmethod
+    def load_members(names: Sequence[str], load: Callable[[str], torch.nn.Module]) -> List[Tuple[str, torch.nn.Module]]:
+        """
+        (name, model) for each member whose checkpoint loads. Members without a
+        checkpoint are skipped (and logged), so `predict` renormalises the
+        weights over the rest; an ensemble with no checkpoint at all fails.
+        """
+        members = []
+        for name in names:
+            try:
+                members.append((name, load(name)))
+            except FileNotFoundError as e:
+                logging.warning(f"Ensemble member {name} skipped, no checkpoint: {e}")
+        if not members:
+            raise FileNotFoundError(f"No checkpoint for any ensemble member ({', '.join(names)})")
+        return members
+
+    def predict(self, members: Sequence[Tuple[str, torch.nn.Module]],
+                windows: List[np.ndarray]) -> Tuple[List[float], List[Dict[str, Dict[str, float]]]]:
+        """
+        Returns the combined probability for each window and, per window, each
+        member's {"probability", "weight"} (weights normalised to sum to 1).
+        """
+        if not members:
+            raise ValueError("An ensemble needs at least one member")
+
+        names = [name for name, _ in members]
+        if self._pool:
+            scored = list(self._pool.map(lambda m: batched_predict(m[1], windows), members))
+        else:
+            scored = [batched_predict(model, windows) for _, model in members]
+
+        raw = np.array([self.weights.get(name, 1.0) for name in names], dtype=np.float64)
+        weights = raw / raw.sum()
+        probs = weights @ np.asarray(scored, dtype=np.float64)  # (members,) @ (members, N)
+
+        contributions = [
+            {name: {"probability": float(member[i]), "weight": float(w)} for name, member, w in zip(names, scored, weights)}
+            for i in range(len(windows))
+        ]
+        return probs.tolist(), contributions
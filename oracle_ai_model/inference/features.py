@@ -0,0 +1,122 @@
+# oracle_ai_model/inference/features.py
+
+import math
+import time
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from oracle_ai_model.utils.helpers import add_technical_indicators, normalize
+from oracle_ai_model.utils.indicator_engine import WARMUP_BARS
+from oracle_ai_model.data.loader import download_stock_data
+from oracle_ai_model.data.coalesce import BarCloseCache
+from oracle_ai_model.data.providers import get_provider
+from oracle_ai_model.data.timeframes import interval_length, period_start
+from oracle_ai_model.inference.batch import FEATURE_COLUMNS, SEQ_LENGTH, build_window
+
+DEFAULT_PERIOD = "1mo"
+DEFAULT_INTERVAL = "1d"
+
+# Calendar time per bar of history: equities trade 5 days a week, ~6.5 hours a day
+DAILY_CALENDAR_FACTOR = 7 / 5
+INTRADAY_CALENDAR_FACTOR = 7 / 5 * 24 / 6.5
+HOLIDAY_SLACK_DAYS = 3  # a long weekend
+# Periods every provider accepts (yfinance rejects arbitrary "Nd" ranges), shortest first
+FETCH_PERIODS = ("5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y")
+
+FeatureKey = Tuple[str, str, str]  # (symbol, period, interval)
+
+# Stages reported by prepare_feature_window's `on_stage`, in order
+FEATURE_STAGES = ("download", "indicators", "normalize", "tensor_build")
+
+
+def fetch_period(period: str, interval: str) -> str:
+    """
+    `period`, or the shortest of FETCH_PERIODS covering SEQ_LENGTH bars plus the
+    indicators' WARMUP_BARS if it is shorter (the default 1mo of daily bars holds
+    ~21, short of the 59 needed).
+    """
+    step = interval_length(interval)
+    factor = DAILY_CALENDAR_FACTOR if step >= timedelta(days=1) else INTRADAY_CALENDAR_FACTOR
+    days = math.ceil((SEQ_LENGTH + WARMUP_BARS) * step.total_seconds() * factor / 86400) + HOLIDAY_SLACK_DAYS
+    now = get_provider().now()
+    for candidate in (period,) + FETCH_PERIODS:
+        start = period_start(candidate, now)
+        if start is None or start <= now - timedelta(days=days):
+            return candidate
+    return "max"
+
+
+def prepare_feature_window(symbol: str, period: str = DEFAULT_PERIOD, interval: str = DEFAULT_INTERVAL,
+                           on_stage: Optional[Callable[[str, float], None]] = None) -> np.ndarray:
+    """
+    Download, add indicators, normalize and slice the model input window for one symbol.
+
+    History is fetched for at least `fetch_period(period, interval)`, and the
+    indicator warm-up rows (NaN) are dropped before normalizing, so the window
+    is complete. Raises ValueError if fewer than SEQ_LENGTH bars remain.
+
+    `on_stage(stage, seconds)` is called after each of "download", "indicators",
+    "normalize" and "tensor_build" so the API layer can export stage latencies.
+    """
+    return _prepare(symbol, period, interval, on_stage)[0]
+
+
+def _prepare(symbol, period, interval, on_stage):
+    # (window, open time of its newest bar)
+    start = time.perf_counter()
+
+    def done(stage):
+        nonlocal start
+        if on_stage:
+            now = time.perf_counter()
+            on_stage(stage, now - start)
+            start = now
+
+    df = download_stock_data(symbol, period=fetch_period(period, interval), interval=interval)
+    done("download")
+    df = add_technical_indicators(df).dropna(subset=FEATURE_COLUMNS)
+    if len(df) < SEQ_LENGTH:
+        raise ValueError(f"{symbol}: {len(df)} {interval} bars after indicator warm-up, need {SEQ_LENGTH}")
+    done("indicators")
+    df = normalize(df, FEATURE_COLUMNS)
+    done("normalize")
+    window = build_window(df, FEATURE_COLUMNS, SEQ_LENGTH)
+    done("tensor_build")
+    return window, (df["Date"].iloc[-1] if "Date" in df.columns and len(df) else None)
+
+
+# Windows expire when the newest bar they were built from closes
+_window_cache = BarCloseCache(last_bar=lambda entry: entry[1])
+
+def shared_feature_window(symbol: str, period: str = DEFAULT_PERIOD, interval: str = DEFAULT_INTERVAL,
+                          on_stage: Optional[Callable[[str, float], None]] = None) -> np.ndarray:
+    """
+    `prepare_feature_window` shared across concurrent requests and cached until its
+    newest bar closes. Only the call that computes the window reports stages.
+    """
+    return _window_cache.get((symbol.upper(), period, interval), interval,
+                             lambda: _prepare(symbol, period, interval, on_stage))[0]
+
+
+def plan_feature_windows(
+    keys: Iterable[FeatureKey],
+    prepare: Callable[..., np.ndarray] = prepare_feature_window
+) -> Dict[FeatureKey, Union[np.ndarray, Exception]]:
+    """
+    Compute the feature window once per distinct (symbol, period, interval).
+
+    A failure is stored as the exception for that key so callers can skip only
+    the affected requests.
+    """
+    windows = {}
+    for key in keys:
+        if key in windows:
+            continue
+        try:
+            windows[key] = prepare(*key)
+        except Exception as e:
+            windows[key] = e
+    return windows
@@ -0,0 +1,173 @@
+# oracle_ai_model/inference/scheduler.py
+
+import time
+import queue
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import Future
+from typing import Callable, Hashable, Optional
+
+import numpy as np
+import torch
+
+from oracle_ai_model.inference.batch import batched_predict, group_by_shape
+from oracle_ai_model.inference.config import INFERENCE_CONFIG
+
+
+class _Pending:
+    __slots__ = ("model", "window", "future", "group", "enqueued_at")
+
+    def __init__(self, model, window, future, group=None):
+        self.model = model
+        self.window = window
+        self.future = future
+        self.group = group
+        self.enqueued_at = time.perf_counter()
+
+
+class InferenceScheduler:
+    """
+    Dynamic micro-batching across concurrent callers.
+
+    Each model key gets its own queue and worker thread. The worker takes the
+    first pending window, keeps collecting until `max_batch_size` windows are
+    queued or `max_wait_ms` has elapsed, runs one batched forward and resolves
+    every caller's future with its own probability. If that forward fails, the
+    batch is retried per window shape, then per window, so only the windows
+    that fail on their own get the exception.
+
+    `on_flush(key, batch_size, queue_depth, wait_seconds, forward_seconds, groups)`
+    is called after every flush (wait of the oldest window, time spent in the
+    batched forwards) so the API layer can export metrics without this module
+    depending on them. `groups` maps each `group` label passed to `submit` (e.g.
+    (model_type, asset_type)) to (windows in the batch, wait of its oldest window).
+    """
+
+    def __init__(self, max_batch_size: int = None, max_wait_ms: float = None,
+                 on_flush: Optional[Callable] = None):
+        self.max_batch_size = max_batch_size or INFERENCE_CONFIG["max_batch_size"]
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else INFERENCE_CONFIG["max_wait_ms"]) / 1000.0
+        self.on_flush = on_flush
+        self._queues = {}
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: {"batches": 0, "items": 0, "max_batch": 0})
+
+    # ----------------------
+    # Public API
+    # ----------------------
+    def submit(self, key: Hashable, model: torch.nn.Module, window: np.ndarray, group: Hashable = None) -> Future:
+        future = Future()
+        self._get_queue(key).put(_Pending(model, window, future, group))
+        return future
+
+    def predict(self, key: Hashable, model: torch.nn.Module, window: np.ndarray, timeout: float = None,
+                group: Hashable = None) -> float:
+        return self.submit(key, model, window, group).result(timeout=timeout)
+
+    def queue_depth(self, key: Hashable = None) -> int:
+        with self._lock:
+            if key is not None:
+                q = self._queues.get(key)
+                return q.qsize() if q else 0
+            return sum(q.qsize() for q in self._queues.values())
+
+    def stats(self) -> dict:
+        with self._lock:
+            keys = list(self._queues)
+            snapshot = {}
+            for key in keys:
+                s = dict(self._stats[key])
+                s["queue_depth"] = self._queues[key].qsize()
+                s["avg_batch"] = s["items"] / s["batches"] if s["batches"] else 0.0
+                snapshot[key] = s
+            return snapshot
+
+    # ----------------------
+    # Worker loop
+    # ----------------------
+    def _get_queue(self, key):
+        with self._lock:
+            q = self._queues.get(key)
+            if q is None:
+                q = self._queues[key] = queue.Queue()
+                worker = threading.Thread(target=self._run, args=(key, q), name=f"inference-{key}", daemon=True)
+                worker.start()
+            return q
+
+    def _run(self, key, q: queue.Queue):
+        while True:
+            batch = [q.get()]
+            deadline = batch[0].enqueued_at + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._flush(key, batch, q.qsize())
+
+    def _flush(self, key, batch, queue_depth):
+        forward_start = time.perf_counter()
+        wait = forward_start - batch[0].enqueued_at
+
+        # A checkpoint reload can leave two model objects under one key
+        by_model = defaultdict(list)
+        for item in batch:
+            by_model[id(item.model)].append(item)
+
+        for items in by_model.values():
+            self._score(key, items)
+        forward = time.perf_counter() - forward_start
+
+        with self._lock:
+            s = self._stats[key]
+            s["batches"] += 1
+            s["items"] += len(batch)
+            s["max_batch"] = max(s["max_batch"], len(batch))
+
+        if self.on_flush:
+            groups = {}
+            for item in batch:  # oldest first, so the first window of a group sets its wait
+                count, group_wait = groups.get(item.group, (0, forward_start - item.enqueued_at))
+                groups[item.group] = (count + 1, group_wait)
+            try:
+                self.on_flush(key, len(batch), queue_depth, wait, forward, groups)
+            except Exception as e:
+                logging.warning(f"Scheduler on_flush hook failed: {e}")
+
+
+    def _score(self, key, items):
+        try:
+            probs = batched_predict(items[0].model, [item.window for item in items])
+        except Exception as e:
+            if len(items) == 1:
+                logging.error(f"Inference failed for {key}: {e}")
+                items[0].future.set_exception(e)
+                return
+            # Isolate the bad window(s): split by shape, or window by window within one shape
+            shapes = group_by_shape([item.window for item in items])
+            parts = shapes if len(shapes) > 1 else [[i] for i in range(len(items))]
+            logging.warning(f"Batched inference failed for {key} ({len(items)} windows), "
+                            f"retrying in {len(parts)} parts: {e}")
+            for part in parts:
+                self._score(key, [items[i] for i in part])
+            return
+        for item, prob in zip(items, probs):
+            item.future.set_result(prob)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler(on_flush: Optional[Callable] = None) -> InferenceScheduler:
+    """Process-wide scheduler. Passing `on_flush` installs the metrics hook."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = InferenceScheduler()
+        if on_flush is not None:
+            _scheduler.on_flush = on_flush
+        return _scheduler
@@ -0,0 +1,111 @@
+# oracle_ai_model/inference/uncertainty.py
+"""
+Monte Carlo dropout confidence bands.
+
+Rather than looping K stochastic forwards, each window is tiled K times along
+the batch dimension and the whole (K * N) batch runs as one forward with the
+dropout layers active. The band is the (lower, upper) quantile of the K
+sampled probabilities. Models whose only dropout sits on the pooled state
+before the output layer (LSTM/GRU: recurrent inter-layer dropout is off in
+eval mode) run the encoder once and tile just the pooled state through the
+head, so a band costs one forward instead of K.
+
+Sampling only that head dropout gives narrow bands: they reflect the output
+layer's uncertainty, not the recurrent stack's. With `recurrent=True`
+(MC_DROPOUT_RECURRENT=1) the RNN layers' inter-layer dropout is sampled too,
+which widens the bands but costs K full forwards again.
+
+The cached models are shared between threads and stay in eval mode; sampling
+runs on a shallow copy that shares their weights but has dropout switched on.
+Compiled (TorchScript/ONNX) models bake dropout out, so bands need the eager
+or dynamically quantized model.
+"""
+import copy
+import threading
+import weakref
+from typing import Dict, List, Sequence
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from .batch import group_by_shape
+from .config import INFERENCE_CONFIG
+
+_mc_models = weakref.WeakKeyDictionary()
+_mc_lock = threading.Lock()
+
+
+def supports_mc_dropout(model: nn.Module) -> bool:
+    return any(isinstance(m, nn.Dropout) for m in model.modules())
+
+
+def _head_only(model: nn.Module) -> bool:
+    # encode()/head() split with the head's Dropout as the only stochastic layer in the model
+    dropouts = [m for m in model.modules() if isinstance(m, nn.Dropout)
+                or (isinstance(m, nn.RNNBase) and m.training)]
+    return hasattr(model, "encode") and hasattr(model, "head") and dropouts == [getattr(model, "dropout", None)]
+
+
+def _mc_model(model: nn.Module, recurrent: bool = False) -> nn.Module:
+    # Weight-sharing copy of `model` with only its Dropout layers (and, if
+    # `recurrent`, its RNNs' inter-layer dropout) in train mode
+    with _mc_lock:
+        copies = _mc_models.setdefault(model, {})
+        mc = copies.get(recurrent)
+        if mc is None:
+            memo = {id(t): t for t in list(model.parameters()) + list(model.buffers())}
+            mc = copy.deepcopy(model, memo)
+            mc.eval()
+            for module in mc.modules():
+                if isinstance(module, nn.Dropout) or (recurrent and isinstance(module, nn.RNNBase) and module.dropout):
+                    module.train()
+            copies[recurrent] = mc
+        return mc
+
+
+def mc_dropout_samples(model: nn.Module, batch: torch.Tensor, samples: int = None, max_rows: int = None,
+                       recurrent: bool = None) -> torch.Tensor:
+    """
+    Sample a (N, seq_len, features) batch `samples` times with dropout active.
+    Returns a (samples, N) tensor of probabilities.
+    """
+    samples = samples or INFERENCE_CONFIG["mc_samples"]
+    max_rows = max_rows or INFERENCE_CONFIG["mc_max_rows"]
+    recurrent = INFERENCE_CONFIG["mc_recurrent_dropout"] if recurrent is None else recurrent
+    if not supports_mc_dropout(model):
+        raise ValueError("MC dropout needs an eager model with Dropout layers (not a compiled artifact)")
+
+    mc = _mc_model(model, recurrent)
+    chunk = max(1, max_rows // samples)
+    out = []
+    with torch.no_grad():
+        if _head_only(mc):
+            pooled = mc.encode(batch)
+            for start in range(0, len(pooled), chunk):
+                part = pooled[start:start + chunk]
+                out.append(torch.sigmoid(mc.head(part.repeat(samples, 1))).reshape(samples, len(part)))
+            return torch.cat(out, dim=1)
+        for start in range(0, len(batch), chunk):
+            part = batch[start:start + chunk]
+            tiled = part.repeat(samples, *([1] * (part.dim() - 1)))  # (samples * n, ...), sample-major
+            out.append(torch.sigmoid(mc(tiled)).reshape(samples, len(part)))
+    return torch.cat(out, dim=1)
+
+
+def confidence_bands(model: nn.Module, windows: Sequence[np.ndarray], samples: int = None,
+                     quantiles: Sequence[float] = None, recurrent: bool = None) -> List[Dict[str, float]]:
+    """
+    One {"lower", "upper"} band per (seq_len, features) window, in input order.
+    Windows of different lengths are sampled in separate tiled forwards.
+    """
+    lower, upper = quantiles or INFERENCE_CONFIG["mc_quantiles"]
+    q = torch.tensor([lower, upper])
+
+    bands = [None] * len(windows)
+    for indices in group_by_shape(windows):
+        batch = torch.from_numpy(np.stack([windows[i] for i in indices]))
+        lo, hi = torch.quantile(mc_dropout_samples(model, batch, samples, recurrent=recurrent), q, dim=0)
+        for i, l, h in zip(indices, lo.tolist(), hi.tolist()):
+            bands[i] = {"lower": l, "upper": h}
+    return bands
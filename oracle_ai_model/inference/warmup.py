@@ -0,0 +1,71 @@
+# oracle_ai_model/inference/warmup.py
+
+import time
+import logging
+from typing import List
+
+import numpy as np
+import pandas as pd
+import torch
+
+from oracle_ai_model.models.model import ModelRegistry, checkpoint_path, load_model
+from oracle_ai_model.utils.helpers import add_technical_indicators, normalize
+from oracle_ai_model.inference.batch import FEATURE_COLUMNS, SEQ_LENGTH, predict_proba
+from oracle_ai_model.inference.config import INFERENCE_CONFIG
+from oracle_ai_model.inference.uncertainty import confidence_bands, supports_mc_dropout
+
+
+def _synthetic_bars(rows: int = 120) -> pd.DataFrame:
+    close = 100 + np.cumsum(np.random.default_rng(0).standard_normal(rows))
+    return pd.DataFrame({
+        "Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+        "Volume": np.full(rows, 1_000_000.0),
+    })
+
+
+def warm_up(model_types: List[str] = None, batch_sizes: List[int] = None) -> dict:
+    """
+    Pay the first-request costs before serving: load the configured checkpoints,
+    run dummy forwards at the common batch sizes (allocator growth, lazy kernels),
+    sample a confidence band (MC dropout copy; for a compiled artifact, the eager
+    checkpoint bands fall back to) and run the indicator code once on synthetic bars.
+
+    Each step is best-effort: failures are logged and reported, not raised, so
+    one missing checkpoint does not keep the worker out of rotation; see
+    `is_servable` for the readiness decision.
+    """
+    batch_sizes = batch_sizes or INFERENCE_CONFIG["warmup_batch_sizes"]
+    report = {"models": {}, "indicators": None, "seconds": 0.0}
+    start = time.perf_counter()
+
+    for model_type in model_types or list(ModelRegistry().models):
+        path = checkpoint_path(model_type)
+        try:
+            model = load_model(model_type, path, input_size=len(FEATURE_COLUMNS))
+            for batch_size in batch_sizes:
+                predict_proba(model, torch.zeros(batch_size, SEQ_LENGTH, len(FEATURE_COLUMNS)))
+            if INFERENCE_CONFIG["mc_samples"]:
+                mc_model = model if supports_mc_dropout(model) else \
+                    load_model(model_type, path, input_size=len(FEATURE_COLUMNS), backend="eager")
+                confidence_bands(mc_model, [np.zeros((SEQ_LENGTH, len(FEATURE_COLUMNS)), dtype=np.float32)])
+            report["models"][model_type] = "ok"
+        except Exception as e:
+            logging.warning(f"Warm-up skipped {model_type} ({path}): {e}")
+            report["models"][model_type] = f"error: {e}"
+
+    try:
+        df = add_technical_indicators(_synthetic_bars())
+        normalize(df, [c for c in FEATURE_COLUMNS if c in df.columns])
+        report["indicators"] = "ok"
+    except Exception as e:
+        logging.warning(f"Warm-up of indicator code failed: {e}")
+        report["indicators"] = f"error: {e}"
+
+    report["seconds"] = time.perf_counter() - start
+    logging.info(f"Warm-up finished in {report['seconds']:.2f}s: {report['models']}")
+    return report
+
+
+def is_servable(report: dict) -> bool:
+    """Whether a warm-up report allows serving: the indicator code ran and at least one model loaded."""
+    return report.get("indicators") == "ok" and "ok" in report.get("models", {}).values()
@@ -0,0 +1,32 @@
+# models/base_model.py
+import torch
+import torch.nn as nn
+
+# Optional BaseModel for interface compliance (future enhancement)
+class BaseModel(nn.Module):
+    # Checkpoint version, saved in the state_dict metadata. Bump it in a subclass when a
+    # change alters what existing weights compute; older checkpoints are then refused.
+    _version = 1
+
+    def __init__(self):
+        super(BaseModel, self).__init__()
+
+    def forward(self, x):
+        raise NotImplementedError("Subclasses should implement this method")
+
+    def validate_input(self, x):
+        if not isinstance(x, torch.Tensor):
+            raise TypeError("Input must be a torch.Tensor")
+        if len(x.shape) != 3:
+            raise ValueError("Input must be 3D tensor: (batch, seq_len, features)")
+
+    def _load_from_state_dict(self, state_dict, prefix, local_metadata, strict, missing_keys, unexpected_keys, error_msgs):
+        version = local_metadata.get("version") or 1
+        if not prefix and version < self._version:
+            error_msgs.append(
+                f"checkpoint was saved by {self.__class__.__name__} version {version}, expected {self._version}; "
+                f"the architecture changed since, retrain the model")
+        super()._load_from_state_dict(state_dict, prefix, local_metadata, strict, missing_keys, unexpected_keys, error_msgs)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__} with {sum(p.numel() for p in self.parameters())} parameters"
@@ -0,0 +1,107 @@
+# models/export.py
+"""
+Export trained checkpoints to compiled inference artifacts.
+
+Artifacts are written next to the `.pth` checkpoint:
+    lstm_model.pth -> lstm_model.ts.pt   (TorchScript, always)
+                   -> lstm_model.onnx    (ONNX, optional)
+
+Tracing drops the Python-side `validate_input` checks from the serving path,
+and both formats keep the batch and sequence dimensions dynamic.
+
+Usage:
+    python -m oracle_ai_model.models.export lstm lstm_model.pth --input-size 5 --onnx
+"""
+import os
+import argparse
+import logging
+import warnings
+
+import torch
+
+TORCHSCRIPT_SUFFIX = ".ts.pt"
+ONNX_SUFFIX = ".onnx"
+
+
+def compiled_path(model_path: str, suffix: str) -> str:
+    base, _ = os.path.splitext(model_path)
+    return base + suffix
+
+
+def _example_input(input_size: int, seq_length: int = 24) -> torch.Tensor:
+    return torch.randn(2, seq_length, input_size)
+
+
+def export_torchscript(model: torch.nn.Module, model_path: str, input_size: int, seq_length: int = 24) -> str:
+    path = compiled_path(model_path, TORCHSCRIPT_SUFFIX)
+    model.eval()
+    with torch.no_grad(), warnings.catch_warnings():
+        warnings.simplefilter("ignore", torch.jit.TracerWarning)
+        traced = torch.jit.trace(model, _example_input(input_size, seq_length))
+    traced.save(path)
+    logging.info(f"TorchScript artifact saved: {path}")
+    return path
+
+
+def export_onnx(model: torch.nn.Module, model_path: str, input_size: int, seq_length: int = 24) -> str:
+    path = compiled_path(model_path, ONNX_SUFFIX)
+    model.eval()
+    with torch.no_grad(), warnings.catch_warnings():
+        warnings.simplefilter("ignore", torch.jit.TracerWarning)
+        torch.onnx.export(
+            model,
+            _example_input(input_size, seq_length),
+            path,
+            input_names=["input"],
+            output_names=["output"],
+            dynamic_axes={"input": {0: "batch", 1: "seq_len"}, "output": {0: "batch"}},
+            opset_version=17,
+        )
+    logging.info(f"ONNX artifact saved: {path}")
+    return path
+
+
+class OnnxModule(torch.nn.Module):
+    """
+    Runs an exported ONNX graph with onnxruntime behind the nn.Module interface,
+    so it can be cached and batched like the eager and TorchScript models.
+    """
+
+    def __init__(self, path: str):
+        import onnxruntime as ort  # optional dependency, only needed for ONNX serving
+
+        super().__init__()
+        self.path = path
+        self.nbytes = os.path.getsize(path)
+        self.session = ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        output = self.session.run(None, {"input": x.detach().cpu().numpy().astype("float32")})[0]
+        return torch.from_numpy(output)
+
+    def __repr__(self):
+        return f"OnnxModule(path={self.path})"
+
+
+def export_checkpoint(model_type: str, model_path: str, input_size: int, onnx: bool = False) -> dict:
+    """
+    Load an eager checkpoint and write its compiled artifacts. Returns {format: path}.
+    """
+    from .model import ModelRegistry
+
+    model = ModelRegistry().load_checkpoint(model_type, model_path, input_size=input_size, backend="eager")
+    paths = {"torchscript": export_torchscript(model, model_path, input_size)}
+    if onnx:
+        paths["onnx"] = export_onnx(model, model_path, input_size)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a trained checkpoint to TorchScript/ONNX.")
+    parser.add_argument("model_type", type=str, help="lstm, gru, tcn, transformer")
+    parser.add_argument("model_path", type=str, help="Path to the .pth checkpoint")
+    parser.add_argument("--input-size", type=int, default=5, help="Number of input features")
+    parser.add_argument("--onnx", action="store_true", help="Also export an ONNX artifact")
+
+    args = parser.parse_args()
+    print(export_checkpoint(args.model_type, args.model_path, args.input_size, onnx=args.onnx))
@@ -1,7 +1,7 @@
 # models/lstm_model.py
 import torch
 import torch.nn as nn
-from .model import BaseModel
+from .base_model import BaseModel
 
 class LSTMModel(BaseModel):
     def __init__(self, input_size, hidden_size=64, output_size=1, num_layers=2, dropout=0.2):
@@ -12,11 +12,16 @@ class LSTMModel(BaseModel):
         self.output_size = output_size
 
     def forward(self, x):
+        return self.head(self.encode(x))
+
+    def encode(self, x):
+        """(batch, hidden_size) pooled encoder state; deterministic in eval mode."""
         self.validate_input(x)
         out, _ = self.lstm(x)
-        out = out.mean(dim=1)  # mean pooling over time steps
-        out = self.dropout(out)
-        return self.fc(out)
+        return out.mean(dim=1)  # mean pooling over time steps
+
+    def head(self, pooled):
+        return self.fc(self.dropout(pooled))
 
     def __repr__(self):
         return f"LSTMModel(input_size={self.lstm.input_size}, hidden_size={self.lstm.hidden_size}, output_size={self.output_size})"
@@ -1,10 +1,34 @@
 # models/model.py
+import os
+import logging
+import threading
+from collections import OrderedDict
+
 import torch
 import torch.nn as nn
+from .base_model import BaseModel
 from .lstm_model import LSTMModel
 from .gru_model import GRUTimeSeriesModel
 from .tcn_model import TCN
 from .transformer_model import TransformerTimeSeriesModel
+from .export import TORCHSCRIPT_SUFFIX, ONNX_SUFFIX, OnnxModule, compiled_path
+from .quantization import quantize_model
+
+# Memory budget for cached checkpoints (weights + buffers), in megabytes
+MODEL_CACHE_MAX_MB = float(os.getenv("MODEL_CACHE_MAX_MB", "512"))
+
+# Compiled artifacts tried before falling back to the eager checkpoint, in order
+MODEL_BACKENDS = [b.strip() for b in os.getenv("MODEL_BACKENDS", "torchscript,onnx").split(",") if b.strip()]
+
+# Load eager checkpoints as mmap-backed tensors, so every process serving the same
+# file shares its pages (copy-on-write) instead of holding a private copy
+MODEL_MMAP = os.getenv("MODEL_MMAP", "1") == "1"
+
+# Directory holding "<model_type>_model.pth" checkpoints (default: working directory)
+MODEL_DIR = os.getenv("MODEL_DIR", "")
+
+# Model types served with dynamic int8 quantization (e.g. "lstm,gru,transformer")
+QUANTIZED_MODELS = {m.strip() for m in os.getenv("QUANTIZED_MODELS", "").split(",") if m.strip()}
 
 class ModelRegistry:
     def __init__(self):
@@ -20,28 +44,186 @@ class ModelRegistry:
             raise ValueError(f"Model '{model_type}' not supported. Available: {list(self.models.keys())}")
         return self.models[model_type](**kwargs)
 
-def load_model(model_type: str, model_path: str, **kwargs):
-    model = ModelRegistry().get_model(model_type, **kwargs)
-    model.load_state_dict(torch.load(model_path))
-    model.eval()
-    return model
+    def load_checkpoint(self, model_type: str, model_path: str, backend: str = None, quantize: bool = None, **kwargs):
+        """
+        Load a checkpoint for CPU inference, preferring a compiled artifact next to it.
 
-# Optional BaseModel for interface compliance (future enhancement)
-class BaseModel(nn.Module):
-    def __init__(self):
-        super(BaseModel, self).__init__()
+        Without `backend`, MODEL_BACKENDS are tried in order and the eager `.pth`
+        is the fallback. Pass "eager", "torchscript" or "onnx" to force one.
+        Quantized serving (`quantize=True`, or the model type listed in
+        QUANTIZED_MODELS) always starts from the eager checkpoint.
+        """
+        if model_type not in self.models:
+            raise ValueError(f"Model '{model_type}' not supported. Available: {list(self.models.keys())}")
+
+        if quantize is None:
+            quantize = model_type in QUANTIZED_MODELS
+        if quantize:
+            return quantize_model(self._load_backend("eager", model_type, model_path, **kwargs))
+
+        for name in ([backend] if backend else MODEL_BACKENDS + ["eager"]):
+            model = self._load_backend(name, model_type, model_path, **kwargs)
+            if model is not None:
+                model.eval()
+                return model
+        raise FileNotFoundError(f"No {backend} artifact found for checkpoint {model_path}")
+
+    def _load_backend(self, backend: str, model_type: str, model_path: str, **kwargs):
+        if backend == "eager":
+            model = self.get_model(model_type, **kwargs)
+            state_dict, mmapped = _load_state_dict(model_path)
+            # assign=True keeps the mmap-backed tensors instead of copying them into fresh parameters
+            model.load_state_dict(state_dict, assign=mmapped)
+            return model
+
+        suffix = {"torchscript": TORCHSCRIPT_SUFFIX, "onnx": ONNX_SUFFIX}.get(backend)
+        if suffix is None:
+            raise ValueError(f"Unknown model backend '{backend}'. Use eager, torchscript or onnx.")
+
+        path = compiled_path(model_path, suffix)
+        if not os.path.exists(path):
+            return None
+        if os.path.exists(model_path) and os.path.getmtime(path) < os.path.getmtime(model_path):
+            logging.warning(f"Ignoring stale {backend} artifact {path} (older than {model_path})")
+            return None
+
+        if backend == "torchscript":
+            return torch.jit.load(path, map_location=torch.device("cpu"))
+        try:
+            return OnnxModule(path)
+        except ImportError:
+            logging.warning("onnxruntime is not installed; skipping ONNX artifact")
+            return None
+
+
+def checkpoint_path(model_type: str) -> str:
+    return os.path.join(MODEL_DIR, f"{model_type}_model.pth")
+
+
+def _load_state_dict(model_path: str):
+    if MODEL_MMAP:
+        try:
+            return torch.load(model_path, map_location=torch.device("cpu"), mmap=True), True
+        except RuntimeError as e:
+            # Legacy (non-zipfile) checkpoints cannot be memory-mapped
+            logging.warning(f"Loading {model_path} without mmap: {e}")
+    return torch.load(model_path, map_location=torch.device("cpu")), False
 
-    def forward(self, x):
-        raise NotImplementedError("Subclasses should implement this method")
 
-    def validate_input(self, x):
-        if not isinstance(x, torch.Tensor):
-            raise TypeError("Input must be a torch.Tensor")
-        if len(x.shape) != 3:
-            raise ValueError("Input must be 3D tensor: (batch, seq_len, features)")
+def _model_nbytes(model: nn.Module) -> int:
+    if hasattr(model, "nbytes"):
+        return model.nbytes
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
 
-    def __repr__(self):
-        return f"{self.__class__.__name__} with {sum(p.numel() for p in self.parameters())} parameters"
+
+class ModelCache:
+    """
+    Thread-safe LRU cache of loaded checkpoints, bounded by a memory budget.
+
+    Entries are keyed by (model_type, input_size, checkpoint path, mtime), so a
+    checkpoint overwritten by a retrain is picked up on the next lookup and the
+    stale copy is dropped. Cached models are shared between callers and must
+    only be used for inference.
+    """
+
+    def __init__(self, registry: ModelRegistry = None, max_bytes: int = None):
+        self.registry = registry or ModelRegistry()
+        self.max_bytes = max_bytes if max_bytes is not None else int(MODEL_CACHE_MAX_MB * 1024 * 1024)
+        self._entries = OrderedDict()  # key -> (model, nbytes)
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, model_type: str, model_path: str, input_size: int, **kwargs):
+        path = os.path.abspath(model_path)
+        key = (model_type, input_size, path, os.path.getmtime(path)) + tuple(sorted(kwargs.items()))
+
+        model = self._lookup(key)
+        if model is not None:
+            return model
+
+        # One loader per key: concurrent misses on the same checkpoint wait
+        # for the first load instead of deserializing it again.
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            model = self._lookup(key)
+            if model is not None:
+                return model
+            model = self.registry.load_checkpoint(model_type, path, input_size=input_size, **kwargs)
+            self._insert(key, model)
+            logging.info(f"Loaded {model_type} checkpoint into cache: {path}")
+
+        with self._lock:
+            self._key_locks.pop(key, None)
+        return model
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def _insert(self, key, model):
+        nbytes = _model_nbytes(model)
+        with self._lock:
+            # A newer mtime replaces any older copy of the same checkpoint
+            for stale in [k for k in self._entries if k[:3] == key[:3] and k[4:] == key[4:]]:
+                self._remove(stale)
+            self._entries[key] = (model, nbytes)
+            self.total_bytes += nbytes
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, nbytes = self._entries.pop(key)
+        self.total_bytes -= nbytes
+
+    def reinit_after_fork(self):
+        """Fresh locks for a forked child; cached models (and their shared pages) are kept."""
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_model_cache = None
+_model_cache_lock = threading.Lock()
+
+def get_model_cache() -> ModelCache:
+    global _model_cache
+    with _model_cache_lock:
+        if _model_cache is None:
+            _model_cache = ModelCache()
+        return _model_cache
+
+
+def load_model(model_type: str, model_path: str, **kwargs):
+    """Return the shared, eval-mode model for a checkpoint (loaded once per process)."""
+    return get_model_cache().get(model_type, model_path, **kwargs)
 
 # Example usage in training/inference
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+# models/preload.py
+"""
+Load every registered checkpoint into the shared model cache before the server
+or Celery worker forks its children.
+
+Forked children inherit the cache, so they serve requests without reloading.
+Weight pages stay shared copy-on-write because inference never writes to them.
+Eager checkpoints are also memory-mapped (MODEL_MMAP), so processes that do
+not share a parent, such as `uvicorn --workers` (spawn), still share the
+file's page cache.
+"""
+import os
+import logging
+from typing import Dict, List
+
+from .model import ModelRegistry, checkpoint_path, get_model_cache, load_model
+from oracle_ai_model.inference.batch import FEATURE_COLUMNS
+
+# Preload at import of the API / Celery app (set to 0 to load lazily per process)
+MODEL_PRELOAD = os.getenv("MODEL_PRELOAD", "1") == "1"
+
+
+def rss_bytes() -> Dict[str, int]:
+    """
+    Resident memory of this process: total, anonymous (private) and file-backed
+    (mmap'd checkpoints, shared between processes).
+    """
+    fields = {"VmRSS": "rss", "RssAnon": "anon", "RssFile": "file"}
+    usage = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in fields:
+                    usage[fields[name]] = int(value.split()[0]) * 1024
+    except OSError:
+        import resource
+        usage["rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # peak, in KiB on Linux
+    return usage
+
+
+def log_rss(label: str) -> Dict[str, int]:
+    usage = rss_bytes()
+    logging.info(f"[pid {os.getpid()}] RSS {label}: " +
+                 ", ".join(f"{k}={v / 2**20:.1f}MB" for k, v in usage.items()))
+    return usage
+
+
+def preload_models(model_types: List[str] = None, input_size: int = len(FEATURE_COLUMNS)) -> List[str]:
+    """
+    Load the checkpoints of `model_types` (default: all registered) that exist
+    on disk. Returns the model types that were loaded.
+    """
+    before = log_rss("before model preload")
+    loaded = []
+    for model_type in model_types or list(ModelRegistry().models):
+        path = checkpoint_path(model_type)
+        if not os.path.exists(path):
+            continue
+        try:
+            load_model(model_type, path, input_size=input_size)
+            loaded.append(model_type)
+        except Exception as e:
+            logging.error(f"Failed to preload {model_type} from {path}: {e}")
+
+    after = log_rss(f"after preloading {loaded or 'no models'}")
+    logging.info(f"Model preload added {(after['rss'] - before['rss']) / 2**20:.1f}MB RSS")
+    return loaded
+
+
+def init_forked_worker():
+    """Call in each forked child: keep the inherited models, reset their locks, report RSS."""
+    get_model_cache().reinit_after_fork()
+    log_rss("in forked worker")
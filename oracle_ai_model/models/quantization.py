@@ -0,0 +1,82 @@
+# models/quantization.py
+"""
+Dynamic int8 quantization for CPU serving.
+
+nn.LSTM, nn.GRU and nn.Linear weights are stored as int8 and activations are
+quantized on the fly, so no retraining or calibration data is needed.
+"""
+import io
+import time
+from typing import Optional
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+QUANTIZED_LAYERS = {nn.LSTM, nn.GRU, nn.Linear}
+
+
+def model_size_bytes(model: nn.Module) -> int:
+    """Serialized state_dict size; counts packed int8 weights that parameters() misses."""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.getbuffer().nbytes
+
+
+def quantize_model(model: nn.Module) -> nn.Module:
+    """
+    Return an int8 dynamically-quantized copy of an eval-mode model.
+    """
+    model.eval()
+    quantized = torch.ao.quantization.quantize_dynamic(model, QUANTIZED_LAYERS, dtype=torch.qint8)
+    for module in quantized.modules():
+        if isinstance(module, nn.TransformerEncoderLayer):
+            # The fused encoder fast path reads linear1/linear2.weight as tensors,
+            # which packed int8 layers don't expose; use the regular path instead.
+            module.activation_relu_or_gelu = 0
+    quantized.nbytes = model_size_bytes(quantized)
+    return quantized.eval()
+
+
+def _latency_ms(model: nn.Module, X: torch.Tensor, repeats: int) -> float:
+    with torch.no_grad():
+        model(X)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            model(X)
+    return (time.perf_counter() - start) * 1000 / repeats
+
+
+def drift_report(
+    fp32_model: nn.Module,
+    int8_model: nn.Module,
+    X: torch.Tensor,
+    y: Optional[np.ndarray] = None,
+    threshold: float = 0.5,
+    repeats: int = 10
+) -> dict:
+    """
+    Compare int8 against fp32 on a held-out set: probability drift, decision
+    agreement, accuracy (when labels are given), latency and model size.
+    """
+    with torch.no_grad():
+        p32 = torch.sigmoid(fp32_model(X)).reshape(-1).numpy()
+        p8 = torch.sigmoid(int8_model(X)).reshape(-1).numpy()
+
+    diff = np.abs(p32 - p8)
+    report = {
+        "samples": int(len(p32)),
+        "max_abs_prob_diff": float(diff.max()),
+        "mean_abs_prob_diff": float(diff.mean()),
+        "decision_agreement": float(np.mean((p32 > threshold) == (p8 > threshold))),
+        "fp32_latency_ms": _latency_ms(fp32_model, X, repeats),
+        "int8_latency_ms": _latency_ms(int8_model, X, repeats),
+        "fp32_size_bytes": model_size_bytes(fp32_model),
+        "int8_size_bytes": model_size_bytes(int8_model),
+    }
+    if y is not None:
+        y = np.asarray(y).reshape(-1)
+        report["fp32_accuracy"] = float(np.mean((p32 > threshold) == y))
+        report["int8_accuracy"] = float(np.mean((p8 > threshold) == y))
+        report["accuracy_drift"] = report["int8_accuracy"] - report["fp32_accuracy"]
+    return report
@@ -0,0 +1,297 @@
+# models/streaming.py
+"""
+Stateful streaming inference for LSTMModel, GRUTimeSeriesModel and TCN.
+
+The windowed forward re-runs the whole network over the last `window` bars
+for every prediction. A streamer instead keeps per-symbol state, so folding in
+one new bar costs a single step per layer:
+
+- RecurrentStreamer carries the LSTM/GRU hidden state.
+- TCNStreamer keeps, for every dilated convolution, a ring of its last
+  (kernel_size - 1) * dilation inputs and computes only the newest output step.
+
+Both keep a ring buffer of the last `window` top-layer outputs, so the pooled
+mean is updated in O(1). Per-step outputs match the full forward over the
+history seen since seeding. The pooled prediction equals the windowed forward
+exactly while a symbol has seen at most `window` bars, and again right after
+every resync. Between resyncs, outputs near the start of the window were
+computed from real history rather than the windowed forward's zero state or
+padding. `resync_every` bounds that by re-running the window from the stored
+raw bars, at an amortized cost of O(window / resync_every).
+
+One streamer serves one model; its rows are the per-(symbol, model) states.
+All symbols updated in one call share a single batched step.
+"""
+import threading
+from typing import Dict, List, Sequence
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+from .lstm_model import LSTMModel
+from .gru_model import GRUTimeSeriesModel
+from .tcn_model import TCN
+from oracle_ai_model.inference.config import INFERENCE_CONFIG
+
+
+class _Streamer:
+    """
+    Row-indexed per-symbol state store plus the pooled-output ring shared by all
+    streamers. Subclasses declare their per-row state in `_state_shapes()` and
+    implement `_step` (one bar) and `_run_window` (full recompute).
+    """
+
+    def __init__(self, model: nn.Module, input_size: int, output_size: int, window: int, resync_every: int = None):
+        self.model = model.eval()
+        self.input_size = input_size
+        self.output_size = output_size
+        self.window = window
+        self.resync_every = INFERENCE_CONFIG["stream_resync_every"] if resync_every is None else resync_every
+
+        self._index: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._lock = threading.Lock()
+        self._allocate(0)
+
+    # ----------------------
+    # Row storage
+    # ----------------------
+    def _state_shapes(self) -> Dict[str, tuple]:
+        return {}
+
+    def _all_shapes(self) -> Dict[str, tuple]:
+        W = self.window
+        shapes = {
+            "outputs": ((W, self.output_size), torch.float32),   # ring of top-layer outputs
+            "output_sum": ((self.output_size,), torch.float32),
+            "bars": ((W, self.input_size), torch.float32),       # ring of raw input bars (for resync)
+            "pos": ((), torch.long),
+            "count": ((), torch.long),
+            "since_sync": ((), torch.long),
+        }
+        shapes.update({name: (shape, torch.float32) for name, shape in self._state_shapes().items()})
+        return shapes
+
+    def _allocate(self, capacity: int):
+        for name, (shape, dtype) in self._all_shapes().items():
+            setattr(self, name, torch.zeros((capacity,) + shape, dtype=dtype))
+
+    def _grow(self, capacity: int):
+        old = {name: getattr(self, name) for name in self._all_shapes()}
+        self._allocate(capacity)
+        for name, tensor in old.items():
+            getattr(self, name)[:len(tensor)] = tensor
+
+    def _rows(self, symbols: Sequence[str], create: bool = False) -> torch.Tensor:
+        rows = []
+        for symbol in symbols:
+            row = self._index.get(symbol)
+            if row is None:
+                if not create:
+                    raise KeyError(f"No streaming state for {symbol}; call seed() first")
+                row = self._index[symbol] = self._free.pop() if self._free else len(self._index)
+            rows.append(row)
+        if len(self._index) > len(self.pos):
+            self._grow(max(len(self._index), 2 * len(self.pos)))
+        return torch.tensor(rows, dtype=torch.long)
+
+    def _head(self, rows: torch.Tensor) -> np.ndarray:
+        pooled = self.output_sum[rows] / self.count[rows].clamp(min=1).unsqueeze(1).float()
+        return torch.sigmoid(self.model.fc(self.model.dropout(pooled))).reshape(-1).numpy()
+
+    # ----------------------
+    # Model-specific hooks
+    # ----------------------
+    def _step(self, rows: torch.Tensor, x: torch.Tensor) -> torch.Tensor:
+        """Advance `rows` by one (n, features) bar; return the (n, output_size) top-layer output."""
+        raise NotImplementedError
+
+    def _run_window(self, rows: torch.Tensor, history: torch.Tensor) -> torch.Tensor:
+        """Reset `rows` from an (n, T, features) history; return (n, T, output_size) outputs."""
+        raise NotImplementedError
+
+    # ----------------------
+    # Public API
+    # ----------------------
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def seed_many(self, symbols: List[str], histories: np.ndarray) -> np.ndarray:
+        """
+        Initialise state from (N, T, features) histories (last `window` bars are used).
+        Returns the windowed-forward probabilities for the seeded symbols.
+        """
+        history = torch.as_tensor(np.asarray(histories, dtype=np.float32))[:, -self.window:]
+        with self._lock, torch.no_grad():
+            rows = self._rows(symbols, create=True)
+            self._reseed(rows, history)
+            return self._head(rows)
+
+    def seed(self, symbol: str, history: np.ndarray) -> float:
+        return float(self.seed_many([symbol], np.asarray(history)[None])[0])
+
+    def update_many(self, symbols: List[str], bars: np.ndarray) -> np.ndarray:
+        """
+        Fold one new (N, features) bar per symbol into the state with one batched step.
+        """
+        x = torch.as_tensor(np.asarray(bars, dtype=np.float32))
+        with self._lock, torch.no_grad():
+            rows = self._rows(symbols)
+            out = self._step(rows, x)
+
+            pos = self.pos[rows]
+            full = (self.count[rows] >= self.window).unsqueeze(1).float()
+            self.output_sum[rows] += out - full * self.outputs[rows, pos]
+            self.outputs[rows, pos] = out
+            self.bars[rows, pos] = x
+            self.pos[rows] = (pos + 1) % self.window
+            self.count[rows] = (self.count[rows] + 1).clamp(max=self.window)
+            self.since_sync[rows] += 1
+
+            if self.resync_every:
+                # Rows that have not yet dropped a bar are still exact
+                due = (self.since_sync[rows] >= self.resync_every) & (self.count[rows] >= self.window)
+                stale = rows[due]
+                if len(stale):
+                    self._reseed(stale, self._ordered_bars(stale))
+
+            return self._head(rows)
+
+    def update(self, symbol: str, bar: np.ndarray) -> float:
+        return float(self.update_many([symbol], np.asarray(bar)[None])[0])
+
+    def reset(self, symbol: str = None):
+        with self._lock:
+            if symbol is None:
+                self._index.clear()
+                self._free.clear()
+                self._allocate(0)
+            elif symbol in self._index:
+                # The row is reused (and overwritten) by the next seed()
+                self._free.append(self._index.pop(symbol))
+
+    # ----------------------
+    # Windowed recompute
+    # ----------------------
+    def _ring_order(self, rows: torch.Tensor) -> torch.Tensor:
+        # Oldest-to-newest slot order of each (full) row's rings
+        return (self.pos[rows].unsqueeze(1) + torch.arange(self.window)) % self.window
+
+    def _ordered_bars(self, rows: torch.Tensor) -> torch.Tensor:
+        return self.bars[rows.unsqueeze(1), self._ring_order(rows)]
+
+    def _ordered_outputs(self, rows: torch.Tensor) -> torch.Tensor:
+        return self.outputs[rows.unsqueeze(1), self._ring_order(rows)]
+
+    def _reseed(self, rows: torch.Tensor, history: torch.Tensor):
+        out = self._run_window(rows, history)
+        steps = history.shape[1]
+        self.outputs[rows] = 0
+        self.bars[rows] = 0
+        self.outputs[rows, :steps] = out
+        self.bars[rows, :steps] = history
+        self.output_sum[rows] = out.sum(dim=1)
+        self.pos[rows] = steps % self.window
+        self.count[rows] = steps
+        self.since_sync[rows] = 0
+
+
+class RecurrentStreamer(_Streamer):
+    def __init__(self, model: nn.Module, window: int = 24, resync_every: int = None):
+        if isinstance(model, LSTMModel):
+            self.rnn = model.lstm
+        elif isinstance(model, GRUTimeSeriesModel):
+            self.rnn = model.gru
+        else:
+            raise TypeError(f"RecurrentStreamer supports LSTMModel and GRUTimeSeriesModel, got {type(model).__name__}")
+        self.is_lstm = isinstance(self.rnn, nn.LSTM)
+        super().__init__(model, self.rnn.input_size, self.rnn.hidden_size, window, resync_every)
+
+    def _state_shapes(self):
+        shape = (self.rnn.num_layers, self.rnn.hidden_size)
+        return {"h": shape, "c": shape} if self.is_lstm else {"h": shape}
+
+    def _get_state(self, rows):
+        # Stored row-first; nn.LSTM/nn.GRU expect (num_layers, batch, hidden)
+        h = self.h[rows].transpose(0, 1).contiguous()
+        return (h, self.c[rows].transpose(0, 1).contiguous()) if self.is_lstm else h
+
+    def _set_state(self, rows, state):
+        if self.is_lstm:
+            self.h[rows] = state[0].transpose(0, 1)
+            self.c[rows] = state[1].transpose(0, 1)
+        else:
+            self.h[rows] = state.transpose(0, 1)
+
+    def _step(self, rows, x):
+        out, state = self.rnn(x.unsqueeze(1), self._get_state(rows))
+        self._set_state(rows, state)
+        return out[:, 0]
+
+    def _run_window(self, rows, history):
+        out, state = self.rnn(history)
+        self._set_state(rows, state)
+        return out
+
+
+class TCNStreamer(_Streamer):
+    """
+    Incremental TCN: every dilated causal convolution keeps a ring of its last
+    (kernel_size - 1) * dilation input steps, so a new bar costs one output
+    step per convolution instead of a pass over the whole sequence.
+    """
+
+    def __init__(self, model: TCN, window: int = 24, resync_every: int = None):
+        if not isinstance(model, TCN):
+            raise TypeError(f"TCNStreamer supports TCN, got {type(model).__name__}")
+        self.blocks = list(model.tcn)
+        super().__init__(model, self.blocks[0].conv1.in_channels, self.blocks[-1].conv2.out_channels,
+                         window, resync_every)
+
+    @staticmethod
+    def _history_len(conv: nn.Conv1d) -> int:
+        return (conv.kernel_size[0] - 1) * conv.dilation[0]
+
+    def _state_shapes(self):
+        shapes = {}
+        for i, block in enumerate(self.blocks):
+            shapes[f"conv1_in_{i}"] = (self._history_len(block.conv1), block.conv1.in_channels)
+            shapes[f"conv2_in_{i}"] = (self._history_len(block.conv2), block.conv2.in_channels)
+        return shapes
+
+    def _conv_step(self, conv: nn.Conv1d, name: str, rows: torch.Tensor, x: torch.Tensor) -> torch.Tensor:
+        buffer = getattr(self, name)
+        history = torch.cat([buffer[rows], x.unsqueeze(1)], dim=1)  # (n, P + 1, C), oldest first
+        buffer[rows] = history[:, 1:]
+        taps = history[:, ::conv.dilation[0]].transpose(1, 2)         # (n, C, kernel_size)
+        return F.conv1d(taps, conv.weight, conv.bias)[:, :, 0]
+
+    def _step(self, rows, x):
+        for i, block in enumerate(self.blocks):
+            h = block.relu1(self._conv_step(block.conv1, f"conv1_in_{i}", rows, x))
+            out = block.relu2(self._conv_step(block.conv2, f"conv2_in_{i}", rows, h))
+            if block.downsample is None:
+                res = x
+            else:
+                res = F.conv1d(x.unsqueeze(2), block.downsample.weight, block.downsample.bias)[:, :, 0]
+            x = out + res
+        return x
+
+    @staticmethod
+    def _tail(seq: torch.Tensor, length: int) -> torch.Tensor:
+        # Last `length` steps of (n, C, T) as (n, length, C), left-padded with zeros
+        seq = F.pad(seq, (max(0, length - seq.shape[2]), 0))
+        return seq[:, :, seq.shape[2] - length:].transpose(1, 2)
+
+    def _run_window(self, rows, history):
+        x = history.transpose(1, 2)  # (n, C, T)
+        for i, block in enumerate(self.blocks):
+            getattr(self, f"conv1_in_{i}")[rows] = self._tail(x, self._history_len(block.conv1))
+            h = block.relu1(block.chomp1(block.conv1(x)))
+            getattr(self, f"conv2_in_{i}")[rows] = self._tail(h, self._history_len(block.conv2))
+            out = block.relu2(block.chomp2(block.conv2(h)))
+            res = x if block.downsample is None else block.downsample(x)
+            x = out + res
+        return x.transpose(1, 2)
@@ -1,30 +1,44 @@
 # models/tcn_model.py
 import torch
 import torch.nn as nn
-from .model import BaseModel
+from .base_model import BaseModel
+
+class Chomp1d(nn.Module):
+    # Trims the right-side padding so the convolution stays causal
+    def __init__(self, chomp_size):
+        super().__init__()
+        self.chomp_size = chomp_size
+
+    def forward(self, x):
+        return x[:, :, :-self.chomp_size].contiguous() if self.chomp_size > 0 else x
 
 class TemporalBlock(nn.Module):
     def __init__(self, in_channels, out_channels, kernel_size, stride, dilation, padding, dropout=0.2):
         super().__init__()
         self.conv1 = nn.Conv1d(in_channels, out_channels, kernel_size, stride=stride, padding=padding, dilation=dilation)
+        self.chomp1 = Chomp1d(padding)
         self.relu1 = nn.ReLU()
         self.dropout1 = nn.Dropout(dropout)
         self.conv2 = nn.Conv1d(out_channels, out_channels, kernel_size, stride=stride, padding=padding, dilation=dilation)
+        self.chomp2 = Chomp1d(padding)
         self.relu2 = nn.ReLU()
         self.dropout2 = nn.Dropout(dropout)
         self.downsample = nn.Conv1d(in_channels, out_channels, 1) if in_channels != out_channels else None
 
     def forward(self, x):
-        out = self.conv1(x)
+        out = self.chomp1(self.conv1(x))
         out = self.relu1(out)
         out = self.dropout1(out)
-        out = self.conv2(out)
+        out = self.chomp2(self.conv2(out))
         out = self.relu2(out)
         out = self.dropout2(out)
         res = x if self.downsample is None else self.downsample(x)
         return out + res
 
 class TCN(BaseModel):
+    # 2: Chomp1d trims the padding, so the convolutions are causal
+    _version = 2
+
     def __init__(self, input_size, num_channels, kernel_size=3, dropout=0.2):
         super().__init__()
         layers = []
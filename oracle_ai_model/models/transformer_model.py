@@ -1,9 +1,12 @@
 
 import torch
 import torch.nn as nn
-from models.model import BaseModel
+from .base_model import BaseModel
 
 class TransformerTimeSeriesModel(BaseModel):
+    # 2: batch_first encoder, returns logits like the other models
+    _version = 2
+
     def __init__(
         self,
         input_size=6,
@@ -20,10 +23,9 @@ class TransformerTimeSeriesModel(BaseModel):
 
         self.embedding = nn.Linear(input_size, d_model)
         self.pos_encoder = PositionalEncoding(d_model, dropout)
-        encoder_layers = nn.TransformerEncoderLayer(d_model=d_model, nhead=nhead, dropout=dropout)
+        encoder_layers = nn.TransformerEncoderLayer(d_model=d_model, nhead=nhead, dropout=dropout, batch_first=True)
         self.transformer_encoder = nn.TransformerEncoder(encoder_layers, num_layers=num_layers)
         self.decoder = nn.Linear(d_model, output_size)
-        self.sigmoid = nn.Sigmoid()
 
     def validate_input(self, x):
         if x.dim() != 3 or x.size(2) != self.input_size:
@@ -35,8 +37,7 @@ class TransformerTimeSeriesModel(BaseModel):
         src = self.pos_encoder(src)
         output = self.transformer_encoder(src)
         pooled = torch.mean(output, dim=1)  # Mean pooling instead of using only last timestep
-        output = self.decoder(pooled)
-        return self.sigmoid(output)
+        return self.decoder(pooled)
 
     def __repr__(self):
         return f"{self.__class__.__name__}(input_size={self.input_size}, output_size={self.output_size})"
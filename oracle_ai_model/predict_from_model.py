@@ -1,14 +1,11 @@
 import torch
 import numpy as np
 import pandas as pd
+from typing import Dict, List
 
-from oracle_ai_model.models.model import LSTMModel
-from oracle_ai_model.models.gru_model import GRUTimeSeriesModel
-from oracle_ai_model.models.tcn_model import TCN
-from oracle_ai_model.models.transformer_model import TransformerTimeSeriesModel
-
-from oracle_ai_model.utils.helpers import add_technical_indicators, normalize
-from oracle_ai_model.data.loader import download_stock_data
+from oracle_ai_model.models.model import load_model
+from oracle_ai_model.inference.batch import predict_proba
+from oracle_ai_model.inference.features import plan_feature_windows
 
 
 def prepare_input_sequence(df: pd.DataFrame, seq_length: int = 24):
@@ -17,47 +14,40 @@ def prepare_input_sequence(df: pd.DataFrame, seq_length: int = 24):
     return torch.tensor(sequence).float()
 
 
-def get_model_instance(model_type: str, input_size: int):
-    if model_type == "lstm":
-        return LSTMModel(input_size)
-    elif model_type == "gru":
-        return GRUTimeSeriesModel(input_size)
-    elif model_type == "tcn":
-        return TCN(input_size=input_size, num_channels=[32, 64])
-    elif model_type == "transformer":
-        return TransformerTimeSeriesModel(input_size)
-    else:
-        raise ValueError(f"Unsupported model type: {model_type}")
+def predict_from_models(symbol: str, model_types: List[str], model_paths: Dict[str, str] = None) -> List[dict]:
+    """
+    Run several models on one symbol, fetching and featurizing its data only once.
+    """
+    symbol = symbol.upper()
+    model_paths = model_paths or {}
+    window = plan_feature_windows([(symbol, "1mo", "1d")])[(symbol, "1mo", "1d")]
 
+    results = []
+    for model_type in model_types:
+        try:
+            if isinstance(window, Exception):
+                raise window
 
-def predict_from_model(symbol: str, model_type: str = "lstm", model_path: str = None):
-    try:
-        symbol = symbol.upper()
-        df = download_stock_data(symbol, period="1mo")
-        df = add_technical_indicators(df)
-        df = normalize(df, ["Close", "rsi", "macd", "ema", "volatility"])
+            input_tensor = torch.from_numpy(window[None])
+            input_size = input_tensor.shape[2]
+            model_path = model_paths.get(model_type) or f"{model_type}_model.pth"
 
-        input_tensor = prepare_input_sequence(df)
-        input_size = input_tensor.shape[2]
+            model = load_model(model_type, model_path, input_size=input_size)
+            prob = float(predict_proba(model, input_tensor)[0])
+            prediction = int(prob > 0.5)
 
-        if not model_path:
-            model_path = f"{model_type}_model.pth"
+            results.append({
+                "symbol": symbol,
+                "model_type": model_type,
+                "prediction": prediction,
+                "confidence": prob
+            })
 
-        model = get_model_instance(model_type, input_size)
-        model.load_state_dict(torch.load(model_path))
-        model.eval()
+        except Exception as e:
+            results.append({"status": "error", "message": str(e)})
 
-        with torch.no_grad():
-            output = model(input_tensor)
-            prob = torch.sigmoid(output).item()
-            prediction = int(prob > 0.5)
+    return results
 
-        return {
-            "symbol": symbol,
-            "model_type": model_type,
-            "prediction": prediction,
-            "confidence": prob
-        }
 
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+def predict_from_model(symbol: str, model_type: str = "lstm", model_path: str = None):
+    return predict_from_models(symbol, [model_type], {model_type: model_path} if model_path else None)[0]
@@ -0,0 +1,210 @@
+# oracle_ai_model/tests/test_bar_store.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from oracle_ai_model.data.bar_store import BarStore, period_start
+
+
+def _bars(start="2020-01-01", periods=500):
+    index = pd.date_range(start, periods=periods, freq="D", name="Date")
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(periods).cumsum()
+    return pd.DataFrame({
+        "Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+        "Adj Close": close, "Volume": rng.integers(1_000, 10_000, periods),
+    }, index=index)
+
+
+def test_append_is_idempotent_and_typed(tmp_path):
+    store = BarStore(str(tmp_path))
+    bars = _bars()
+
+    assert store.append("aapl", "1d", bars.iloc[:300]) == 300
+    assert store.append("AAPL", "1d", bars.iloc[250:]) == 200  # overlap is skipped
+    assert store.append("AAPL", "1d", bars) == 0
+
+    df = store.read("AAPL", "1d")
+    assert len(df) == 500
+    assert df["Date"].is_monotonic_increasing
+    assert df["Close"].dtype == np.float32 and df["Volume"].dtype == np.int64
+    np.testing.assert_allclose(df["Close"], bars["Close"].astype(np.float32))
+
+
+def test_time_range_and_column_pushdown(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.append("AAPL", "1d", _bars())
+
+    df = store.read("AAPL", "1d", start="2020-03-01", end="2020-04-01", columns=["Close"])
+
+    assert list(df.columns) == ["Date", "Close"]
+    assert len(df) == 31
+    assert df["Date"].iloc[0] == pd.Timestamp("2020-03-01", tz="UTC")
+    assert store.first_timestamp("AAPL", "1d") == pd.Timestamp("2020-01-01", tz="UTC")
+    assert store.last_timestamp("AAPL", "1d") == pd.Timestamp("2021-05-14", tz="UTC")
+    assert store.last_timestamp("MSFT", "1d") is None
+
+
+def test_read_many_and_compact(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.append("AAPL", "1d", _bars(periods=100))
+    store.append("AAPL", "1d", _bars(start="2020-04-10", periods=50))
+    store.append("MSFT", "1d", _bars(periods=80))
+    store.append("MSFT", "1h", _bars(periods=10))
+
+    df = store.read_many(["aapl", "msft"], "1d", start="2020-03-01", columns=["Close"])
+    assert df.groupby("symbol").size().to_dict() == {"AAPL": 90, "MSFT": 20}
+
+    store.compact("AAPL", "1d")
+    assert len(store._parts("AAPL", "1d")) == 1
+    assert len(store.read("AAPL", "1d")) == 150
+
+
+def test_period_start():
+    now = pd.Timestamp("2024-06-15", tz="UTC")
+    assert period_start("7d", now) == pd.Timestamp("2024-06-08", tz="UTC")
+    assert period_start("ytd", now) == pd.Timestamp("2024-01-01", tz="UTC")
+    assert period_start("max", now) is None
+
+
+def test_upsert_reconciles_revised_bars(tmp_path):
+    store = BarStore(str(tmp_path))
+    bars = _bars(periods=100)
+    store.append("AAPL", "1d", bars)
+
+    update = _bars(start="2020-04-08", periods=5)  # 2 stored bars + 3 new ones
+    update.iloc[:2] = bars.iloc[-2:].to_numpy()
+    update.iloc[1, update.columns.get_loc("Close")] += 5.0  # provider correction
+
+    assert store.upsert("AAPL", "1d", update) == (3, 1)
+    df = store.read("AAPL", "1d")
+    assert len(df) == 103
+    assert df["Date"].is_unique
+    assert df.set_index("Date").loc[pd.Timestamp("2020-04-09", tz="UTC"), "Close"] == np.float32(update["Close"].iloc[1])
+
+
+def test_sync_fetches_only_new_bars(tmp_path):
+    from oracle_ai_model.data import loader
+    from oracle_ai_model.data.providers import MarketDataProvider
+
+    history = _bars(start=pd.Timestamp.now().normalize() - pd.Timedelta(days=59), periods=60)
+    calls = []
+
+    class Recorded(MarketDataProvider):
+        def fetch(self, symbol, interval="1d", period=None, start=None):
+            calls.append({"period": period, "start": start})
+            return history if start is None else history[history.index >= pd.Timestamp(start).tz_localize(None)]
+
+    store = BarStore(str(tmp_path))
+    store.append("AAPL", "1d", history.iloc[:50])
+
+    result = loader.sync_bars("AAPL", interval="1d", period="1mo", store=store, provider=Recorded())
+
+    assert result["mode"] == "delta" and result["added"] == 10
+    assert result["fetched"] == 10 + loader.SYNC_OVERLAP_BARS
+    assert calls[0]["period"] is None
+    assert loader.sync_bars("AAPL", interval="1d", period="1mo", store=store, provider=Recorded())["mode"] == "fresh"
+
+
+def test_parts_are_compacted_and_footers_cached(tmp_path, monkeypatch):
+    from oracle_ai_model.data import bar_store
+
+    store = BarStore(str(tmp_path), max_parts=3)
+    bars = _bars(periods=100)
+    for start in range(0, 100, 10):
+        store.append("AAPL", "1d", bars.iloc[start:start + 10])
+    assert len(store._parts("AAPL", "1d")) <= 3
+    assert len(store.read("AAPL", "1d")) == 100
+
+    opened = []
+    parquet_file = bar_store.pq.ParquetFile
+    monkeypatch.setattr(bar_store.pq, "ParquetFile", lambda path: opened.append(path) or parquet_file(path))
+    for _ in range(5):
+        assert store.last_timestamp("AAPL", "1d") == pd.Timestamp("2020-04-09", tz="UTC")
+    assert sorted(opened) == sorted(store._parts("AAPL", "1d"))  # each footer read once, then cached
+
+
+def test_reads_during_rewrites_never_miss_a_part(tmp_path):
+    import threading
+
+    store = BarStore(str(tmp_path), max_parts=2)
+    bars = _bars(periods=200)
+    store.append("AAPL", "1d", bars.iloc[:100])
+    errors, done = [], threading.Event()
+
+    def reader():
+        while not done.is_set():
+            try:
+                assert len(store.read("AAPL", "1d")) >= 100
+                store.read_many(["AAPL"], "1d")
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for start in range(100, 200, 5):
+        store.upsert("AAPL", "1d", bars.iloc[start - 1:start + 5] * 1.01)  # revises a stored bar -> part rewrite
+    done.set()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(store.read("AAPL", "1d")) == 200
+
+
+def test_duplicate_parts_keep_the_newest_bars(tmp_path):
+    import os
+    import time
+    from oracle_ai_model.data.bar_store import to_bar_table, pq
+
+    # Two writers that both stored the same 10 bars (a store written without the file lock)
+    store = BarStore(str(tmp_path))
+    more = _bars(periods=12)
+    bars = more.iloc[:10]
+    store.append("AAPL", "1d", bars)
+    time.sleep(0.01)
+    path = store._partition("AAPL", "1d")
+    pq.write_table(to_bar_table(bars * 2), os.path.join(path, "part-20200101T000000-duplicate.parquet"))
+    assert len(store._parts("AAPL", "1d")) == 2
+
+    df = store.read("AAPL", "1d")
+    assert len(df) == 10
+    np.testing.assert_allclose(df["Close"], (bars["Close"] * 2).astype(np.float32))  # newest part wins
+    assert len(store.read_many(["AAPL"], "1d")) == 10
+
+    assert store.upsert("AAPL", "1d", more * 2) == (2, 0)
+    store.compact("AAPL", "1d")
+    assert len(store._parts("AAPL", "1d")) == 1
+    df = store.read("AAPL", "1d")
+    assert len(df) == 12 and df["Date"].is_unique
+    np.testing.assert_allclose(df["Close"], (more["Close"] * 2).astype(np.float32))
+
+
+def _upsert_in_process(root, start, stop):
+    store = BarStore(root, max_parts=2)
+    bars = _bars(periods=60)
+    for i in range(start, stop):
+        store.upsert("AAPL", "1d", bars.iloc[:i])
+
+
+def test_processes_sharing_a_store_write_each_bar_once(tmp_path):
+    import multiprocessing
+    from oracle_ai_model.data.bar_store import pq
+
+    pytest.importorskip("fcntl")
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_upsert_in_process, args=(str(tmp_path), 1, 60)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    store = BarStore(str(tmp_path))
+    stored = sum(pq.ParquetFile(part).metadata.num_rows for part in store._parts("AAPL", "1d"))
+    assert stored == 59  # no bar written by two processes
+    assert len(store.read("AAPL", "1d")) == 59
@@ -0,0 +1,36 @@
+# oracle_ai_model/tests/test_batch_inference.py
+
+import numpy as np
+import torch
+
+from oracle_ai_model.models.model import ModelRegistry
+from oracle_ai_model.inference.batch import batched_predict, predict_proba
+
+
+def _windows(n, seq_len=24, features=5, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.standard_normal((seq_len, features)).astype(np.float32) for _ in range(n)]
+
+
+def test_batched_matches_per_symbol_forward():
+    torch.manual_seed(0)
+    for model_type in ("lstm", "gru", "tcn", "transformer"):
+        model = ModelRegistry().get_model(model_type, input_size=5).eval()
+        windows = _windows(16)
+
+        batched = batched_predict(model, windows)
+        single = [float(predict_proba(model, torch.from_numpy(w[None]))[0]) for w in windows]
+
+        np.testing.assert_allclose(batched, single, rtol=1e-4, atol=1e-5)
+
+
+def test_short_windows_are_grouped_separately_and_keep_order():
+    model = ModelRegistry().get_model("gru", input_size=5).eval()
+    windows = _windows(3)
+    windows.insert(1, _windows(1, seq_len=20, seed=1)[0])
+
+    probs = batched_predict(model, windows)
+
+    assert len(probs) == 4
+    expected = float(predict_proba(model, torch.from_numpy(windows[1][None]))[0])
+    assert abs(probs[1] - expected) < 1e-5
@@ -0,0 +1,83 @@
+# oracle_ai_model/tests/test_bulk.py
+
+import time
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from oracle_ai_model.data.bar_store import BarStore
+from oracle_ai_model.data.bulk import RateLimiter, fetch_bulk
+from oracle_ai_model.data.loader import sync_many
+from oracle_ai_model.data.providers import MarketDataProvider, SyntheticProvider
+
+
+class Grouped(MarketDataProvider):
+    name = "grouped-test"
+    batch_size = 3
+    max_concurrency = 4
+
+    def __init__(self):
+        self.calls = []
+
+    def fetch_many(self, symbols, interval="1d", period=None, start=None):
+        self.calls.append(list(symbols))
+        if "BOOM" in symbols:
+            raise RuntimeError("bad ticker")
+        index = pd.date_range("2024-01-01", periods=3, freq="D", name="Date")
+        return {s: pd.DataFrame({"Close": [1.0, 2.0, 3.0]}, index=index) for s in symbols if s != "EMPTY"}
+
+
+def test_fetch_bulk_groups_and_isolates_errors():
+    provider = Grouped()
+    frames, errors = fetch_bulk(["a", "b", "c", "d", "BOOM", "EMPTY", "a"], provider=provider)
+
+    assert sorted(frames) == ["A", "B", "C", "D"]
+    assert errors == {"BOOM": "bad ticker", "EMPTY": "no data returned"}
+    # Two grouped requests, then the failing group retried symbol by symbol
+    assert sorted(len(c) for c in provider.calls) == [1, 1, 1, 3, 3]
+
+
+def test_rate_limiter_paces_requests():
+    limiter = RateLimiter(rate=50)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_sync_many_full_then_fresh(tmp_path):
+    store, provider = BarStore(str(tmp_path)), SyntheticProvider(seed=1)
+    symbols = [f"SYM{i}" for i in range(20)]
+
+    results, errors = sync_many(symbols, "1d", period="3mo", store=store, provider=provider)
+    assert not errors and all(r["mode"] == "full" and r["added"] > 50 for r in results.values())
+
+    results, _ = sync_many(symbols, "1d", period="3mo", store=store, provider=provider)
+    assert {r["mode"] for r in results.values()} <= {"fresh", "delta"}
+    assert sum(r["added"] for r in results.values()) <= len(symbols)
+    assert store.read_many(symbols, "1d")["symbol"].nunique() == 20
+
+
+def test_sync_many_buckets_delta_starts(tmp_path):
+    store, provider = BarStore(str(tmp_path)), SyntheticProvider(seed=1)
+    symbols = [f"SYM{i}" for i in range(6)]
+    # One symbol two months behind, the rest a few bars behind
+    for symbol in symbols:
+        bars = provider.fetch(symbol, "1d", period="6mo")
+        store.append(symbol, "1d", bars.iloc[:-60] if symbol == "SYM0" else bars.iloc[:-3])
+
+    starts = []
+    fetch_many = provider.fetch_many
+    provider.fetch_many = lambda batch, interval="1d", period=None, start=None: (
+        starts.append((sorted(batch), start)) or fetch_many(batch, interval, period=period, start=start))
+    results, errors = sync_many(symbols, "1d", period="6mo", store=store, provider=provider)
+
+    assert not errors and {r["mode"] for r in results.values()} == {"delta"}
+    # Two buckets: the stale symbol alone, the recent ones from one shared start
+    by_start = {}
+    for batch, start in starts:
+        by_start.setdefault(start, []).extend(batch)
+    assert sorted(by_start.values()) == [["SYM0"], symbols[1:]]
+    assert all(results[s]["fetched"] < 10 for s in symbols[1:])
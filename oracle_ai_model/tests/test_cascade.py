@@ -0,0 +1,61 @@
+# oracle_ai_model/tests/test_cascade.py
+
+import numpy as np
+import pytest
+import torch
+
+from oracle_ai_model.inference.cascade import CascadePredictor
+
+
+class _Constant(torch.nn.Module):
+    """Returns a fixed logit per window, keyed by the window's first value."""
+
+    def __init__(self, logits):
+        super().__init__()
+        self.logits = logits
+        self.seen = 0
+
+    def forward(self, x):
+        self.seen += len(x)
+        return torch.tensor([[self.logits[int(v)]] for v in x[:, 0, 0]])
+
+
+def _windows(n):
+    return [np.full((24, 5), i, dtype=np.float32) for i in range(n)]
+
+
+def test_only_uncertain_windows_are_escalated():
+    logit = lambda p: float(np.log(p / (1 - p)))
+    cheap = _Constant({0: logit(0.9), 1: logit(0.5), 2: logit(0.1), 3: logit(0.55)})
+    expensive = _Constant({i: logit(0.8) for i in range(4)})
+    snapshots = []
+    cascade = CascadePredictor(band=(0.4, 0.6), on_predict=snapshots.append)
+
+    probs, decided_by = cascade.predict([("gru", cheap), ("transformer", expensive)], _windows(4))
+
+    np.testing.assert_allclose(probs, [0.9, 0.8, 0.1, 0.8], rtol=1e-5)
+    assert decided_by == ["gru", "transformer", "gru", "transformer"]
+    assert (cheap.seen, expensive.seen) == (4, 2)
+
+    stats = snapshots[-1]
+    assert stats["windows"] == 4
+    assert stats["stages"]["gru"]["hit_rate"] == 0.5
+    assert stats["stages"]["transformer"]["hit_rate"] == 1.0
+    assert stats["compute_saved"] is not None
+
+
+def test_confident_first_stage_skips_later_stages():
+    cheap = _Constant({i: 5.0 for i in range(3)})
+    expensive = _Constant({i: 0.0 for i in range(3)})
+    cascade = CascadePredictor(band=(0.4, 0.6))
+
+    _, decided_by = cascade.predict([("gru", cheap), ("transformer", expensive)], _windows(3))
+
+    assert decided_by == ["gru"] * 3
+    assert expensive.seen == 0
+    assert cascade.stats()["compute_saved"] is None  # last stage never ran, no baseline yet
+
+
+def test_empty_cascade_is_rejected():
+    with pytest.raises(ValueError):
+        CascadePredictor().predict([], _windows(1))
@@ -0,0 +1,95 @@
+# oracle_ai_model/tests/test_coalesce.py
+
+import time
+import threading
+
+import pandas as pd
+
+from oracle_ai_model.data.coalesce import BarCloseCache, SingleFlight
+from oracle_ai_model.data.timeframes import bar_close, bar_expiry, next_bar_close
+
+
+def _concurrently(fn, n=8):
+    results, errors = [], []
+
+    def run():
+        try:
+            results.append(fn())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def test_single_flight_shares_one_execution():
+    flight, calls = SingleFlight(), []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.2)
+        return "bars"
+
+    results, _ = _concurrently(lambda: flight.do(("AAPL", "1mo", "1d"), load))
+    assert results == ["bars"] * 8 and len(calls) == 1
+    assert flight.shared == 7
+
+
+def test_single_flight_propagates_errors_and_does_not_cache_them():
+    cache = BarCloseCache()
+
+    def fail():
+        time.sleep(0.1)
+        raise ValueError("provider down")
+
+    _, errors = _concurrently(lambda: cache.get("AAPL", "1d", fail), n=4)
+    assert len(errors) == 4 and all(isinstance(e, ValueError) for e in errors)
+    assert cache.get("AAPL", "1d", lambda: "ok") == "ok"
+
+
+def test_bar_close_cache_reuses_within_bar():
+    cache, calls = BarCloseCache(max_entries=2), []
+    load = lambda: calls.append(1) or len(calls)
+    assert cache.get("AAPL", "1d", load) == cache.get("AAPL", "1d", load) == 1
+    assert cache.stats()["hits"] == 1
+
+    cache.get("MSFT", "1d", load), cache.get("TSLA", "1d", load)
+    assert cache.get("AAPL", "1d", load) == 4  # evicted by the LRU bound
+
+
+def test_next_bar_close():
+    now = pd.Timestamp("2024-03-05 10:17:30", tz="UTC")
+    assert next_bar_close("15m", now) == pd.Timestamp("2024-03-05 10:30", tz="UTC")
+    assert next_bar_close("60m", now) == pd.Timestamp("2024-03-05 11:00", tz="UTC")
+    assert next_bar_close("1d", now) == pd.Timestamp("2024-03-06", tz="UTC")
+    assert next_bar_close("1wk", now) == pd.Timestamp("2024-03-11", tz="UTC")  # Monday
+    assert next_bar_close("1mo", now) == pd.Timestamp("2024-04-01", tz="UTC")
+
+
+def test_expiry_follows_the_last_bar():
+    now = pd.Timestamp("2024-03-05 15:40", tz="UTC")
+    # US equity hourly bars open at :30 UTC; the 15:30 bar closes at 16:30, not 16:00
+    assert bar_expiry("60m", pd.Timestamp("2024-03-05 15:30", tz="UTC"), now) == pd.Timestamp("2024-03-05 16:30", tz="UTC")
+    # Friday's close already passed with no newer bar (weekend): check again an interval later
+    saturday = pd.Timestamp("2024-03-09 12:00", tz="UTC")
+    assert bar_expiry("1d", pd.Timestamp("2024-03-08", tz="UTC"), saturday) == saturday + pd.Timedelta(days=1)
+    assert bar_close(pd.Timestamp("2024-02-01", tz="UTC"), "1mo") == pd.Timestamp("2024-03-01", tz="UTC")
+    assert bar_expiry("1d", None, now) == next_bar_close("1d", now)
+
+
+def test_bar_close_cache_expires_with_the_loaded_bars():
+    now = pd.Timestamp.now(tz="UTC")
+    cache, calls = BarCloseCache(last_bar=lambda value: value), []
+
+    def load(last_bar):
+        return lambda: calls.append(1) or last_bar
+
+    cache.get("AAPL", "1h", load(now - pd.Timedelta(minutes=30)))  # closes in ~30 minutes
+    cache.get("AAPL", "1h", load(now))
+    assert len(calls) == 1
+    cache.get("MSFT", "1m", load(now - pd.Timedelta(minutes=5)))   # already closed, re-check in a minute
+    assert cache._entries["MSFT"][1] > now
@@ -0,0 +1,83 @@
+# oracle_ai_model/tests/test_ensemble.py
+
+import numpy as np
+import pytest
+import torch
+
+from oracle_ai_model.models.model import ModelRegistry
+from oracle_ai_model.inference.batch import batched_predict
+from oracle_ai_model.inference.ensemble import EnsemblePredictor, set_intra_op_threads
+
+
+def _windows(n, seq_len=24, features=5, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.standard_normal((seq_len, features)).astype(np.float32) for _ in range(n)]
+
+
+def _members():
+    torch.manual_seed(0)
+    return [(name, ModelRegistry().get_model(name, input_size=5).eval())
+            for name in ("lstm", "gru", "tcn", "transformer")]
+
+
+@pytest.mark.parametrize("workers", [0, 4])
+def test_ensemble_averages_member_probabilities(workers):
+    members = _members()
+    windows = _windows(6)
+
+    probs, contributions = EnsemblePredictor(workers=workers).predict(members, windows)
+
+    per_model = {name: batched_predict(model, windows) for name, model in members}
+    expected = np.mean(list(per_model.values()), axis=0)
+    np.testing.assert_allclose(probs, expected, rtol=1e-5, atol=1e-6)
+    for i, contribution in enumerate(contributions):
+        assert set(contribution) == set(per_model)
+        for name, entry in contribution.items():
+            assert entry["weight"] == pytest.approx(0.25)
+            assert entry["probability"] == pytest.approx(per_model[name][i], abs=1e-6)
+
+
+def test_weights_are_normalised():
+    members = _members()[:2]
+    windows = _windows(3)
+
+    probs, contributions = EnsemblePredictor(weights={"lstm": 3.0, "gru": 1.0}).predict(members, windows)
+
+    lstm, gru = (np.array(batched_predict(model, windows)) for _, model in members)
+    np.testing.assert_allclose(probs, 0.75 * lstm + 0.25 * gru, rtol=1e-5, atol=1e-6)
+    assert contributions[0]["lstm"]["weight"] == pytest.approx(0.75)
+
+
+def test_missing_member_is_skipped_and_weights_renormalised(caplog):
+    models = dict(_members())
+    windows = _windows(3)
+
+    def load(name):
+        if name == "tcn":
+            raise FileNotFoundError(f"checkpoints/{name}.pt")
+        return models[name]
+
+    ensemble = EnsemblePredictor(weights={"lstm": 2.0, "gru": 1.0, "tcn": 1.0})
+    members = ensemble.load_members(["lstm", "gru", "tcn"], load)
+    probs, contributions = ensemble.predict(members, windows)
+
+    assert [name for name, _ in members] == ["lstm", "gru"]
+    assert "tcn" in caplog.text
+    lstm, gru = (np.array(batched_predict(models[name], windows)) for name in ("lstm", "gru"))
+    np.testing.assert_allclose(probs, (2 * lstm + gru) / 3, rtol=1e-5, atol=1e-6)
+    assert set(contributions[0]) == {"lstm", "gru"}
+
+    with pytest.raises(FileNotFoundError):
+        ensemble.load_members(["tcn"], load)
+
+
+def test_predictor_leaves_the_thread_pool_alone():
+    threads = torch.get_num_threads()
+    EnsemblePredictor(workers=2)
+    assert torch.get_num_threads() == threads
+
+    try:
+        set_intra_op_threads(1)
+        assert torch.get_num_threads() == 1
+    finally:
+        torch.set_num_threads(threads)
@@ -0,0 +1,43 @@
+# oracle_ai_model/tests/test_export.py
+
+import os
+import torch
+import pytest
+
+from oracle_ai_model.models.model import ModelRegistry
+from oracle_ai_model.models.export import export_checkpoint, compiled_path, TORCHSCRIPT_SUFFIX
+
+INPUT_SIZE = 5
+
+
+@pytest.mark.parametrize("model_type", ["lstm", "gru", "tcn", "transformer"])
+def test_torchscript_parity(tmp_path, model_type):
+    torch.manual_seed(0)
+    model_path = str(tmp_path / f"{model_type}_model.pth")
+    torch.save(ModelRegistry().get_model(model_type, input_size=INPUT_SIZE).state_dict(), model_path)
+
+    paths = export_checkpoint(model_type, model_path, INPUT_SIZE)
+    assert os.path.exists(paths["torchscript"])
+
+    registry = ModelRegistry()
+    eager = registry.load_checkpoint(model_type, model_path, input_size=INPUT_SIZE, backend="eager")
+    compiled = registry.load_checkpoint(model_type, model_path, input_size=INPUT_SIZE)
+    assert isinstance(compiled, torch.jit.ScriptModule)
+
+    with torch.no_grad():
+        for batch_size in (1, 32, 512):
+            x = torch.randn(batch_size, 24, INPUT_SIZE)
+            torch.testing.assert_close(compiled(x), eager(x), rtol=1e-4, atol=1e-5)
+
+
+def test_stale_artifact_falls_back_to_eager(tmp_path):
+    model_path = str(tmp_path / "gru_model.pth")
+    torch.save(ModelRegistry().get_model("gru", input_size=INPUT_SIZE).state_dict(), model_path)
+    export_checkpoint("gru", model_path, INPUT_SIZE)
+
+    ts_path = compiled_path(model_path, TORCHSCRIPT_SUFFIX)
+    mtime = os.path.getmtime(model_path) - 60
+    os.utime(ts_path, (mtime, mtime))
+
+    model = ModelRegistry().load_checkpoint("gru", model_path, input_size=INPUT_SIZE)
+    assert not isinstance(model, torch.jit.ScriptModule)
@@ -0,0 +1,86 @@
+# oracle_ai_model/tests/test_features.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("yfinance")  # features -> data.loader downloads via yfinance
+
+from oracle_ai_model.inference import features
+from oracle_ai_model.inference.batch import FEATURE_COLUMNS, SEQ_LENGTH
+
+
+def test_plan_computes_each_key_once_and_keeps_failures():
+    calls = []
+
+    def prepare(symbol, period, interval):
+        calls.append(symbol)
+        if symbol == "BAD":
+            raise ValueError("no data")
+        return np.zeros((SEQ_LENGTH, len(FEATURE_COLUMNS)), dtype=np.float32)
+
+    keys = [("AAPL", "1mo", "1d"), ("BAD", "1mo", "1d"), ("AAPL", "1mo", "1d")]
+    windows = features.plan_feature_windows(keys, prepare=prepare)
+
+    assert calls == ["AAPL", "BAD"]
+    assert windows[keys[0]].shape == (SEQ_LENGTH, len(FEATURE_COLUMNS))
+    assert isinstance(windows[keys[1]], ValueError)
+
+
+def test_prepare_reports_every_stage_in_order(monkeypatch):
+    frame = pd.DataFrame(np.ones((40, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    monkeypatch.setattr(features, "download_stock_data", lambda symbol, period, interval: frame.copy())
+    monkeypatch.setattr(features, "add_technical_indicators", lambda df: df)
+    monkeypatch.setattr(features, "normalize", lambda df, columns: df)
+    stages = []
+
+    window = features.prepare_feature_window("AAPL", on_stage=lambda stage, seconds: stages.append((stage, seconds)))
+
+    assert window.shape == (SEQ_LENGTH, len(FEATURE_COLUMNS))
+    assert [stage for stage, _ in stages] == list(features.FEATURE_STAGES)
+    assert all(seconds >= 0 for _, seconds in stages)
+
+
+def test_default_request_window_has_no_nans(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    from oracle_ai_model.data import bar_store, loader, providers
+
+    monkeypatch.setattr(bar_store, "_bar_store", bar_store.BarStore(str(tmp_path)))
+    monkeypatch.setattr(providers, "_provider", providers.SyntheticProvider(seed=1))
+    loader._bar_cache.clear()
+
+    window = features.prepare_feature_window("AAPL", features.DEFAULT_PERIOD, features.DEFAULT_INTERVAL)
+
+    assert window.shape == (SEQ_LENGTH, len(FEATURE_COLUMNS))
+    assert not np.isnan(window).any()
+    loader._bar_cache.clear()
+
+
+def test_replayed_recording_runs_the_pipeline_offline(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    from oracle_ai_model.data import bar_store, loader, providers
+
+    # A 2023 recording: the replay clock stops at its last bar, so it is served as current
+    replay = tmp_path / "replay"
+    replay.mkdir()
+    index = pd.date_range("2023-01-02", "2023-06-30", freq="B", name="Date")
+    close = 100 + np.random.default_rng(0).standard_normal(len(index)).cumsum()
+    pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Adj Close": close,
+                  "Volume": 1_000}, index=index).to_csv(replay / "SPY_1d.csv")
+    provider = providers.FileReplayProvider(str(replay))
+    fetches = []
+    fetch = provider.fetch
+    monkeypatch.setattr(provider, "fetch", lambda *a, **k: fetches.append(k) or fetch(*a, **k))
+    monkeypatch.setattr(bar_store, "_bar_store", bar_store.BarStore(str(tmp_path / "bars")))
+    monkeypatch.setattr(providers, "_provider", provider)
+    loader._bar_cache.clear()
+
+    window = features.prepare_feature_window("SPY", features.DEFAULT_PERIOD, features.DEFAULT_INTERVAL)
+
+    assert window.shape == (SEQ_LENGTH, len(FEATURE_COLUMNS))
+    assert not np.isnan(window).any()
+    assert provider.now() == pd.Timestamp("2023-06-30", tz="UTC")
+    bars = loader.load_bars("SPY", period="1mo", interval="1d")
+    assert bars["Date"].iloc[-1] == pd.Timestamp("2023-06-30", tz="UTC") and len(bars) >= 20
+    assert len(fetches) == 1  # the second load finds the store fresh: no delta fetch
+    loader._bar_cache.clear()
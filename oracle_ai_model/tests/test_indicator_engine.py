@@ -0,0 +1,82 @@
+# oracle_ai_model/tests/test_indicator_engine.py
+
+import numpy as np
+import pandas as pd
+
+from oracle_ai_model.inference.batch import FEATURE_COLUMNS
+from oracle_ai_model.utils import indicator_engine as engine
+from oracle_ai_model.utils.helpers import add_technical_indicators
+from oracle_ai_model.utils.indicators import add_all_indicators_batched
+
+
+def _bars(periods=300, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(periods).cumsum()
+    return pd.DataFrame({
+        "Open": close, "High": close + rng.random(periods), "Low": close - rng.random(periods),
+        "Close": close, "Volume": rng.integers(1_000, 10_000, periods).astype(float),
+    })
+
+
+def _reference(df):
+    # The pandas formulas the engine replaces
+    close, high, low = df["Close"], df["High"], df["Low"]
+    delta = close.diff()
+    gain = pd.Series(np.where(delta > 0, delta, 0)).rolling(14).mean()
+    loss = pd.Series(np.where(delta < 0, -delta, 0)).rolling(14).mean()
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    tr = pd.concat([high - low, (high - close.shift()).abs(), (low - close.shift()).abs()], axis=1).max(axis=1)
+    return {
+        "rsi": 100 - 100 / (1 + gain / (loss + 1e-10)),
+        "macd": macd,
+        "macd_signal": macd.ewm(span=9, adjust=False).mean(),
+        "ema_20": close.ewm(span=20, adjust=False).mean(),
+        "atr": tr.rolling(14).mean(),
+        "bb_upper": close.rolling(20).mean() + 2 * close.rolling(20).std(),
+        "vwap": (close * df["Volume"]).cumsum() / (df["Volume"].cumsum() + 1e-10),
+        "volatility": close.pct_change().rolling(20).std(),
+    }
+
+
+def test_engine_matches_pandas_formulas():
+    df = _bars()
+    result = engine.compute_indicators(df["High"], df["Low"], df["Close"], df["Volume"])
+    for column, expected in _reference(df).items():
+        np.testing.assert_allclose(result[column], expected.to_numpy(), rtol=1e-9, atol=1e-9, err_msg=column)
+
+
+def test_ema_is_stable_over_long_series():
+    close = 50_000 + np.random.default_rng(1).standard_normal(20_000).cumsum()
+    expected = pd.Series(close).ewm(span=9, adjust=False).mean().to_numpy()
+    np.testing.assert_allclose(engine.ema(close, 9), expected, rtol=1e-10)
+
+
+def test_reused_buffer_and_feature_columns():
+    df = _bars()
+    buffer = np.empty((len(engine.INDICATOR_COLUMNS), len(df)))
+    result = engine.compute_indicators(df["High"], df["Low"], df["Close"], df["Volume"], out=buffer)
+    assert all(np.shares_memory(values, buffer) for values in result.values())
+
+    features = add_technical_indicators(_bars())
+    assert set(FEATURE_COLUMNS) <= set(features.columns)
+    assert features[FEATURE_COLUMNS].iloc[30:].notna().all().all()
+
+
+def test_batched_rows_match_single_symbol_results():
+    frames = [_bars(n, seed=n).assign(symbol=f"S{n}", Date=lambda f: pd.date_range("2024-01-01", periods=len(f)))
+              for n in (300, 120, 45, 10)]
+    panel = {f: engine.stack_right_aligned([frame[f].to_numpy() for frame in frames])
+             for f in ("High", "Low", "Close", "Volume")}
+    batched = engine.compute_indicators_batched(panel["High"], panel["Low"], panel["Close"], panel["Volume"],
+                                                chunk_rows=3)
+
+    long = pd.concat(frames).sample(frac=1, random_state=0)
+    add_all_indicators_batched(long)
+
+    for row, frame in enumerate(frames):
+        single = engine.compute_indicators(frame["High"], frame["Low"], frame["Close"], frame["Volume"])
+        from_long = long[long["symbol"] == frame["symbol"].iloc[0]].sort_values("Date")
+        for column in engine.INDICATOR_COLUMNS:
+            np.testing.assert_allclose(batched[column][row, -len(frame):], single[column], rtol=1e-9, atol=1e-9)
+            np.testing.assert_allclose(from_long[column].to_numpy(), single[column], rtol=1e-9, atol=1e-9)
+        assert np.isnan(batched["rsi"][row, :-len(frame)]).all()
@@ -0,0 +1,77 @@
+# oracle_ai_model/tests/test_indicator_state.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from oracle_ai_model.utils.indicator_engine import INDICATOR_COLUMNS, compute_indicators
+from oracle_ai_model.utils.indicator_state import IndicatorState, IndicatorStateStore
+
+
+def _bars(periods=300, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(periods).cumsum()
+    return pd.DataFrame({
+        "Date": pd.date_range("2024-01-01", periods=periods, freq="h", tz="UTC"),
+        "High": close + rng.random(periods), "Low": close - rng.random(periods),
+        "Close": close, "Volume": rng.integers(1_000, 10_000, periods).astype(float),
+    })
+
+
+def test_incremental_matches_full_recompute():
+    bars = _bars()
+    expected = compute_indicators(bars["High"], bars["Low"], bars["Close"], bars["Volume"])
+
+    state = IndicatorState.seed(bars.iloc[:200])
+    for i in range(200, len(bars)):
+        state = IndicatorState.from_json(state.to_json())  # as if reloaded between bars
+        row = bars.iloc[i]
+        latest = state.update(row["High"], row["Low"], row["Close"], row["Volume"], row["Date"])
+        for column in INDICATOR_COLUMNS:
+            assert latest[column] == pytest.approx(expected[column][i], rel=1e-9, abs=1e-9), column
+
+
+def test_store_only_folds_unseen_bars(tmp_path):
+    bars = _bars(120)
+    store = IndicatorStateStore(directory=str(tmp_path))
+
+    store.advance("AAPL", "1h", bars.iloc[:100])
+    # Overlapping frame: only the 20 new bars are folded in
+    latest = store.advance("AAPL", "1h", bars.iloc[50:])
+    state = store.load("AAPL", "1h")
+
+    assert state.bars == 120
+    assert state.last_bar == bars["Date"].iloc[-1].isoformat()
+    expected = compute_indicators(bars["High"], bars["Low"], bars["Close"], bars["Volume"])
+    assert latest["rsi"] == pytest.approx(expected["rsi"][-1])
+
+
+def test_values_are_nan_until_windows_fill():
+    state = IndicatorState()
+    latest = state.update(101.0, 99.0, 100.0, 1_000.0)
+    assert np.isnan(latest["rsi"]) and np.isnan(latest["volatility"])
+    assert latest["ema"] == 100.0 and latest["vwap"] == pytest.approx(100.0)
+
+
+def test_window_keeps_the_open_bar_out_of_the_state(tmp_path):
+    bars = _bars(200)
+    store = IndicatorStateStore(directory=str(tmp_path), keep=40)
+    now = bars["Date"].iloc[-1] + pd.Timedelta(minutes=30)  # the last hourly bar is still open
+
+    store.window("AAPL", "1h", bars.iloc[:150], rows=30, now=bars["Date"].iloc[149] + pd.Timedelta(minutes=30))
+    # A partial last bar, then the same bar once it has closed with different values
+    partial = bars.copy()
+    partial.loc[partial.index[-1], ["High", "Close"]] += 5.0
+    window = store.window("AAPL", "1h", partial.iloc[100:], rows=30, now=now)
+    state = store.load("AAPL", "1h")
+
+    expected = compute_indicators(partial["High"], partial["Low"], partial["Close"], partial["Volume"])
+    assert len(window) == 30 and window.index[-1] == bars["Date"].iloc[-1]
+    for column in INDICATOR_COLUMNS:
+        np.testing.assert_allclose(window[column], expected[column][-30:], rtol=1e-9, atol=1e-9, err_msg=column)
+    assert state.last_bar == bars["Date"].iloc[-2].isoformat() and len(state.recent) == 40
+
+    closed = store.window("AAPL", "1h", bars, rows=30, now=now + pd.Timedelta(hours=1))
+    expected = compute_indicators(bars["High"], bars["Low"], bars["Close"], bars["Volume"])
+    assert closed["rsi"].iloc[-1] == pytest.approx(expected["rsi"][-1])
+    assert store.load("AAPL", "1h").last_bar == bars["Date"].iloc[-1].isoformat()
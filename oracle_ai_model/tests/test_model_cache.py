@@ -0,0 +1,121 @@
+# oracle_ai_model/tests/test_model_cache.py
+
+import os
+import threading
+import pytest
+import torch
+
+from oracle_ai_model.models.model import ModelCache, ModelRegistry, _model_nbytes
+
+INPUT_SIZE = 5
+
+
+def _save_checkpoint(path, model_type="lstm"):
+    model = ModelRegistry().get_model(model_type, input_size=INPUT_SIZE)
+    torch.save(model.state_dict(), path)
+    return model
+
+
+class CountingRegistry(ModelRegistry):
+    def __init__(self):
+        super().__init__()
+        self.loads = 0
+
+    def load_checkpoint(self, model_type, model_path, **kwargs):
+        self.loads += 1
+        return super().load_checkpoint(model_type, model_path, **kwargs)
+
+
+def test_checkpoint_loaded_once(tmp_path):
+    path = str(tmp_path / "lstm_model.pth")
+    _save_checkpoint(path)
+    registry = CountingRegistry()
+    cache = ModelCache(registry=registry)
+
+    first = cache.get("lstm", path, input_size=INPUT_SIZE)
+    second = cache.get("lstm", path, input_size=INPUT_SIZE)
+
+    assert first is second
+    assert not first.training
+    assert registry.loads == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_concurrent_misses_share_one_load(tmp_path):
+    path = str(tmp_path / "gru_model.pth")
+    _save_checkpoint(path, "gru")
+    registry = CountingRegistry()
+    cache = ModelCache(registry=registry)
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get("gru", path, input_size=INPUT_SIZE)))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert registry.loads == 1
+    assert all(m is results[0] for m in results)
+
+
+def test_new_mtime_replaces_stale_entry(tmp_path):
+    path = str(tmp_path / "lstm_model.pth")
+    _save_checkpoint(path)
+    cache = ModelCache()
+    old = cache.get("lstm", path, input_size=INPUT_SIZE)
+
+    _save_checkpoint(path)
+    mtime = os.path.getmtime(path) + 10
+    os.utime(path, (mtime, mtime))
+    new = cache.get("lstm", path, input_size=INPUT_SIZE)
+
+    assert new is not old
+    assert cache.stats()["entries"] == 1
+
+
+def test_lru_eviction_respects_memory_budget(tmp_path):
+    paths = []
+    for name in ("a", "b", "c"):
+        path = str(tmp_path / f"{name}.pth")
+        _save_checkpoint(path)
+        paths.append(path)
+    size = _model_nbytes(ModelRegistry().get_model("lstm", input_size=INPUT_SIZE))
+    cache = ModelCache(max_bytes=2 * size)
+
+    cache.get("lstm", paths[0], input_size=INPUT_SIZE)
+    cache.get("lstm", paths[1], input_size=INPUT_SIZE)
+    cache.get("lstm", paths[0], input_size=INPUT_SIZE)  # refresh a
+    cache.get("lstm", paths[2], input_size=INPUT_SIZE)  # evicts b
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["total_bytes"] <= 2 * size
+
+
+def test_mmap_checkpoint_matches_and_legacy_falls_back(tmp_path):
+    torch.manual_seed(0)
+    x = torch.randn(3, 24, INPUT_SIZE)
+    mmapped_path = str(tmp_path / "gru_model.pth")
+    legacy_path = str(tmp_path / "gru_legacy.pth")
+    model = _save_checkpoint(mmapped_path, "gru").eval()
+    torch.save(model.state_dict(), legacy_path, _use_new_zipfile_serialization=False)
+
+    with torch.no_grad():
+        expected = model(x)
+        for path in (mmapped_path, legacy_path):
+            loaded = ModelRegistry().load_checkpoint("gru", path, backend="eager", input_size=INPUT_SIZE)
+            torch.testing.assert_close(loaded(x), expected)
+
+
+def test_checkpoint_from_older_architecture_refused(tmp_path):
+    path = str(tmp_path / "tcn_model.pth")
+    state_dict = ModelRegistry().get_model("tcn", input_size=INPUT_SIZE).state_dict()
+    state_dict._metadata[""]["version"] = 1  # saved before the causal Chomp1d fix
+    torch.save(state_dict, path)
+
+    with pytest.raises(RuntimeError, match="retrain"):
+        ModelRegistry().load_checkpoint("tcn", path, backend="eager", input_size=INPUT_SIZE)
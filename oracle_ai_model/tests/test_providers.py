@@ -0,0 +1,37 @@
+# oracle_ai_model/tests/test_providers.py
+
+import pandas as pd
+import pytest
+
+from oracle_ai_model.data.providers import FileReplayProvider, SyntheticProvider, get_provider
+
+
+def test_synthetic_is_deterministic_per_symbol():
+    provider = SyntheticProvider(seed=7)
+    a, b = provider.fetch("AAPL", "1d", period="3mo"), provider.fetch("aapl", "1d", period="3mo")
+    pd.testing.assert_frame_equal(a, b)
+    assert not a["Close"].equals(provider.fetch("MSFT", "1d", period="3mo")["Close"])
+    assert (a["High"] >= a[["Open", "Close"]].max(axis=1)).all()
+    assert (a["Low"] <= a[["Open", "Close"]].min(axis=1)).all()
+
+    # A delta fetch returns the same values for the overlapping bars
+    since = a.index[-5]
+    pd.testing.assert_frame_equal(provider.fetch("AAPL", "1d", start=since), a[a.index >= since])
+
+
+def test_replay_filters_relative_to_recording(tmp_path):
+    index = pd.date_range("2021-01-01", periods=100, freq="D", name="Date")
+    pd.DataFrame({"Open": 1.0, "High": 2.0, "Low": 0.5, "Close": range(100), "Volume": 10},
+                 index=index).to_csv(tmp_path / "SPY_1d.csv")
+    provider = FileReplayProvider(str(tmp_path))
+
+    assert len(provider.fetch("SPY", "1d")) == 100
+    assert provider.fetch("SPY", "1d", period="7d").index[0] == pd.Timestamp("2021-04-03", tz="UTC")
+    assert provider.fetch("SPY", "1d", start=pd.Timestamp("2021-04-01"))["Close"].iloc[0] == 90
+    with pytest.raises(FileNotFoundError):
+        provider.fetch("QQQ", "1d")
+
+
+def test_unknown_provider():
+    with pytest.raises(ValueError):
+        get_provider("bloomberg")
@@ -0,0 +1,30 @@
+# oracle_ai_model/tests/test_quantization.py
+
+import numpy as np
+import pytest
+import torch
+
+from oracle_ai_model.models.model import ModelRegistry
+from oracle_ai_model.models.quantization import drift_report
+
+INPUT_SIZE = 5
+
+
+@pytest.mark.parametrize("model_type", ["lstm", "gru", "transformer"])
+def test_quantized_checkpoint_stays_close_to_fp32(tmp_path, model_type):
+    torch.manual_seed(0)
+    model_path = str(tmp_path / f"{model_type}_model.pth")
+    torch.save(ModelRegistry().get_model(model_type, input_size=INPUT_SIZE).state_dict(), model_path)
+
+    registry = ModelRegistry()
+    fp32 = registry.load_checkpoint(model_type, model_path, input_size=INPUT_SIZE, backend="eager")
+    int8 = registry.load_checkpoint(model_type, model_path, input_size=INPUT_SIZE, quantize=True)
+
+    X = torch.randn(128, 24, INPUT_SIZE)
+    y = np.random.default_rng(0).integers(0, 2, size=128)
+    report = drift_report(fp32, int8, X, y, repeats=1)
+
+    assert report["max_abs_prob_diff"] < 0.02
+    assert report["decision_agreement"] > 0.95
+    assert report["int8_size_bytes"] < report["fp32_size_bytes"]
+    assert "accuracy_drift" in report
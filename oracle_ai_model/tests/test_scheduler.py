@@ -0,0 +1,104 @@
+# oracle_ai_model/tests/test_scheduler.py
+
+import threading
+import numpy as np
+import pytest
+import torch
+
+from oracle_ai_model.models.model import ModelRegistry
+from oracle_ai_model.inference.batch import predict_proba
+from oracle_ai_model.inference.scheduler import InferenceScheduler
+
+
+def _model():
+    torch.manual_seed(0)
+    return ModelRegistry().get_model("gru", input_size=5).eval()
+
+
+def _windows(n):
+    rng = np.random.default_rng(0)
+    return [rng.standard_normal((24, 5)).astype(np.float32) for _ in range(n)]
+
+
+def test_concurrent_requests_share_batches_and_resolve_own_results():
+    model = _model()
+    flushes = []
+    scheduler = InferenceScheduler(max_batch_size=64, max_wait_ms=50,
+                                   on_flush=lambda key, size, depth, wait, forward, groups: flushes.append(size))
+    windows = _windows(32)
+    results = [None] * len(windows)
+
+    def call(i):
+        results[i] = scheduler.predict("gru", model, windows[i], timeout=5)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(windows))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    expected = [float(predict_proba(model, torch.from_numpy(w[None]))[0]) for w in windows]
+    np.testing.assert_allclose(results, expected, rtol=1e-4, atol=1e-5)
+    assert sum(flushes) == len(windows)
+    assert len(flushes) < len(windows)
+    assert scheduler.stats()["gru"]["items"] == len(windows)
+
+
+def test_max_batch_size_caps_each_flush():
+    model = _model()
+    flushes = []
+    scheduler = InferenceScheduler(max_batch_size=4, max_wait_ms=50,
+                                   on_flush=lambda key, size, depth, wait, forward, groups: flushes.append(size))
+    futures = [scheduler.submit("gru", model, w) for w in _windows(10)]
+    for f in futures:
+        f.result(timeout=5)
+
+    assert max(flushes) <= 4
+    assert sum(flushes) == 10
+
+
+def test_flush_reports_each_group_share():
+    model = _model()
+    flushes = []
+    scheduler = InferenceScheduler(max_batch_size=64, max_wait_ms=50,
+                                   on_flush=lambda key, size, depth, wait, forward, groups: flushes.append(groups))
+    windows = _windows(6)
+    futures = [scheduler.submit("lstm-v1", model, w, group=("lstm", "crypto" if i % 3 else "stock"))
+               for i, w in enumerate(windows)]
+    for f in futures:
+        f.result(timeout=5)
+
+    counts = {}
+    for groups in flushes:
+        for group, (count, wait) in groups.items():
+            counts[group] = counts.get(group, 0) + count
+            assert wait >= 0
+    assert counts == {("lstm", "stock"): 2, ("lstm", "crypto"): 4}
+
+
+def test_inference_error_is_set_on_every_future():
+    model = _model()
+    scheduler = InferenceScheduler(max_batch_size=8, max_wait_ms=1)
+    bad = np.zeros((24, 3), dtype=np.float32)  # wrong feature count for the GRU
+
+    with pytest.raises(RuntimeError):
+        scheduler.predict("gru", model, bad, timeout=5)
+
+
+def test_malformed_window_only_fails_its_own_caller():
+    model = _model()
+    scheduler = InferenceScheduler(max_batch_size=64, max_wait_ms=200)
+    windows = _windows(6)
+    bad_shape = np.zeros((24, 3), dtype=np.float32)   # wrong feature count: its own shape group
+    bad_dtype = windows[0].astype(np.float64)        # same shape, but fails the stacked forward
+
+    futures = [scheduler.submit("gru", model, w) for w in windows[:3]]
+    bad = [scheduler.submit("gru", model, bad_shape), scheduler.submit("gru", model, bad_dtype)]
+    futures += [scheduler.submit("gru", model, w) for w in windows[3:]]
+
+    expected = [float(predict_proba(model, torch.from_numpy(w[None]))[0]) for w in windows]
+    np.testing.assert_allclose([f.result(timeout=5) for f in futures], expected, rtol=1e-4, atol=1e-5)
+    for future in bad:
+        with pytest.raises((RuntimeError, ValueError)):
+            future.result(timeout=5)
+    assert scheduler.stats()["gru"]["batches"] == 1
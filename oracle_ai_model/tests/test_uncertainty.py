@@ -0,0 +1,76 @@
+# oracle_ai_model/tests/test_uncertainty.py
+
+import numpy as np
+import pytest
+import torch
+
+from oracle_ai_model.models.model import ModelRegistry
+from oracle_ai_model.inference.batch import batched_predict
+from oracle_ai_model.inference.uncertainty import confidence_bands, mc_dropout_samples
+
+
+def _windows(n, seq_len=24, features=5, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.standard_normal((seq_len, features)).astype(np.float32) for _ in range(n)]
+
+
+def test_tiled_samples_collapse_to_point_estimate_without_dropout():
+    torch.manual_seed(0)
+    model = ModelRegistry().get_model("gru", input_size=5, dropout=0.0).eval()
+    windows = _windows(5) + _windows(2, seq_len=20, seed=1)
+
+    bands = confidence_bands(model, windows, samples=8)
+    probs = batched_predict(model, windows)
+
+    np.testing.assert_allclose([b["lower"] for b in bands], probs, rtol=1e-4, atol=1e-5)
+    np.testing.assert_allclose([b["upper"] for b in bands], probs, rtol=1e-4, atol=1e-5)
+
+
+def test_bands_are_stochastic_and_leave_shared_model_in_eval():
+    torch.manual_seed(0)
+    model = ModelRegistry().get_model("lstm", input_size=5, dropout=0.5).eval()
+    batch = torch.from_numpy(np.stack(_windows(6)))
+    before = batched_predict(model, list(batch.numpy()))
+
+    # Chunked to force several tiled forwards
+    samples = mc_dropout_samples(model, batch, samples=16, max_rows=32)
+    assert samples.shape == (16, 6)
+    assert (samples.std(dim=0) > 0).all()
+
+    bands = confidence_bands(model, list(batch.numpy()), samples=16, quantiles=(0.1, 0.9))
+    assert all(0 <= b["lower"] <= b["upper"] <= 1 for b in bands)
+    assert not model.dropout.training
+    np.testing.assert_allclose(batched_predict(model, list(batch.numpy())), before)
+
+
+def test_compiled_model_is_rejected():
+    model = ModelRegistry().get_model("gru", input_size=5).eval()
+    traced = torch.jit.trace(model, torch.zeros(1, 24, 5))
+    with pytest.raises(ValueError):
+        mc_dropout_samples(traced, torch.zeros(2, 24, 5), samples=4)
+
+
+def test_head_only_models_run_the_encoder_once():
+    torch.manual_seed(0)
+    model = ModelRegistry().get_model("lstm", input_size=5, dropout=0.5).eval()
+    encoded = []
+    model.lstm.register_forward_hook(lambda module, inputs, output: encoded.append(len(inputs[0])))
+
+    samples = mc_dropout_samples(model, torch.from_numpy(np.stack(_windows(6))), samples=16, max_rows=32)
+    assert samples.shape == (16, 6)
+    assert (samples.std(dim=0) > 0).all()
+    assert encoded == [6]
+
+
+def test_recurrent_sampling_widens_head_only_bands():
+    torch.manual_seed(0)
+    model = ModelRegistry().get_model("lstm", input_size=5, dropout=0.5).eval()
+    model.dropout.p = 0.0  # only the inter-layer LSTM dropout is left to sample
+    windows = _windows(4)
+
+    head_only = confidence_bands(model, windows, samples=16, recurrent=False)
+    recurrent = confidence_bands(model, windows, samples=16, recurrent=True)
+
+    assert all(b["upper"] - b["lower"] < 1e-6 for b in head_only)
+    assert all(b["upper"] - b["lower"] > 1e-4 for b in recurrent)
+    assert not model.lstm.training
@@ -0,0 +1,51 @@
+# oracle_ai_model/tests/test_warmup.py
+
+import torch
+
+from oracle_ai_model.models import model as model_module
+from oracle_ai_model.models.export import export_checkpoint
+from oracle_ai_model.models.model import ModelRegistry, get_model_cache
+from oracle_ai_model.inference.batch import FEATURE_COLUMNS
+from oracle_ai_model.inference.warmup import warm_up, is_servable
+
+
+def _checkpoint(tmp_path, monkeypatch, model_type="gru"):
+    monkeypatch.setattr(model_module, "MODEL_DIR", str(tmp_path))
+    path = tmp_path / f"{model_type}_model.pth"
+    torch.save(ModelRegistry().get_model(model_type, input_size=len(FEATURE_COLUMNS)).state_dict(), path)
+    get_model_cache().clear()
+    return str(path)
+
+
+def test_warm_up_loads_checkpoints_and_reports_missing(tmp_path, monkeypatch):
+    _checkpoint(tmp_path, monkeypatch)
+
+    report = warm_up(["gru", "lstm"], batch_sizes=[1, 4])
+
+    assert report["models"]["gru"] == "ok"
+    assert report["models"]["lstm"].startswith("error")
+    assert report["indicators"] == "ok"
+    assert is_servable(report)
+    assert get_model_cache().stats()["entries"] == 1
+
+
+def test_nothing_loaded_is_not_servable(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_module, "MODEL_DIR", str(tmp_path))
+    get_model_cache().clear()
+
+    report = warm_up(["gru", "lstm"], batch_sizes=[1])
+
+    assert report["indicators"] == "ok"
+    assert not is_servable(report)
+    assert not is_servable({"error": "boom"})
+
+
+def test_compiled_artifact_also_warms_the_eager_band_model(tmp_path, monkeypatch):
+    path = _checkpoint(tmp_path, monkeypatch)
+    export_checkpoint("gru", path, len(FEATURE_COLUMNS))
+
+    report = warm_up(["gru"], batch_sizes=[1])
+
+    assert report["models"]["gru"] == "ok"
+    # The TorchScript artifact serves; the eager checkpoint MC dropout bands fall back to is cached too
+    assert get_model_cache().stats()["entries"] == 2
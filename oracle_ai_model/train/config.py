@@ -5,6 +5,8 @@ from datetime import datetime
 TRAINING_CONFIG = {
     # Data settings
     "symbol": "AAPL",
+    "period": "2y",      # history read from the bar store
+    "interval": "1d",
     "seq_length": 24,
     "validation_split": 0.2,
 
@@ -6,9 +6,9 @@ import torch.optim as optim
 import os
 import matplotlib.pyplot as plt
 from datetime import datetime
-from oracle_ai_model.utils.helpers import add_technical_indicators, normalize
-from oracle_ai_model.data.loader import download_stock_data
-from oracle_ai_model.train.utils import prepare_sequences, create_dataloaders, get_device, evaluate_model
+from oracle_ai_model.train.utils import (
+    load_training_frames, prepare_sequences, create_dataloaders, get_device, evaluate_model
+)
 from oracle_ai_model.train.config import TRAINING_CONFIG
 
 # Dynamic model loader
@@ -40,11 +40,11 @@ def plot_loss_curve(train_losses, val_losses, save_path):
 
 def train():
     cfg = TRAINING_CONFIG
-    df = download_stock_data(cfg["symbol"], period="1mo")
-    df = add_technical_indicators(df)
-    df = normalize(df, cfg["features"])
-    
-    X, y = prepare_sequences(df, cfg["features"], cfg["seq_length"])
+    frames = load_training_frames([cfg["symbol"]], cfg["features"], period=cfg["period"], interval=cfg["interval"])
+    if cfg["symbol"].upper() not in frames:
+        raise ValueError(f"No stored bars for {cfg['symbol']} ({cfg['interval']})")
+
+    X, y = prepare_sequences(frames[cfg["symbol"].upper()], cfg["features"], cfg["seq_length"])
     train_loader, val_loader = create_dataloaders(X, y, cfg["batch_size"], cfg["validation_split"])
 
     device = get_device(cfg["use_cuda"])
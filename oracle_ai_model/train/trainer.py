@@ -8,8 +8,7 @@ import numpy as np
 import os
 from datetime import datetime
 
-from oracle_ai_model.utils.helpers import add_technical_indicators, normalize
-from oracle_ai_model.data.loader import download_stock_data
+from oracle_ai_model.train.utils import load_training_frames
 from oracle_ai_model.models.model import LSTMModel
 from oracle_ai_model.models.gru_model import GRUTimeSeriesModel
 from oracle_ai_model.models.tcn_model import TCN
@@ -26,8 +25,8 @@ def prepare_sequences(df, seq_length):
     return np.array(sequences), np.array(labels)
 
 
-def select_model(input_size):
-    model_type = TRAINING_CONFIG["model_type"]
+def select_model(input_size, model_type=None):
+    model_type = model_type or TRAINING_CONFIG["model_type"]
     if model_type == "lstm":
         return LSTMModel(input_size)
     elif model_type == "gru":
@@ -40,12 +39,30 @@ def select_model(input_size):
         raise ValueError("Unsupported model type")
 
 
-def train():
-    df = download_stock_data(TRAINING_CONFIG["symbol"], period="1mo")
-    df = add_technical_indicators(df)
-    df = normalize(df, TRAINING_CONFIG["features"])
-
-    X, y = prepare_sequences(df, TRAINING_CONFIG["seq_length"])
+def prepare_dataset(symbols):
+    # Sequences are cut per symbol, so no window spans two tickers
+    X_parts, y_parts = [], []
+    frames = load_training_frames(symbols, TRAINING_CONFIG["features"],
+                                  period=TRAINING_CONFIG["period"], interval=TRAINING_CONFIG["interval"])
+    for df in frames.values():
+        X, y = prepare_sequences(df, TRAINING_CONFIG["seq_length"])
+        if len(X):
+            X_parts.append(X)
+            y_parts.append(y)
+    if not X_parts:
+        raise ValueError(f"Not enough history to train on {symbols}")
+    return np.concatenate(X_parts), np.concatenate(y_parts)
+
+
+def train_model(model_type=None, symbols=None):
+    """
+    Train `model_type` (default TRAINING_CONFIG["model_type"]) on `symbols`
+    (default [TRAINING_CONFIG["symbol"]]). Returns the run's metadata.
+    """
+    model_type = model_type or TRAINING_CONFIG["model_type"]
+    symbols = list(symbols or [TRAINING_CONFIG["symbol"]])
+
+    X, y = prepare_dataset(symbols)
     dataset = TensorDataset(torch.tensor(X).float(), torch.tensor(y).float())
 
     val_size = int(len(dataset) * TRAINING_CONFIG["validation_split"])
@@ -55,7 +72,7 @@ def train():
     train_loader = DataLoader(train_dataset, batch_size=TRAINING_CONFIG["batch_size"], shuffle=True)
     val_loader = DataLoader(val_dataset, batch_size=TRAINING_CONFIG["batch_size"])
 
-    model = select_model(X.shape[2])
+    model = select_model(X.shape[2], model_type)
     device = torch.device("cuda" if TRAINING_CONFIG["use_cuda"] and torch.cuda.is_available() else "cpu")
     model.to(device)
 
@@ -65,7 +82,7 @@ def train():
     best_loss = float('inf')
     patience = TRAINING_CONFIG["early_stopping_patience"]
     patience_counter = 0
-    save_path = os.path.join(TRAINING_CONFIG["save_dir"], f"{TRAINING_CONFIG["model_type"]}_{TRAINING_CONFIG["timestamp"]}.pth")
+    save_path = os.path.join(TRAINING_CONFIG["save_dir"], f"{model_type}_{TRAINING_CONFIG['timestamp']}.pth")
 
     for epoch in range(TRAINING_CONFIG["epochs"]):
         model.train()
@@ -100,3 +117,13 @@ def train():
                 break
 
     print(f"Training complete. Model saved to {save_path}")
+    return {
+        "model_version": TRAINING_CONFIG["timestamp"],
+        "model_path": save_path,
+        "symbols": symbols,
+        "best_val_loss": best_loss,
+    }
+
+
+def train():
+    return train_model()
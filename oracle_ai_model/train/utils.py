@@ -6,6 +6,23 @@ from torch.utils.data import TensorDataset, DataLoader, random_split
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 
+from oracle_ai_model.data.loader import load_training_bars
+from oracle_ai_model.utils.helpers import normalize
+from oracle_ai_model.utils.indicators import add_all_indicators_batched
+
+def load_training_frames(symbols, features, period="2y", interval="1d"):
+    """
+    {symbol: frame} read from the local bar store (one bulk top-up and one scan),
+    with indicators computed in one batched pass, indicator warm-up rows dropped
+    and `features` normalized per symbol.
+    """
+    bars = add_all_indicators_batched(load_training_bars(symbols, period=period, interval=interval))
+    frames = {}
+    for symbol, df in bars.groupby("symbol", sort=False):
+        df = df.dropna(subset=features).reset_index(drop=True)
+        frames[symbol] = normalize(df, features)
+    return frames
+
 def prepare_sequences(df, features, seq_length=24):
     data = df[features].values
     sequences, labels = [], []
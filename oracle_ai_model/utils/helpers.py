@@ -1,22 +1,8 @@
-from .indicators import (
-    add_rsi,
-    add_macd,
-    add_ema,
-    add_atr,
-    add_bollinger_bands,
-    add_adx,
-    add_vwap
-)
+from .indicators import add_all_indicators
 
 def add_technical_indicators(df):
-    df = add_rsi(df)
-    df = add_macd(df)
-    df = add_ema(df)
-    df = add_atr(df)
-    df = add_bollinger_bands(df)
-    df = add_adx(df)
-    df = add_vwap(df)
-    return df
+    """Training and serving features: every engine indicator, in one pass."""
+    return add_all_indicators(df)
 
 def normalize(df, columns, method="zscore"):
     """
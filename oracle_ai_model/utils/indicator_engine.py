@@ -0,0 +1,313 @@
+# utils/indicator_engine.py
+"""
+NumPy indicator engine shared by training (add_technical_indicators) and
+serving (feature extraction).
+
+Inputs are float arrays with time on the last axis: (n_bars,) for one symbol, or
+(n_symbols, n_bars) for many. `compute_indicators` writes every indicator into
+one preallocated (n_indicators, ...) buffer and works out the intermediates
+they share (previous close, true range, the rolling sums) only once.
+
+Rolling statistics are NaN until the window holds `period` valid bars, as with
+pandas `rolling(period)`. EMAs match `ewm(span, adjust=False)`. They are seeded
+at the first valid bar, and NaN bars after that carry the previous value forward.
+"""
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+RSI_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+EMA_SPAN = 20
+ATR_PERIOD = 14
+BB_PERIOD, BB_STD = 20, 2.0
+ADX_PERIOD = 14
+STOCH_PERIOD, STOCH_K, STOCH_D = 14, 3, 3
+VOLATILITY_PERIOD = 20
+
+# Leading bars to drop before every column is defined (stochrsi_d is the last, after
+# RSI, the stochastic window and both smoothings) and MACD's signal line has seen
+# a full slow span
+WARMUP_BARS = max(RSI_PERIOD + STOCH_PERIOD + STOCH_K + STOCH_D, MACD_SLOW + MACD_SIGNAL)
+
+BATCH_CHUNK_ROWS = 256  # symbols per step of compute_indicators_batched
+
+EPS = 1e-10
+
+INDICATOR_COLUMNS = (
+    "rsi", "macd", "macd_signal", f"ema_{EMA_SPAN}", "ema", "atr",
+    "bb_upper", "bb_middle", "bb_lower", "vwap", "adx",
+    "stochrsi_k", "stochrsi_d", "volatility",
+)
+
+# Largest growth factor b**-k allowed inside one EMA block (keeps float64 error ~1e-8 of a bar)
+_EMA_BLOCK_LOG = np.log(1e8)
+
+
+# ----------------------
+# Primitives (time on the last axis)
+# ----------------------
+def shift(x: np.ndarray) -> np.ndarray:
+    """Previous bar's value; NaN for the first bar."""
+    out = np.empty_like(x, dtype=np.float64)
+    out[..., 0] = np.nan
+    out[..., 1:] = x[..., :-1]
+    return out
+
+
+def rolling_mean(x: np.ndarray, period: int, out: np.ndarray = None) -> np.ndarray:
+    """Mean over the last `period` bars via cumulative sums; NaN unless all are valid."""
+    out = np.empty(x.shape, dtype=np.float64) if out is None else out
+    valid = np.isfinite(x)
+    total = _window_sum(np.where(valid, x, 0.0), period)
+    count = _window_sum(valid.astype(np.float64), period)
+    out[..., :period - 1] = np.nan
+    np.divide(total, period, out=out[..., period - 1:])
+    out[..., period - 1:][count < period] = np.nan
+    return out
+
+
+def rolling_std(x: np.ndarray, period: int, out: np.ndarray = None) -> np.ndarray:
+    """Sample (ddof=1) standard deviation over the last `period` bars."""
+    out = np.empty(x.shape, dtype=np.float64) if out is None else out
+    valid = np.isfinite(x)
+    # Center on the first valid value of each series so the sum of squares does not cancel
+    first = np.take_along_axis(x, np.argmax(valid, axis=-1)[..., None], axis=-1)
+    centered = np.where(valid, x - first, 0.0)
+    total = _window_sum(centered, period)
+    squares = _window_sum(centered * centered, period)
+    count = _window_sum(valid.astype(np.float64), period)
+    variance = np.maximum((squares - total * total / period) / (period - 1), 0.0)
+    out[..., :period - 1] = np.nan
+    np.sqrt(variance, out=out[..., period - 1:])
+    out[..., period - 1:][count < period] = np.nan
+    return out
+
+
+def rolling_min(x: np.ndarray, period: int) -> np.ndarray:
+    return _rolling_reduce(x, period, np.min)
+
+
+def rolling_max(x: np.ndarray, period: int) -> np.ndarray:
+    return _rolling_reduce(x, period, np.max)
+
+
+def ema(x: np.ndarray, span: int, out: np.ndarray = None) -> np.ndarray:
+    """
+    EMA with alpha = 2 / (span + 1), like pandas `ewm(span, adjust=False)`.
+
+    The recursion is solved in closed form over blocks of bars, y[s+j] =
+    b**j * (b * y[s-1] + a * cumsum(b**-i * x[s+i])), so there is one vectorized
+    step per block rather than a Python step per bar.
+    """
+    out = np.empty(x.shape, dtype=np.float64) if out is None else out
+    x, lead = _fill_for_ema(x)
+    a = 2.0 / (span + 1.0)
+    b = 1.0 - a
+    block = max(1, int(_EMA_BLOCK_LOG / -np.log(b)))
+    powers = np.arange(block)
+    decay, growth = b ** powers, b ** -powers
+
+    prev = x[..., 0]  # y[-1] = x[0] gives y[0] = x[0]
+    for start in range(0, x.shape[-1], block):
+        chunk = x[..., start:start + block]
+        m = chunk.shape[-1]
+        acc = np.cumsum(chunk * growth[:m], axis=-1)
+        acc *= a
+        acc += (b * prev)[..., None]
+        np.multiply(acc, decay[:m], out=out[..., start:start + m])
+        prev = out[..., start + m - 1]
+    out[lead] = np.nan
+    return out
+
+
+def true_range(high: np.ndarray, low: np.ndarray, prev_close: np.ndarray) -> np.ndarray:
+    """max(H - L, |H - C[-1]|, |L - C[-1]|); H - L on the first bar."""
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+# ----------------------
+# Indicators
+# ----------------------
+def rsi(close: np.ndarray, period: int = RSI_PERIOD, out: np.ndarray = None) -> np.ndarray:
+    """RSI over simple moving averages of gains and losses."""
+    delta = close - shift(close)
+    gain = _mask_missing(np.where(delta > 0, delta, 0.0), close)
+    loss = _mask_missing(np.where(delta < 0, -delta, 0.0), close)
+    avg_gain, avg_loss = rolling_mean(gain, period), rolling_mean(loss, period)
+    out = np.empty(close.shape, dtype=np.float64) if out is None else out
+    np.divide(100.0, 1.0 + avg_gain / (avg_loss + EPS), out=out)
+    np.subtract(100.0, out, out=out)
+    return out
+
+
+def macd(close: np.ndarray, fast: int = MACD_FAST, slow: int = MACD_SLOW, signal: int = MACD_SIGNAL):
+    """(macd line, signal line)."""
+    line = ema(close, fast) - ema(close, slow)
+    return line, ema(line, signal)
+
+
+def atr(high, low, close, period: int = ATR_PERIOD, prev_close: np.ndarray = None, out: np.ndarray = None):
+    prev_close = shift(close) if prev_close is None else prev_close
+    return rolling_mean(true_range(high, low, prev_close), period, out=out)
+
+
+def bollinger(close: np.ndarray, period: int = BB_PERIOD, num_std: float = BB_STD):
+    """(upper, middle, lower)."""
+    middle, std = rolling_mean(close, period), rolling_std(close, period)
+    return middle + num_std * std, middle, middle - num_std * std
+
+
+def vwap(close: np.ndarray, volume: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """Cumulative close-weighted VWAP from the first bar."""
+    valid = np.isfinite(close) & np.isfinite(volume)
+    price_volume = np.cumsum(np.where(valid, close * volume, 0.0), axis=-1)
+    cum_volume = np.cumsum(np.where(valid, volume, 0.0), axis=-1)
+    out = np.empty(close.shape, dtype=np.float64) if out is None else out
+    np.divide(price_volume, cum_volume + EPS, out=out)
+    out[~valid] = np.nan
+    return out
+
+
+def adx(high, low, close, period: int = ADX_PERIOD, prev_close: np.ndarray = None,
+        tr_mean: np.ndarray = None, out: np.ndarray = None) -> np.ndarray:
+    """Directional index over simple moving averages of +DM, -DM and true range."""
+    prev_high, prev_low = shift(high), shift(low)
+    up, down = high - prev_high, prev_low - low
+    plus_dm = _mask_missing(np.where(up > down, np.maximum(up, 0.0), 0.0), high)
+    minus_dm = _mask_missing(np.where(down > up, np.maximum(down, 0.0), 0.0), high)
+    if tr_mean is None:
+        tr_mean = atr(high, low, close, period, prev_close=prev_close)
+    plus_di = 100.0 * rolling_mean(plus_dm, period) / (tr_mean + EPS)
+    minus_di = 100.0 * rolling_mean(minus_dm, period) / (tr_mean + EPS)
+    out = np.empty(close.shape, dtype=np.float64) if out is None else out
+    np.divide(np.abs(plus_di - minus_di), plus_di + minus_di + EPS, out=out)
+    out *= 100.0
+    return out
+
+
+def stochrsi(rsi_values: np.ndarray, period: int = STOCH_PERIOD, k: int = STOCH_K, d: int = STOCH_D):
+    """(%K, %D) of the stochastic oscillator applied to RSI."""
+    lowest, highest = rolling_min(rsi_values, period), rolling_max(rsi_values, period)
+    stoch = 100.0 * (rsi_values - lowest) / (highest - lowest + EPS)
+    k_line = rolling_mean(stoch, k)
+    return k_line, rolling_mean(k_line, d)
+
+
+def volatility(close: np.ndarray, period: int = VOLATILITY_PERIOD, prev_close: np.ndarray = None,
+               out: np.ndarray = None) -> np.ndarray:
+    """Rolling standard deviation of simple returns."""
+    prev_close = shift(close) if prev_close is None else prev_close
+    return rolling_std(close / prev_close - 1.0, period, out=out)
+
+
+# ----------------------
+# All at once
+# ----------------------
+def compute_indicators(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                       out: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Every indicator in INDICATOR_COLUMNS for the given bars. `out` may be a
+    reusable float64 buffer of shape (len(INDICATOR_COLUMNS),) + close.shape.
+    Returns {column: view into `out`}.
+    """
+    high, low, close, volume = (np.asarray(a, dtype=np.float64) for a in (high, low, close, volume))
+    shape = (len(INDICATOR_COLUMNS),) + close.shape
+    if out is None:
+        out = np.empty(shape, dtype=np.float64)
+    elif out.shape != shape or out.dtype != np.float64:
+        raise ValueError(f"Indicator buffer must be float64 with shape {shape}, got {out.dtype} {out.shape}")
+    result = dict(zip(INDICATOR_COLUMNS, out))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        prev_close = shift(close)
+
+        rsi(close, out=result["rsi"])
+        ema(close, EMA_SPAN, out=result[f"ema_{EMA_SPAN}"])
+        result["ema"][...] = result[f"ema_{EMA_SPAN}"]
+        np.subtract(ema(close, MACD_FAST), ema(close, MACD_SLOW), out=result["macd"])
+        ema(result["macd"], MACD_SIGNAL, out=result["macd_signal"])
+
+        atr(high, low, close, ATR_PERIOD, prev_close=prev_close, out=result["atr"])
+        tr_mean = result["atr"] if ADX_PERIOD == ATR_PERIOD else None
+        adx(high, low, close, ADX_PERIOD, prev_close=prev_close, tr_mean=tr_mean, out=result["adx"])
+
+        rolling_mean(close, BB_PERIOD, out=result["bb_middle"])
+        std = rolling_std(close, BB_PERIOD)
+        np.add(result["bb_middle"], BB_STD * std, out=result["bb_upper"])
+        np.subtract(result["bb_middle"], BB_STD * std, out=result["bb_lower"])
+
+        vwap(close, volume, out=result["vwap"])
+        result["stochrsi_k"][...], result["stochrsi_d"][...] = stochrsi(result["rsi"])
+        volatility(close, VOLATILITY_PERIOD, prev_close=prev_close, out=result["volatility"])
+
+    return result
+
+
+def compute_indicators_batched(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                               chunk_rows: int = BATCH_CHUNK_ROWS,
+                               out: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    `compute_indicators` for (n_symbols, n_bars) panels, `chunk_rows` symbols at a
+    time so the intermediates stay small. Ragged histories are right-aligned and
+    NaN-padded on the left (see `stack_right_aligned`); each row then matches the
+    single-symbol result over its own bars.
+    """
+    high, low, close, volume = (np.asarray(a, dtype=np.float64) for a in (high, low, close, volume))
+    if close.ndim != 2:
+        raise ValueError(f"Expected (n_symbols, n_bars) arrays, got shape {close.shape}")
+    shape = (len(INDICATOR_COLUMNS),) + close.shape
+    out = np.empty(shape, dtype=np.float64) if out is None else out
+    for start in range(0, close.shape[0], chunk_rows):
+        rows = slice(start, start + chunk_rows)
+        compute_indicators(high[rows], low[rows], close[rows], volume[rows], out=out[:, rows])
+    return dict(zip(INDICATOR_COLUMNS, out))
+
+
+def stack_right_aligned(series: Sequence[np.ndarray], length: int = None) -> np.ndarray:
+    """(n_series, length) float64 panel: each series ends in the last column, NaN before its start."""
+    length = length or max((len(s) for s in series), default=0)
+    panel = np.full((len(series), length), np.nan)
+    for row, values in zip(panel, series):
+        values = np.asarray(values, dtype=np.float64)[-length:]
+        if len(values):
+            row[length - len(values):] = values
+    return panel
+
+
+# ----------------------
+# Helpers
+# ----------------------
+def _window_sum(x: np.ndarray, period: int) -> np.ndarray:
+    # Sums of each full window: (..., n - period + 1)
+    csum = np.cumsum(x, axis=-1)
+    sums = csum[..., period - 1:].copy()
+    sums[..., 1:] -= csum[..., :-period]
+    return sums
+
+
+def _rolling_reduce(x: np.ndarray, period: int, reduce) -> np.ndarray:
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] >= period:
+        out[..., period - 1:] = reduce(sliding_window_view(x, period, axis=-1), axis=-1)
+    return out
+
+
+def _mask_missing(values: np.ndarray, series: np.ndarray) -> np.ndarray:
+    # Bar-to-bar moves: 0 on each series' first valid bar, NaN where the series has no bar
+    return np.where(np.isfinite(series), values, np.nan)
+
+
+def _fill_for_ema(x: np.ndarray):
+    """Back-fill leading NaNs with the first valid value and forward-fill gaps; returns (filled, lead mask)."""
+    valid = np.isfinite(x)
+    if valid.all():
+        return x, np.zeros(x.shape, dtype=bool)
+    positions = np.where(valid, np.arange(x.shape[-1]), 0)
+    np.maximum.accumulate(positions, axis=-1, out=positions)
+    filled = np.take_along_axis(x, positions, axis=-1)
+    first = np.take_along_axis(x, np.argmax(valid, axis=-1)[..., None], axis=-1)
+    lead = ~np.logical_or.accumulate(valid, axis=-1)
+    filled = np.where(lead, first, filled)
+    return np.nan_to_num(filled), lead
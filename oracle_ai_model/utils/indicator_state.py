@@ -0,0 +1,443 @@
+# utils/indicator_state.py
+"""
+Incremental indicator state: one bar in, the latest value of every indicator
+out, in O(1) per bar regardless of history length (Bollinger, ATR, RSI and ADX
+keep running sums over a ring of the last `period` inputs).
+
+Values follow utils/indicator_engine.py, so a state seeded from history and
+then updated bar by bar gives the same numbers as recomputing the whole series.
+
+States are plain data and round-trip through `to_dict`/`from_dict` (JSON), so
+IndicatorStateStore can keep one per (symbol, interval) in Redis or on disk.
+Only closed bars are folded in, since a bar cannot be taken back: the store
+leaves a still-open last bar out of the state and evaluates it on a scratch copy.
+A state also keeps the rows of its last `keep` bars, so callers that need a
+window of indicator values (not just the latest) read them without recomputing.
+"""
+import os
+import copy
+import json
+import math
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from . import indicator_engine as engine
+from oracle_ai_model.data.timeframes import bar_close, to_utc
+
+NAN = float("nan")
+
+
+class _State:
+    """Serialization shared by the state classes: every attribute is data or a nested _State."""
+
+    def to_dict(self) -> dict:
+        return {k: (v.to_dict() if isinstance(v, _State) else v) for k, v in vars(self).items()}
+
+    def _load(self, data: dict):
+        for key, value in data.items():
+            current = getattr(self, key, None)
+            if isinstance(current, _State):
+                current._load(value)
+            else:
+                setattr(self, key, value)
+        return self
+
+
+class _Window(_State):
+    """Ring of the last `period` values with running sum / sum of squares."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.values = []
+        self.pos = 0
+        self.invalid = 0      # NaN values currently in the ring
+        self.total = 0.0
+        self.squares = 0.0
+        self.center = None    # first valid value; sums are taken around it (as the engine does)
+        self.pushes = 0
+
+    def push(self, x: float):
+        valid = not math.isnan(x)
+        if valid and self.center is None:
+            self.center = x
+        if len(self.values) == self.period:
+            self._remove(self.values[self.pos])
+            self.values[self.pos] = x
+        else:
+            self.values.append(x)
+        self.pos = (self.pos + 1) % self.period
+        self._add(x)
+        self.pushes += 1
+        if self.pushes % self.period == 0:
+            self._resum()  # drop the rounding drift of the running sums
+
+    def full(self) -> bool:
+        return len(self.values) == self.period and self.invalid == 0
+
+    def mean(self) -> float:
+        return self.center + self.total / self.period if self.full() else NAN
+
+    def std(self) -> float:
+        if not self.full():
+            return NAN
+        variance = (self.squares - self.total * self.total / self.period) / (self.period - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def min(self) -> float:
+        return min(self.values) if self.full() else NAN
+
+    def max(self) -> float:
+        return max(self.values) if self.full() else NAN
+
+    def _add(self, x: float):
+        if math.isnan(x):
+            self.invalid += 1
+        else:
+            d = x - self.center
+            self.total += d
+            self.squares += d * d
+
+    def _remove(self, x: float):
+        if math.isnan(x):
+            self.invalid -= 1
+        else:
+            d = x - self.center
+            self.total -= d
+            self.squares -= d * d
+
+    def _resum(self):
+        valid = [x - self.center for x in self.values if not math.isnan(x)] if self.center is not None else []
+        self.total = math.fsum(valid)
+        self.squares = math.fsum(d * d for d in valid)
+
+
+# ----------------------
+# Indicators
+# ----------------------
+class EMAState(_State):
+    def __init__(self, span: int = engine.EMA_SPAN):
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = None
+
+    def update(self, x: float) -> float:
+        if not math.isnan(x):
+            self.value = x if self.value is None else self.alpha * x + (1.0 - self.alpha) * self.value
+        return NAN if self.value is None else self.value
+
+
+class MACDState(_State):
+    def __init__(self, fast: int = engine.MACD_FAST, slow: int = engine.MACD_SLOW, signal: int = engine.MACD_SIGNAL):
+        self.fast, self.slow, self.signal = EMAState(fast), EMAState(slow), EMAState(signal)
+
+    def update(self, close: float):
+        """(macd, signal)."""
+        line = self.fast.update(close) - self.slow.update(close)
+        return line, self.signal.update(line)
+
+
+class RSIState(_State):
+    def __init__(self, period: int = engine.RSI_PERIOD):
+        self.prev_close = None
+        self.gains, self.losses = _Window(period), _Window(period)
+
+    def update(self, close: float) -> float:
+        delta = 0.0 if self.prev_close is None else close - self.prev_close
+        self.prev_close = close
+        self.gains.push(max(delta, 0.0))
+        self.losses.push(max(-delta, 0.0))
+        return 100.0 - 100.0 / (1.0 + self.gains.mean() / (self.losses.mean() + engine.EPS))
+
+
+class ATRState(_State):
+    def __init__(self, period: int = engine.ATR_PERIOD):
+        self.prev_close = None
+        self.tr = _Window(period)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        self.tr.push(_true_range(high, low, self.prev_close))
+        self.prev_close = close
+        return self.tr.mean()
+
+
+class BollingerState(_State):
+    def __init__(self, period: int = engine.BB_PERIOD, num_std: float = engine.BB_STD):
+        self.num_std = num_std
+        self.closes = _Window(period)
+
+    def update(self, close: float):
+        """(upper, middle, lower)."""
+        self.closes.push(close)
+        middle, std = self.closes.mean(), self.closes.std()
+        return middle + self.num_std * std, middle, middle - self.num_std * std
+
+
+class VWAPState(_State):
+    def __init__(self):
+        self.price_volume = 0.0
+        self.volume = 0.0
+
+    def update(self, close: float, volume: float) -> float:
+        self.price_volume += close * volume
+        self.volume += volume
+        return self.price_volume / (self.volume + engine.EPS)
+
+
+class ADXState(_State):
+    def __init__(self, period: int = engine.ADX_PERIOD):
+        self.prev_high = self.prev_low = self.prev_close = None
+        self.plus_dm, self.minus_dm, self.tr = _Window(period), _Window(period), _Window(period)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        up = down = 0.0
+        if self.prev_high is not None:
+            up, down = high - self.prev_high, self.prev_low - low
+        self.plus_dm.push(max(up, 0.0) if up > down else 0.0)
+        self.minus_dm.push(max(down, 0.0) if down > up else 0.0)
+        self.tr.push(_true_range(high, low, self.prev_close))
+        self.prev_high, self.prev_low, self.prev_close = high, low, close
+
+        tr_mean = self.tr.mean()
+        plus_di = 100.0 * self.plus_dm.mean() / (tr_mean + engine.EPS)
+        minus_di = 100.0 * self.minus_dm.mean() / (tr_mean + engine.EPS)
+        return abs(plus_di - minus_di) / (plus_di + minus_di + engine.EPS) * 100.0
+
+
+class StochRSIState(_State):
+    def __init__(self, period: int = engine.STOCH_PERIOD, k: int = engine.STOCH_K, d: int = engine.STOCH_D):
+        self.rsi, self.k, self.d = _Window(period), _Window(k), _Window(d)
+
+    def update(self, rsi: float):
+        """(%K, %D); the RSI window is a fixed 14 values, so min/max stay O(1) per bar."""
+        self.rsi.push(rsi)
+        lowest, highest = self.rsi.min(), self.rsi.max()
+        self.k.push(100.0 * (rsi - lowest) / (highest - lowest + engine.EPS))
+        k = self.k.mean()
+        self.d.push(k)
+        return k, self.d.mean()
+
+
+class VolatilityState(_State):
+    def __init__(self, period: int = engine.VOLATILITY_PERIOD):
+        self.prev_close = None
+        self.returns = _Window(period)
+
+    def update(self, close: float) -> float:
+        self.returns.push(NAN if self.prev_close is None else close / self.prev_close - 1.0)
+        self.prev_close = close
+        return self.returns.std()
+
+
+def _true_range(high: float, low: float, prev_close: Optional[float]) -> float:
+    if prev_close is None:
+        return high - low
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+# ----------------------
+# All indicators for one symbol
+# ----------------------
+class IndicatorState(_State):
+    """Every column of indicator_engine.INDICATOR_COLUMNS, one bar at a time."""
+
+    VERSION = 2
+
+    def __init__(self, keep: int = 0):
+        self.version = self.VERSION
+        self.rsi, self.macd, self.ema = RSIState(), MACDState(), EMAState(engine.EMA_SPAN)
+        self.atr, self.bollinger, self.vwap = ATRState(), BollingerState(), VWAPState()
+        self.adx, self.stochrsi, self.volatility = ADXState(), StochRSIState(), VolatilityState()
+        self.bars = 0
+        self.last_bar = None   # ISO timestamp of the newest folded bar
+        self.latest = {}
+        self.keep = keep
+        self.recent = []       # [ISO timestamp, latest] of the last `keep` bars
+
+    def update(self, high: float, low: float, close: float, volume: float, timestamp=None) -> Dict[str, float]:
+        rsi = self.rsi.update(close)
+        macd, macd_signal = self.macd.update(close)
+        ema = self.ema.update(close)
+        upper, middle, lower = self.bollinger.update(close)
+        k, d = self.stochrsi.update(rsi)
+        self.latest = {
+            "rsi": rsi, "macd": macd, "macd_signal": macd_signal,
+            f"ema_{engine.EMA_SPAN}": ema, "ema": ema,
+            "atr": self.atr.update(high, low, close),
+            "bb_upper": upper, "bb_middle": middle, "bb_lower": lower,
+            "vwap": self.vwap.update(close, volume),
+            "adx": self.adx.update(high, low, close),
+            "stochrsi_k": k, "stochrsi_d": d,
+            "volatility": self.volatility.update(close),
+        }
+        self.bars += 1
+        if timestamp is not None:
+            self.last_bar = pd.Timestamp(timestamp).isoformat()
+        if self.keep:
+            self.recent.append([self.last_bar, dict(self.latest)])
+            if len(self.recent) > self.keep:
+                del self.recent[0]
+        return self.latest
+
+    def update_frame(self, bars: pd.DataFrame) -> Dict[str, float]:
+        """Fold in every row of a bar frame (Date column or index) newer than `last_bar`."""
+        dates = pd.to_datetime(bars["Date"] if "Date" in bars.columns else bars.index)
+        if self.last_bar is not None:
+            newer = (dates > pd.Timestamp(self.last_bar)).to_numpy()
+            bars, dates = bars[newer], dates[newer]
+        rows = zip(bars["High"].to_numpy(float), bars["Low"].to_numpy(float),
+                   bars["Close"].to_numpy(float), bars["Volume"].to_numpy(float), dates)
+        for high, low, close, volume, date in rows:
+            self.update(high, low, close, volume, date)
+        return self.latest
+
+    @classmethod
+    def seed(cls, bars: pd.DataFrame, keep: int = 0) -> "IndicatorState":
+        """A new state fed with the given history (the one-off O(history) cost)."""
+        state = cls(keep)
+        state.update_frame(bars)
+        return state
+
+    def preview(self, bars: pd.DataFrame) -> List[list]:
+        """[timestamp, values] rows for `bars` (e.g. the open last bar), evaluated on a scratch copy."""
+        recent, self.recent = self.recent, []
+        try:
+            scratch = copy.deepcopy(self)
+        finally:
+            self.recent = recent
+        scratch.keep = len(bars)
+        scratch.update_frame(bars)
+        return scratch.recent
+
+    def frame(self, rows: List[list] = None) -> pd.DataFrame:
+        """`recent` (plus any preview `rows`) as a DataFrame indexed by bar time."""
+        rows = self.recent + (rows or [])
+        return pd.DataFrame([values for _, values in rows],
+                            index=pd.to_datetime([timestamp for timestamp, _ in rows], utc=True).rename("Date"))
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "IndicatorState":
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported indicator state version {data.get('version')}")
+        return cls()._load(data)
+
+    @classmethod
+    def from_json(cls, raw) -> "IndicatorState":
+        return cls.from_dict(json.loads(raw))
+
+
+# ----------------------
+# Persistence
+# ----------------------
+class IndicatorStateStore:
+    """
+    One IndicatorState per (symbol, interval), as JSON in Redis (`redis_client`)
+    or as files under `directory`. States keep the rows of their last `keep`
+    bars (more if a caller asks for a longer window).
+    """
+
+    def __init__(self, redis_client=None, directory: str = None, prefix: str = "fitinty:indicators",
+                 keep: int = None):
+        if redis_client is None and directory is None:
+            raise ValueError("IndicatorStateStore needs a redis_client or a directory")
+        self.redis = redis_client
+        self.directory = directory
+        self.prefix = prefix
+        self.keep = INDICATOR_STATE_KEEP if keep is None else keep
+
+    def _key(self, symbol: str, interval: str) -> str:
+        return f"{self.prefix}:{symbol.upper()}:{interval}"
+
+    def _path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.directory, f"{symbol.upper()}_{interval}.json")
+
+    def load(self, symbol: str, interval: str) -> Optional[IndicatorState]:
+        if self.redis is not None:
+            raw = self.redis.get(self._key(symbol, interval))
+        else:
+            path = self._path(symbol, interval)
+            raw = open(path).read() if os.path.exists(path) else None
+        try:
+            return IndicatorState.from_json(raw) if raw else None
+        except ValueError:
+            return None  # older state version: reseeded by the caller
+
+    def save(self, symbol: str, interval: str, state: IndicatorState):
+        raw = state.to_json()
+        if self.redis is not None:
+            self.redis.set(self._key(symbol, interval), raw)
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(symbol, interval)
+        with open(path + ".tmp", "w") as f:
+            f.write(raw)
+        os.replace(path + ".tmp", path)
+
+    def delete(self, symbol: str, interval: str):
+        if self.redis is not None:
+            self.redis.delete(self._key(symbol, interval))
+        elif os.path.exists(self._path(symbol, interval)):
+            os.remove(self._path(symbol, interval))
+
+    def advance(self, symbol: str, interval: str, bars: pd.DataFrame, now=None) -> Dict[str, float]:
+        """
+        Latest indicators for `symbol` after folding in the closed `bars` it has
+        not seen yet. The first call seeds from all of `bars`; later calls only
+        pay for the new rows. A last bar still open at `now` is left out.
+        """
+        return self._advance(symbol, interval, bars, now, self.keep)[0].latest
+
+    def window(self, symbol: str, interval: str, bars: pd.DataFrame, rows: int, now=None) -> pd.DataFrame:
+        """
+        Indicator values of the last `rows` bars of `bars` (indexed by bar time),
+        after advancing the stored state. A still-open last bar is included but
+        evaluated on a scratch copy, so its partial values never enter the state.
+        """
+        state, open_bars = self._advance(symbol, interval, bars, now, max(rows, self.keep))
+        return state.frame(state.preview(open_bars) if len(open_bars) else None).tail(rows)
+
+    def _advance(self, symbol: str, interval: str, bars: pd.DataFrame, now, keep: int) -> Tuple[IndicatorState, pd.DataFrame]:
+        # (state with every closed bar folded in, the open last bar if any)
+        now = to_utc(now or datetime.now(timezone.utc))
+        dates = pd.DatetimeIndex(pd.to_datetime(bars["Date"] if "Date" in bars.columns else bars.index))
+        closed, open_bars = bars, bars.iloc[:0]
+        if len(bars) and bar_close(dates[-1], interval) > now:
+            closed, open_bars = bars.iloc[:-1], bars.iloc[-1:]
+
+        state = self.load(symbol, interval)
+        # Reseed if the stored rows are too few, or the state ends before these bars begin (a gap)
+        if state is None or state.keep < keep or (
+                state.last_bar is not None and len(dates) and pd.Timestamp(state.last_bar) < dates[0]):
+            state = IndicatorState.seed(closed, keep)
+        else:
+            folded = state.bars
+            state.update_frame(closed)
+            if state.bars == folded:
+                return state, open_bars
+        self.save(symbol, interval, state)
+        return state, open_bars
+
+
+INDICATOR_STATE_REDIS_URL = os.getenv("INDICATOR_STATE_REDIS_URL", "")
+INDICATOR_STATE_DIR = os.getenv("INDICATOR_STATE_DIR", "data/indicator_state")
+# Rows of recent indicator values kept per state (the longest feature window served)
+INDICATOR_STATE_KEEP = int(os.getenv("INDICATOR_STATE_KEEP", "128"))
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_indicator_state_store() -> IndicatorStateStore:
+    """Redis-backed if INDICATOR_STATE_REDIS_URL is set, otherwise files under INDICATOR_STATE_DIR."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if INDICATOR_STATE_REDIS_URL:
+                import redis
+                _store = IndicatorStateStore(redis_client=redis.Redis.from_url(INDICATOR_STATE_REDIS_URL))
+            else:
+                _store = IndicatorStateStore(directory=INDICATOR_STATE_DIR)
+        return _store
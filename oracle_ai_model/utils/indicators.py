@@ -1,105 +1,89 @@
 # indicators.py
+# DataFrame front-end of utils/indicator_engine.py; the engine does the math.
 import pandas as pd
 import numpy as np
 
-def add_rsi(df: pd.DataFrame, period: int = 14, inplace: bool = True) -> pd.DataFrame:
-    delta = df['Close'].diff()
-    gain = np.where(delta > 0, delta, 0)
-    loss = np.where(delta < 0, -delta, 0)
-    avg_gain = pd.Series(gain).rolling(window=period).mean()
-    avg_loss = pd.Series(loss).rolling(window=period).mean()
-    rs = avg_gain / (avg_loss + 1e-10)
-    rsi = 100 - (100 / (1 + rs))
+from . import indicator_engine as engine
 
-    if inplace:
-        df['rsi'] = rsi
-        return df
-    return rsi.to_frame(name="rsi")
 
-def add_macd(df: pd.DataFrame, short: int = 12, long: int = 26, signal: int = 9, inplace: bool = True) -> pd.DataFrame:
-    ema_short = df['Close'].ewm(span=short, adjust=False).mean()
-    ema_long = df['Close'].ewm(span=long, adjust=False).mean()
-    macd = ema_short - ema_long
-    macd_signal = macd.ewm(span=signal, adjust=False).mean()
+def _values(df: pd.DataFrame, column: str) -> np.ndarray:
+    return df[column].to_numpy(dtype=np.float64)
 
+def _frame(df: pd.DataFrame, columns: dict, inplace: bool) -> pd.DataFrame:
     if inplace:
-        df['macd'] = macd
-        df['macd_signal'] = macd_signal
+        for name, values in columns.items():
+            df[name] = values
         return df
-    return pd.concat([macd.rename("macd"), macd_signal.rename("macd_signal")], axis=1)
+    return pd.DataFrame(columns, index=df.index)
+
+def add_rsi(df: pd.DataFrame, period: int = 14, inplace: bool = True) -> pd.DataFrame:
+    return _frame(df, {"rsi": engine.rsi(_values(df, "Close"), period)}, inplace)
+
+def add_macd(df: pd.DataFrame, short: int = 12, long: int = 26, signal: int = 9, inplace: bool = True) -> pd.DataFrame:
+    macd, macd_signal = engine.macd(_values(df, "Close"), short, long, signal)
+    return _frame(df, {"macd": macd, "macd_signal": macd_signal}, inplace)
 
 def add_ema(df: pd.DataFrame, span: int = 20, inplace: bool = True) -> pd.DataFrame:
-    ema = df['Close'].ewm(span=span, adjust=False).mean()
-    if inplace:
-        df[f'ema_{span}'] = ema
-        return df
-    return ema.to_frame(name=f"ema_{span}")
+    return _frame(df, {f"ema_{span}": engine.ema(_values(df, "Close"), span)}, inplace)
 
 def add_atr(df: pd.DataFrame, period: int = 14, inplace: bool = True) -> pd.DataFrame:
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift())
-    low_close = np.abs(df['Low'] - df['Close'].shift())
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    atr = tr.rolling(window=period).mean()
+    atr = engine.atr(_values(df, "High"), _values(df, "Low"), _values(df, "Close"), period)
+    return _frame(df, {"atr": atr}, inplace)
 
-    if inplace:
-        df['atr'] = atr
-        return df
-    return atr.to_frame(name="atr")
+def compute_atr(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+    """Adds an 'atr' column (used by the market-data enrichment)."""
+    return add_atr(df, period)
 
 def add_bollinger_bands(df: pd.DataFrame, period: int = 20, inplace: bool = True) -> pd.DataFrame:
-    sma = df['Close'].rolling(window=period).mean()
-    std = df['Close'].rolling(window=period).std()
-    upper = sma + (2 * std)
-    lower = sma - (2 * std)
-
-    if inplace:
-        df['bb_upper'] = upper
-        df['bb_lower'] = lower
-        return df
-    return pd.concat([upper.rename("bb_upper"), lower.rename("bb_lower")], axis=1)
+    upper, _, lower = engine.bollinger(_values(df, "Close"), period)
+    return _frame(df, {"bb_upper": upper, "bb_lower": lower}, inplace)
 
 def add_vwap(df: pd.DataFrame, inplace: bool = True) -> pd.DataFrame:
-    cum_volume_price = (df['Close'] * df['Volume']).cumsum()
-    cum_volume = df['Volume'].cumsum()
-    vwap = cum_volume_price / (cum_volume + 1e-10)
-
-    if inplace:
-        df['vwap'] = vwap
-        return df
-    return vwap.to_frame(name="vwap")
+    return _frame(df, {"vwap": engine.vwap(_values(df, "Close"), _values(df, "Volume"))}, inplace)
 
 def add_adx(df: pd.DataFrame, period: int = 14, inplace: bool = True) -> pd.DataFrame:
-    plus_dm = np.where((df['High'] - df['High'].shift()) > (df['Low'].shift() - df['Low']),
-                       np.maximum(df['High'] - df['High'].shift(), 0), 0)
-    minus_dm = np.where((df['Low'].shift() - df['Low']) > (df['High'] - df['High'].shift()),
-                        np.maximum(df['Low'].shift() - df['Low'], 0), 0)
-    
-    tr = pd.concat([
-        df['High'] - df['Low'],
-        np.abs(df['High'] - df['Close'].shift()),
-        np.abs(df['Low'] - df['Close'].shift())
-    ], axis=1).max(axis=1)
-    tr_smooth = tr.rolling(window=period).mean()
-
-    plus_di = 100 * (pd.Series(plus_dm).rolling(window=period).mean() / (tr_smooth + 1e-10))
-    minus_di = 100 * (pd.Series(minus_dm).rolling(window=period).mean() / (tr_smooth + 1e-10))
-    adx = (np.abs(plus_di - minus_di) / (plus_di + minus_di + 1e-10)) * 100
-
-    if inplace:
-        df['adx'] = adx
-        return df
-    return adx.to_frame(name="adx")
+    adx = engine.adx(_values(df, "High"), _values(df, "Low"), _values(df, "Close"), period)
+    return _frame(df, {"adx": adx}, inplace)
 
 def add_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Adds all technical indicators to the DataFrame in-place.
+    Adds every column of indicator_engine.INDICATOR_COLUMNS to the DataFrame in-place,
+    computed in one engine pass.
     """
-    add_rsi(df)
-    add_macd(df)
-    add_ema(df)
-    add_atr(df)
-    add_bollinger_bands(df)
-    add_vwap(df)
-    add_adx(df)
+    result = engine.compute_indicators(
+        _values(df, "High"), _values(df, "Low"), _values(df, "Close"), _values(df, "Volume"))
+    for name, values in result.items():
+        df[name] = values
+    return df
+
+def add_all_indicators_batched(df: pd.DataFrame, by: str = "symbol", chunk_rows: int = engine.BATCH_CHUNK_ROWS) -> pd.DataFrame:
+    """
+    add_all_indicators for a long frame of many symbols (e.g. BarStore.read_many),
+    in one batched engine pass instead of one pass per symbol. Rows are ordered by
+    Date within each symbol (if there is a Date column); the indicator columns are
+    added in-place and each symbol's values equal add_all_indicators on its rows alone.
+    """
+    codes, _ = pd.factorize(df[by])
+    order = np.lexsort((df["Date"].to_numpy(), codes)) if "Date" in df.columns else np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    sizes = np.bincount(sorted_codes)
+    length = int(sizes.max()) if len(sizes) else 0
+
+    # Sorted row k of group g (the j-th bar of that symbol) -> panel cell (g, length - size_g + j)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    rows = sorted_codes
+    cols = length - sizes[rows] + (np.arange(len(order)) - starts[rows])
+
+    panels = {}
+    for field in ("High", "Low", "Close", "Volume"):
+        panel = np.full((len(sizes), length), np.nan)
+        panel[rows, cols] = df[field].to_numpy(dtype=np.float64)[order]
+        panels[field] = panel
+
+    result = engine.compute_indicators_batched(panels["High"], panels["Low"], panels["Close"], panels["Volume"],
+                                               chunk_rows=chunk_rows)
+    for name, values in result.items():
+        column = np.empty(len(order))
+        column[order] = values[rows, cols]
+        df[name] = column
     return df